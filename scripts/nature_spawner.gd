@@ -5,12 +5,22 @@ extends Node3D
 @export var grass_count: int = 120
 @export var rock_count: int = 25
 @export var clear_radius: float = 10.0  # Keep area around spawn clear
+# Transforms baked by tools/bake_scatter.py; spawns per-node below when missing
+@export_file var scatter_path: String = "res://assets/models/nature/nature_scatter.bin"
+# Cell edge (m) used to split baked species that have LOD chains; capped at
+# half the nearest LOD switch distance (0 = use that cap)
+@export var lod_cell_size: float = 0.0
+
+const SCATTER_MAGIC := "SCAT"
+const SCATTER_VERSION := 1
+const SPECIES_NAME_SIZE := 32
 
 var oak_scene: PackedScene = preload("res://assets/models/nature/oak_tree.glb")
 var pine_scene: PackedScene = preload("res://assets/models/nature/pine_tree.glb")
 var birch_scene: PackedScene = preload("res://assets/models/nature/birch_tree.glb")
 var grass_scene: PackedScene = preload("res://assets/models/nature/grass_patch.glb")
 var rock_scene: PackedScene = preload("res://assets/models/nature/rock.glb")
+var impostor_shader: Shader = preload("res://shaders/impostor.gdshader")
 
 var tree_scenes: Array = []
 var rng := RandomNumberGenerator.new()
@@ -21,10 +31,153 @@ func _ready() -> void:
 	call_deferred("_spawn_nature")
 
 func _spawn_nature() -> void:
+	if _spawn_baked(scatter_path):
+		return
 	_spawn_trees()
 	_spawn_grass()
 	_spawn_rocks()
 
+# One MultiMeshInstance3D per species, filled with a single buffer upload
+func _spawn_baked(path: String) -> bool:
+	if not FileAccess.file_exists(path):
+		return false
+	var file := FileAccess.open(path, FileAccess.READ)
+	if file == null:
+		return false
+	if file.get_buffer(4).get_string_from_ascii() != SCATTER_MAGIC or file.get_32() != SCATTER_VERSION:
+		push_warning("Unsupported scatter file: %s" % path)
+		return false
+
+	var species_scenes := {
+		"oak_tree": oak_scene,
+		"pine_tree": pine_scene,
+		"birch_tree": birch_scene,
+		"grass_patch": grass_scene,
+		"rock": rock_scene,
+	}
+	var species_count := file.get_32()
+	for i in range(species_count):
+		var species := file.get_buffer(SPECIES_NAME_SIZE).get_string_from_utf8()
+		var count := file.get_32()
+		var buffer := file.get_buffer(count * 12 * 4).to_float32_array()
+		if count == 0 or not species_scenes.has(species):
+			continue
+		var lods := _extract_lods(species_scenes[species])
+		if lods.is_empty():
+			continue
+		if lods.size() == 1:
+			add_child(_make_multimesh_instance(species.to_pascal_case(), lods[0], buffer))
+			continue
+
+		# Visibility ranges apply per node, so LOD chains are split into
+		# cells, each with one MultiMeshInstance3D per level
+		var cell_size := _lod_cell_size(lods)
+		var cells := _bucket_by_cell(buffer, count, cell_size)
+		for cell in cells:
+			for level in range(lods.size()):
+				var instance := _make_multimesh_instance(
+					"%s_%d_%d_LOD%d" % [species.to_pascal_case(), cell.x, cell.y, level], lods[level], cells[cell])
+				instance.position = Vector3((cell.x + 0.5) * cell_size, 0.0, (cell.y + 0.5) * cell_size)
+				add_child(instance)
+	return true
+
+func _make_multimesh_instance(node_name: String, lod: Dictionary, buffer: PackedFloat32Array) -> MultiMeshInstance3D:
+	var multimesh := MultiMesh.new()
+	multimesh.transform_format = MultiMesh.TRANSFORM_3D
+	multimesh.mesh = lod.mesh
+	multimesh.instance_count = buffer.size() / 12
+	multimesh.buffer = buffer
+
+	var instance := MultiMeshInstance3D.new()
+	instance.name = node_name
+	instance.multimesh = multimesh
+	instance.visibility_range_begin = lod.begin
+	instance.visibility_range_end = lod.end
+	if not lod.impostor.is_empty():
+		_apply_impostor(instance, lod.mesh, lod.impostor)
+	return instance
+
+# Cell edge for a LOD chain. Ranges are measured from the cell center, up to
+# half a diagonal (0.71 edge) from its instances, so an edge of half the
+# nearest switch distance keeps that error within about a third of it.
+func _lod_cell_size(lods: Array) -> float:
+	var nearest := INF
+	for lod in lods:
+		if lod.end > 0.0:
+			nearest = minf(nearest, lod.end)
+	var cell_size := nearest * 0.5
+	if lod_cell_size > 0.0:
+		cell_size = minf(cell_size, lod_cell_size)
+	return cell_size
+
+# Split a TRANSFORM_3D buffer into cell_size cells keyed by cell coordinate,
+# with origins made relative to the cell center
+func _bucket_by_cell(buffer: PackedFloat32Array, count: int, cell_size: float) -> Dictionary:
+	var cells := {}
+	for i in range(count):
+		var row := buffer.slice(i * 12, i * 12 + 12)
+		var cell := Vector2i(floori(row[3] / cell_size), floori(row[11] / cell_size))
+		row[3] -= (cell.x + 0.5) * cell_size
+		row[11] -= (cell.y + 0.5) * cell_size
+		var cell_buffer: PackedFloat32Array = cells.get(cell, PackedFloat32Array())
+		cell_buffer.append_array(row)
+		cells[cell] = cell_buffer
+	return cells
+
+# Meshes of a scene's LOD chain as [{mesh, begin, end, impostor}], LOD0 first. Scenes
+# exported without --lods yield just their first mesh with an unbounded range.
+func _extract_lods(scene: PackedScene) -> Array:
+	var root := scene.instantiate()
+	var mesh_instances := root.find_children("*", "MeshInstance3D", true, false)
+	if root is MeshInstance3D:
+		mesh_instances.push_front(root)
+	var lods := []
+	for node in mesh_instances:
+		var extras: Dictionary = node.get_meta("extras", {})
+		if extras.has("visibility_range_end"):
+			lods.append({
+				"mesh": (node as MeshInstance3D).mesh,
+				"begin": float(extras.get("visibility_range_begin", 0.0)),
+				"end": float(extras["visibility_range_end"]),
+				"impostor": extras.get("impostor", {}),
+			})
+	if lods.is_empty() and not mesh_instances.is_empty():
+		lods.append({"mesh": (mesh_instances[0] as MeshInstance3D).mesh, "begin": 0.0, "end": 0.0, "impostor": {}})
+	lods.sort_custom(func(a, b): return a.begin < b.begin)
+	root.free()
+	return lods
+
+# Copy the visibility ranges the LOD exporters store in glTF node extras onto
+# the imported geometry, so only one level of each LOD chain draws at a time.
+# Billboard impostor levels also get their camera-facing material.
+func _apply_visibility_ranges(node: Node) -> void:
+	for child in node.find_children("*", "GeometryInstance3D", true, false):
+		var extras: Dictionary = child.get_meta("extras", {})
+		if extras.has("visibility_range_end"):
+			child.visibility_range_begin = float(extras.get("visibility_range_begin", 0.0))
+			child.visibility_range_end = float(extras["visibility_range_end"])
+		if extras.has("impostor") and child is MeshInstance3D:
+			_apply_impostor(child, child.mesh, extras["impostor"])
+
+# Draw an impostor quad from tools/lod.py with shaders/impostor.gdshader, which
+# turns it to the camera and picks the atlas cell for the view angle. The quad
+# is exported facing +Z over its bounds, so those give the cell's size and center.
+func _apply_impostor(instance: GeometryInstance3D, mesh: Mesh, impostor: Dictionary) -> void:
+	var bounds := mesh.get_aabb()
+	var material := ShaderMaterial.new()
+	material.shader = impostor_shader
+	var source := mesh.surface_get_material(0) as BaseMaterial3D
+	if source:
+		material.set_shader_parameter("atlas", source.albedo_texture)
+	material.set_shader_parameter("directions", int(impostor.get("directions", 8)))
+	material.set_shader_parameter("columns", int(impostor.get("columns", 4)))
+	material.set_shader_parameter("rows", int(impostor.get("rows", 2)))
+	material.set_shader_parameter("center", bounds.get_center())
+	material.set_shader_parameter("extent", bounds.size.x)
+	instance.material_override = material
+	# The turned quad leaves the flat bounds it was exported with
+	instance.extra_cull_margin = bounds.size.x * 0.5
+
 func _get_random_position() -> Vector3:
 	var angle = rng.randf() * TAU
 	var dist = rng.randf_range(clear_radius, spawn_radius)
@@ -32,10 +185,12 @@ func _get_random_position() -> Vector3:
 
 func _get_terrain_height(x: float, z: float) -> float:
 	# Match the terrain generation formula from create_grass_terrain.py
-	var h = 3.0 * sin(x * 0.03) * cos(z * 0.025)
-	h += 1.5 * sin(x * 0.08 + 1.5) * cos(z * 0.06 + 0.7)
-	h += 0.5 * sin(x * 0.2 + 3.0) * cos(z * 0.25 + 2.1)
-	h += 0.2 * sin(x * 0.5) * sin(z * 0.5)
+	# Blender's Y axis is exported as glTF -Z, so the formula's y is -z here
+	var y = -z
+	var h = 3.0 * sin(x * 0.03) * cos(y * 0.025)
+	h += 1.5 * sin(x * 0.08 + 1.5) * cos(y * 0.06 + 0.7)
+	h += 0.5 * sin(x * 0.2 + 3.0) * cos(y * 0.25 + 2.1)
+	h += 0.2 * sin(x * 0.5) * sin(y * 0.5)
 	
 	var dist_from_center = sqrt(x*x + z*z)
 	if dist_from_center < 15:
@@ -55,6 +210,7 @@ func _spawn_trees() -> void:
 		
 		var tree_scene = tree_scenes[rng.randi() % tree_scenes.size()]
 		var tree = tree_scene.instantiate()
+		_apply_visibility_ranges(tree)
 		tree.position = pos
 		tree.rotation.y = rng.randf() * TAU
 		var s = rng.randf_range(0.8, 1.4)
@@ -73,6 +229,7 @@ func _spawn_grass() -> void:
 		pos.y = _get_terrain_height(pos.x, pos.z)
 		
 		var grass = grass_scene.instantiate()
+		_apply_visibility_ranges(grass)
 		grass.position = pos
 		grass.rotation.y = rng.randf() * TAU
 		var s = rng.randf_range(0.7, 1.5)
@@ -89,6 +246,7 @@ func _spawn_rocks() -> void:
 		pos.y = _get_terrain_height(pos.x, pos.z)
 		
 		var rock = rock_scene.instantiate()
+		_apply_visibility_ranges(rock)
 		rock.position = pos
 		rock.rotation.y = rng.randf() * TAU
 		rock.rotation.x = rng.randf_range(-0.2, 0.2)
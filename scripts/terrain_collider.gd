@@ -1,9 +1,28 @@
 extends StaticBody3D
 
+# Binary heightfield written next to terrain.glb by tools/create_grass_terrain.py.
+# Header: "HFLD", u32 version, u32 width, u32 depth, f32 origin x/z, f32 spacing x/z,
+# followed by width * depth float32 heights (row-major, one row per Z sample).
+@export_file var heightfield_path: String = "res://assets/models/nature/terrain.hfield"
+
+const HEIGHTFIELD_MAGIC := "HFLD"
+const HEIGHTFIELD_VERSION := 1
+
+var _heights := PackedFloat32Array()
+var _width: int = 0
+var _depth: int = 0
+var _origin := Vector2.ZERO
+var _spacing := Vector2.ONE
+
 func _ready() -> void:
 	call_deferred("_create_collision")
 
 func _create_collision() -> void:
+	if _load_heightfield(heightfield_path):
+		_create_heightmap_collision()
+		return
+
+	# Fallback: build a trimesh from the imported terrain mesh (slow, memory heavy)
 	# Find the MeshInstance3D inside the imported terrain glb
 	var mesh_instance = _find_mesh_instance(self)
 	if mesh_instance and mesh_instance.mesh:
@@ -21,6 +40,55 @@ func _create_collision() -> void:
 				child.queue_free()
 				break
 
+func _load_heightfield(path: String) -> bool:
+	if not FileAccess.file_exists(path):
+		return false
+	var file := FileAccess.open(path, FileAccess.READ)
+	if file == null:
+		return false
+	if file.get_buffer(4).get_string_from_ascii() != HEIGHTFIELD_MAGIC or file.get_32() != HEIGHTFIELD_VERSION:
+		push_warning("Unsupported heightfield sidecar: %s" % path)
+		return false
+	_width = file.get_32()
+	_depth = file.get_32()
+	_origin = Vector2(file.get_float(), file.get_float())
+	_spacing = Vector2(file.get_float(), file.get_float())
+	_heights = file.get_buffer(_width * _depth * 4).to_float32_array()
+	return _width >= 2 and _depth >= 2 and _heights.size() == _width * _depth
+
+func _create_heightmap_collision() -> void:
+	var shape := HeightMapShape3D.new()
+	shape.map_width = _width
+	shape.map_depth = _depth
+	shape.map_data = _heights
+
+	# HeightMapShape3D samples are one unit apart and centered on the shape,
+	# so scale X/Z by the grid spacing and move it to the grid center
+	var col := CollisionShape3D.new()
+	col.shape = shape
+	col.scale = Vector3(_spacing.x, 1.0, _spacing.y)
+	col.position = Vector3(
+		_origin.x + (_width - 1) * _spacing.x * 0.5,
+		0.0,
+		_origin.y + (_depth - 1) * _spacing.y * 0.5)
+	add_child(col)
+
+# Terrain height at local (x, z), bilinearly interpolated from the heightfield.
+# Returns 0.0 when no sidecar was loaded.
+func get_height(x: float, z: float) -> float:
+	if _heights.is_empty():
+		return 0.0
+	var fx := clampf((x - _origin.x) / _spacing.x, 0.0, _width - 1)
+	var fz := clampf((z - _origin.y) / _spacing.y, 0.0, _depth - 1)
+	var x0 := mini(int(fx), _width - 2)
+	var z0 := mini(int(fz), _depth - 2)
+	var tx := fx - x0
+	var tz := fz - z0
+	var i := z0 * _width + x0
+	var top := lerpf(_heights[i], _heights[i + 1], tx)
+	var bottom := lerpf(_heights[i + _width], _heights[i + _width + 1], tx)
+	return lerpf(top, bottom, tz)
+
 func _find_mesh_instance(node: Node) -> MeshInstance3D:
 	if node is MeshInstance3D:
 		return node
@@ -0,0 +1,253 @@
+"""
+Keyframe reduction for the animations of a GLB.
+
+Meshy clips arrive baked at one key per frame on every bone channel. This
+pass removes keys that interpolation between their neighbours reproduces
+within a tolerance (translation and scale by distance, rotations by the
+angle between the slerped and the original quaternion), drops channels
+that never leave the node's rest value, collapses other constant channels
+to one key, and can store rotations as normalized int16. Meshes, skins and
+textures are copied unchanged; a per-clip report shows the bytes saved.
+
+Pure Python + NumPy, no Blender needed:
+    python tools/anim_optimize.py Meshy_AI_Character_AllAnimations.glb --quantize
+"""
+
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from gltf_io import COMPONENT_DTYPES, TYPE_COMPONENTS, GLBFile, append_accessor, compact_buffers, write_glb
+
+DEFAULT_TOLERANCES = {
+    "translation": 0.0005,  # meters
+    "rotation": 0.05,       # degrees
+    "scale": 0.0005,
+    "weights": 0.001,
+}
+REST_VALUES = {"translation": [0.0, 0.0, 0.0], "rotation": [0.0, 0.0, 0.0, 1.0], "scale": [1.0, 1.0, 1.0]}
+
+# Divisors of normalized integer components (glTF 2.0, section 3.11)
+NORMALIZED_SCALE = {np.dtype(np.int8): 127.0, np.dtype(np.uint8): 255.0,
+                    np.dtype(np.int16): 32767.0, np.dtype(np.uint16): 65535.0}
+
+
+# ========== CURVES ==========
+def dequantize(values, normalized):
+    """Accessor values as float64, undoing normalized integer storage."""
+    if normalized:
+        return np.maximum(values / NORMALIZED_SCALE[values.dtype], -1.0)
+    return values.astype(np.float64)
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t[:, None]
+
+
+def slerp(a, b, t):
+    """Shortest-path slerp from quaternion a to b at each t (xyzw, like glTF)."""
+    a = a / np.linalg.norm(a)
+    b = b / np.linalg.norm(b)
+    dot = float(np.dot(a, b))
+    if dot < 0.0:
+        b, dot = -b, -dot
+    if dot > 0.9995:
+        q = lerp(a, b, t)
+    else:
+        theta = math.acos(dot)
+        q = (np.sin((1.0 - t) * theta)[:, None] * a + np.sin(t * theta)[:, None] * b) / math.sin(theta)
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def distance_error(approx, exact):
+    return np.linalg.norm(approx - exact, axis=1)
+
+
+def angle_error(approx, exact):
+    """Rotation angle (degrees) between quaternion rows, sign-insensitive."""
+    exact = exact / np.linalg.norm(exact, axis=1, keepdims=True)
+    dot = np.clip(np.abs(np.sum(approx * exact, axis=1)), 0.0, 1.0)
+    return np.degrees(2.0 * np.arccos(dot))
+
+
+def reduce_keys(times, values, interpolate, error, tolerance):
+    """Indices of the keys to keep so every dropped key is reproduced within tolerance.
+
+    Recursive subdivision (Douglas-Peucker on the time axis): a segment
+    between two kept keys is split at its worst interior key until every
+    interior key interpolates within tolerance.
+    """
+    count = len(times)
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, count - 1]] = True
+    stack = [(0, count - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        t = (times[i + 1:j] - times[i]) / (times[j] - times[i])
+        err = error(interpolate(values[i], values[j], t), values[i + 1:j])
+        worst = int(np.argmax(err))
+        if err[worst] > tolerance:
+            split = i + 1 + worst
+            keep[split] = True
+            stack.extend(((i, split), (split, j)))
+    return np.flatnonzero(keep)
+
+
+def reduce_step_keys(values, error, tolerance):
+    """Keys of a STEP curve where the held value actually changes."""
+    keep = [0]
+    for k in range(1, len(values)):
+        if error(values[k:k + 1], values[keep[-1]:keep[-1] + 1])[0] > tolerance:
+            keep.append(k)
+    return np.array(keep)
+
+
+def is_constant(values, error, tolerance):
+    return bool((error(np.repeat(values[:1], len(values), axis=0), values) <= tolerance).all())
+
+
+# ========== CLIPS ==========
+def optimize_sampler(times, values, path, interpolation, tolerances, rest=None):
+    """Reduce one channel; returns (times, values) or None when the channel can be dropped."""
+    if path == "rotation":
+        interpolate, error = slerp, angle_error
+    else:
+        interpolate, error = lerp, distance_error
+    tolerance = tolerances[path]
+
+    if is_constant(values, error, tolerance):
+        if rest is not None and error(values[:1], np.asarray([rest], dtype=np.float64))[0] <= tolerance:
+            return None
+        return times[:1], values[:1]
+    if interpolation == "STEP":
+        keep = reduce_step_keys(values, error, tolerance)
+    else:
+        keep = reduce_keys(times, values, interpolate, error, tolerance)
+    return times[keep], values[keep]
+
+
+def _sampler_bytes(gltf, samplers):
+    """Bytes of the distinct accessors behind samplers."""
+    total = 0
+    for index in {i for sampler in samplers for i in (sampler["input"], sampler["output"])}:
+        accessor = gltf["accessors"][index]
+        size = np.dtype(COMPONENT_DTYPES[accessor["componentType"]]).itemsize
+        total += accessor["count"] * TYPE_COMPONENTS[accessor["type"]] * size
+    return total
+
+
+def optimize_glb(input_path, output_path, tolerances=None, quantize=False, drop_rest=True):
+    """Reduce every animation of input_path into output_path; returns one report dict per clip."""
+    tolerances = dict(DEFAULT_TOLERANCES, **(tolerances or {}))
+    with GLBFile(input_path) as glb:
+        gltf = glb.gltf
+        binary = bytearray(glb.read_range(0, glb.bin_length)) if glb.bin_offset is not None else bytearray()
+        nodes = gltf.get("nodes", [])
+        stored = {}
+
+        def store(array, accessor_type, normalized=False):
+            key = (array.dtype.str, accessor_type, normalized, array.tobytes())
+            if key not in stored:
+                stored[key] = append_accessor(gltf, binary, array, accessor_type, normalized)
+            return stored[key]
+
+        reports = []
+        for animation in gltf.get("animations", []):
+            report = {
+                "name": animation.get("name"),
+                "channels_before": len(animation["channels"]),
+                "keys_before": sum(gltf["accessors"][s["input"]]["count"] for s in animation["samplers"]),
+                "bytes_before": _sampler_bytes(gltf, animation["samplers"]),
+            }
+            samplers, channels = [], []
+            for channel in animation["channels"]:
+                sampler = animation["samplers"][channel["sampler"]]
+                path = channel["target"]["path"]
+                interpolation = sampler.get("interpolation", "LINEAR")
+                if interpolation == "CUBICSPLINE" or "node" not in channel["target"]:
+                    samplers.append(sampler)
+                    channels.append(dict(channel, sampler=len(samplers) - 1))
+                    continue
+
+                accessor = gltf["accessors"][sampler["output"]]
+                times = glb.read_accessor(sampler["input"]).astype(np.float64)
+                values = dequantize(glb.read_accessor(sampler["output"]), accessor.get("normalized", False))
+                values = values.reshape(len(times), -1)
+                node = nodes[channel["target"]["node"]]
+                rest = None
+                if drop_rest and path in REST_VALUES and "matrix" not in node:
+                    rest = node.get(path, REST_VALUES[path])
+                reduced = optimize_sampler(times, values, path, interpolation, tolerances, rest)
+                if reduced is None:
+                    continue
+
+                new_times, new_values = reduced
+                if path == "rotation" and quantize:
+                    unit = new_values / np.linalg.norm(new_values, axis=1, keepdims=True)
+                    output = store(np.round(unit * 32767.0).astype(np.int16), "VEC4", normalized=True)
+                else:
+                    output_type = accessor["type"] if path != "weights" else "SCALAR"
+                    flat = new_values.astype(np.float32)
+                    output = store(flat.ravel() if output_type == "SCALAR" else flat, output_type)
+                samplers.append({"input": store(new_times.astype(np.float32), "SCALAR"), "output": output,
+                                 "interpolation": interpolation})
+                channels.append(dict(channel, sampler=len(samplers) - 1))
+
+            animation["samplers"], animation["channels"] = samplers, channels
+            report["channels_after"] = len(channels)
+            report["keys_after"] = sum(gltf["accessors"][s["input"]]["count"] for s in samplers)
+            report["bytes_after"] = _sampler_bytes(gltf, samplers)
+            reports.append(report)
+
+    binary = compact_buffers(gltf, binary)
+    write_glb(output_path, gltf, binary)
+    return reports
+
+
+def print_report(reports):
+    print(f"{'Clip':<24} {'Channels':>15} {'Keys':>17} {'Bytes':>21} {'Saved':>7}")
+    for r in reports:
+        saved = 1.0 - r["bytes_after"] / r["bytes_before"] if r["bytes_before"] else 0.0
+        print(f"{str(r['name'])[:24]:<24} {r['channels_before']:>6} -> {r['channels_after']:<6} "
+              f"{r['keys_before']:>7} -> {r['keys_after']:<7} {r['bytes_before']:>9} -> {r['bytes_after']:<9} "
+              f"{saved:>6.1%}")
+    before = sum(r["bytes_before"] for r in reports)
+    after = sum(r["bytes_after"] for r in reports)
+    print(f"Animation data: {before} -> {after} bytes ({before - after} saved)")
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Remove redundant animation keys from a GLB.")
+    parser.add_argument("input", help="GLB to optimize")
+    parser.add_argument("--output", "-o", help="GLB to write (default: overwrite the input)")
+    parser.add_argument("--translation-tolerance", type=float, default=DEFAULT_TOLERANCES["translation"],
+                        help="max position error in scene units")
+    parser.add_argument("--rotation-tolerance", type=float, default=DEFAULT_TOLERANCES["rotation"],
+                        help="max rotation error in degrees")
+    parser.add_argument("--scale-tolerance", type=float, default=DEFAULT_TOLERANCES["scale"])
+    parser.add_argument("--weights-tolerance", type=float, default=DEFAULT_TOLERANCES["weights"])
+    parser.add_argument("--quantize", action="store_true", help="store rotations as normalized int16")
+    parser.add_argument("--keep-rest-channels", action="store_true",
+                        help="keep constant channels that equal the node's rest value (as one key)")
+    args = parser.parse_args(argv)
+
+    output = args.output or args.input
+    tmp = output + ".tmp"
+    tolerances = {"translation": args.translation_tolerance, "rotation": args.rotation_tolerance,
+                  "scale": args.scale_tolerance, "weights": args.weights_tolerance}
+    reports = optimize_glb(args.input, tmp, tolerances, args.quantize, drop_rest=not args.keep_rest_channels)
+    os.replace(tmp, output)
+    print_report(reports)
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Procedural rigging for generated meshes: bone chains and joint-blended skin weights.
+
+A generator that knows where its parts are lists bones (name, parent, head,
+tail in Blender space) and, per part, the bone that drives it. part_weights
+then gives every vertex of a part its bone's influence, cross-faded at the
+bone's ends: toward the parent bone around the head, and toward the child
+bone that continues from the tail (an elbow, a knee, the next tail
+segment), with a smoothstep over blend * bone length on either side of the
+joint. Rigid parts (eyes, claws, teeth) follow a single bone.
+
+The arrays feed glb_writer (JOINTS_0/WEIGHTS_0 plus a skin) or, in
+Blender, create_armature + bind_weights. Everything except those two is
+pure Python + NumPy.
+"""
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+DEFAULT_BLEND = 0.3
+CONNECTED_DISTANCE = 0.05
+MAX_INFLUENCES = 4
+
+
+class Bone:
+    """One bone of a rest pose: head and tail in Blender space, parent as an index into the bone list."""
+
+    def __init__(self, name, head, tail, parent=None):
+        self.name = name
+        self.head = np.asarray(head, dtype=np.float64)
+        self.tail = np.asarray(tail, dtype=np.float64)
+        self.parent = parent
+
+    @property
+    def length(self):
+        return float(np.linalg.norm(self.tail - self.head))
+
+
+def bone_index(bones):
+    return {bone.name: i for i, bone in enumerate(bones)}
+
+
+def offset_bones(bones, offset):
+    """Bones moved by offset (e.g. the same grounding shift the mesh got)."""
+    return [Bone(b.name, b.head + offset, b.tail + offset, b.parent) for b in bones]
+
+
+def _smoothstep(edge0, edge1, x):
+    t = np.clip((x - edge0) / (edge1 - edge0), 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def continuation(bones, index):
+    """The single child bone whose head sits on this bone's tail, or None."""
+    children = [i for i, bone in enumerate(bones) if bone.parent == index
+                and np.linalg.norm(bone.head - bones[index].tail) < CONNECTED_DISTANCE]
+    return children[0] if len(children) == 1 else None
+
+
+def part_weights(positions, vertex_parts, part_bones, bones, blend=DEFAULT_BLEND):
+    """Per-vertex (joints (N, 4) uint, weights (N, 4) float32) from each part's driving bone.
+
+    part_bones[p] is (bone index, rigid) for part p. Weights of a vertex sum
+    to 1, largest first; unused slots are joint 0 with weight 0.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    count = len(positions)
+    joints = np.zeros((count, 3), dtype=np.int64)
+    weights = np.zeros((count, 3), dtype=np.float64)
+    part_bone = np.array([bone for bone, _ in part_bones], dtype=np.int64)[vertex_parts]
+    rigid = np.array([flag for _, flag in part_bones], dtype=bool)[vertex_parts]
+
+    for b, bone in enumerate(bones):
+        mask = part_bone == b
+        if not mask.any():
+            continue
+        joints[mask, 0] = b
+        weights[mask, 0] = 1.0
+        soft = mask & ~rigid
+        length = bone.length
+        if not soft.any() or length <= 0.0:
+            continue
+        radius = blend * length
+        along = (positions[soft] - bone.head) @ ((bone.tail - bone.head) / length)
+        toward_parent = np.zeros(len(along))
+        toward_child = np.zeros(len(along))
+        if bone.parent is not None:
+            toward_parent = 1.0 - _smoothstep(-radius, radius, along)
+            joints[soft, 1] = bone.parent
+        child = continuation(bones, b)
+        if child is not None:
+            toward_child = _smoothstep(length - radius, length + radius, along)
+            joints[soft, 2] = child
+        # A bone shorter than two blend radii can be pulled both ways; keep the sum at 1
+        total = np.maximum(1.0, toward_parent + toward_child)
+        weights[soft, 1] = toward_parent / total
+        weights[soft, 2] = toward_child / total
+        weights[soft, 0] = 1.0 - weights[soft, 1] - weights[soft, 2]
+
+    weights[weights < 1e-4] = 0.0
+    joints[weights == 0.0] = 0
+    order = np.argsort(-weights, axis=1, kind="stable")
+    joints = np.take_along_axis(joints, order, axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+    weights /= weights.sum(axis=1, keepdims=True)
+    pad = MAX_INFLUENCES - joints.shape[1]
+    joints = np.pad(joints, ((0, 0), (0, pad)))
+    weights = np.pad(weights, ((0, 0), (0, pad)))
+    dtype = np.uint8 if len(bones) <= 256 else np.uint16
+    return joints.astype(dtype), weights.astype(np.float32)
+
+
+# ========== BLENDER ==========
+def create_armature(name, bones):
+    """Create and link an armature object with bones in their rest pose; returns the object.
+
+    Edit bones can only be made in edit mode, so this is the one place the
+    generators still switch modes.
+    """
+    data = bpy.data.armatures.new(name)
+    obj = bpy.data.objects.new(name, data)
+    bpy.context.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit_bones = []
+    for bone in bones:
+        edit_bone = data.edit_bones.new(bone.name)
+        edit_bone.head = bone.head.tolist()
+        edit_bone.tail = bone.tail.tolist()
+        if bone.parent is not None:
+            edit_bone.parent = edit_bones[bone.parent]
+            edit_bone.use_connect = False
+        edit_bones.append(edit_bone)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return obj
+
+
+def bind_weights(mesh_obj, armature_obj, bones, joints, weights):
+    """Write joints/weights as vertex groups and parent mesh_obj to armature_obj with an Armature modifier."""
+    rounded = np.round(weights, 4)
+    for b, bone in enumerate(bones):
+        group = mesh_obj.vertex_groups.new(name=bone.name)
+        influence = np.where(joints == b, rounded, 0.0).sum(axis=1)
+        # One add() call per distinct weight instead of one per vertex
+        for value in np.unique(influence[influence > 0.0]):
+            group.add(np.flatnonzero(influence == value).tolist(), float(value), 'REPLACE')
+    modifier = mesh_obj.modifiers.new("Armature", 'ARMATURE')
+    modifier.object = armature_obj
+    mesh_obj.parent = armature_obj
+    return modifier
@@ -0,0 +1,193 @@
+"""
+Bake nature scatter placements into packed MultiMesh transform buffers.
+
+Runs the same seeded annulus distribution as scripts/nature_spawner.gd (same
+spawn/clear radii, rotation and scale ranges) ahead of time, rejects
+overlapping instances Poisson-disk style, and writes one float32 buffer of
+3x4 transforms per species. At runtime each species becomes a single
+MultiMesh buffer upload instead of thousands of instantiate() calls.
+Instances stand on terrain.hfield, the height grid create_grass_terrain.py
+exports alongside terrain.glb, so they follow the shipped terrain.
+
+Pure Python + NumPy, no Blender needed:
+    python tools/bake_scatter.py --density 10
+"""
+
+import argparse
+import math
+import os
+import random
+import struct
+import sys
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from heightfield import read_heightfield, sample_heightfield
+
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+NATURE_DIR = os.path.join(PROJECT_ROOT, "assets", "models", "nature")
+OUTPUT_PATH = os.path.join(NATURE_DIR, "nature_scatter.bin")
+HEIGHTFIELD_PATH = os.path.join(NATURE_DIR, "terrain.hfield")
+
+# File layout (little-endian):
+#   magic "SCAT", u32 version, u32 species count, then per species:
+#   32-byte NUL-padded name, u32 instance count, count * 12 float32.
+# Each instance is Godot's MultiMesh TRANSFORM_3D layout: the rows of
+# [basis | origin], i.e. basis.x.x, basis.y.x, basis.z.x, origin.x, ...
+SCATTER_MAGIC = b"SCAT"
+SCATTER_VERSION = 1
+SPECIES_NAME_SIZE = 32
+
+TREE_SPECIES = ["oak_tree", "pine_tree", "birch_tree"]
+
+# Footprint radius (m, before instance scale) used for overlap rejection
+FOOTPRINTS = {
+    "oak_tree": 1.5,
+    "pine_tree": 1.2,
+    "birch_tree": 1.0,
+    "grass_patch": 1.0,
+    "rock": 0.8,
+}
+
+
+class PoissonDiskSet:
+    """Accepted instance footprints, bucketed on a uniform grid for fast overlap tests."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.max_radius = 0.0
+
+    def _cell(self, x, z):
+        return int(math.floor(x / self.cell_size)), int(math.floor(z / self.cell_size))
+
+    def fits(self, x, z, radius):
+        cx, cz = self._cell(x, z)
+        reach = int(math.ceil((radius + self.max_radius) / self.cell_size))
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cz - reach, cz + reach + 1):
+                for ox, oz, orad in self.cells.get((i, j), ()):
+                    min_dist = radius + orad
+                    if (x - ox) ** 2 + (z - oz) ** 2 < min_dist * min_dist:
+                        return False
+        return True
+
+    def add(self, x, z, radius):
+        self.cells.setdefault(self._cell(x, z), []).append((x, z, radius))
+        self.max_radius = max(self.max_radius, radius)
+
+
+def _godot_transform(x, y, z, rot_y, rot_x, scale):
+    """Row-major 3x4 [basis | origin] for a Node3D with YXZ euler rotation and scale."""
+    cy, sy = math.cos(rot_y), math.sin(rot_y)
+    cx, sx = math.cos(rot_x), math.sin(rot_x)
+    rot = np.array([[cy, 0.0, sy], [0.0, 1.0, 0.0], [-sy, 0.0, cy]]) @ \
+        np.array([[1.0, 0.0, 0.0], [0.0, cx, -sx], [0.0, sx, cx]])
+    basis = rot * np.asarray(scale)  # scale columns: scale is applied before rotation
+    origin = np.array([x, y, z])
+    return np.concatenate([basis, origin[:, None]], axis=1).ravel()
+
+
+def bake_scatter(heightfield, seed=12345, tree_count=60, grass_count=120, rock_count=25,
+                 spawn_radius=80.0, clear_radius=10.0, max_attempts=30):
+    """Place every species and return {species name: (N, 12) float32 transforms}.
+
+    heightfield is a terrain sidecar as returned by read_heightfield.
+    """
+    rng = random.Random(seed)
+    placed = PoissonDiskSet(cell_size=2.0 * max(FOOTPRINTS.values()))
+    transforms = {name: [] for name in TREE_SPECIES + ["grass_patch", "rock"]}
+
+    def place(count, min_dist, pick):
+        missed = 0
+        for _ in range(count):
+            for _ in range(max_attempts):
+                angle = rng.random() * math.tau
+                dist = rng.uniform(min_dist, spawn_radius)
+                x, z = math.cos(angle) * dist, math.sin(angle) * dist
+                name, rot_y, rot_x, scale = pick()
+                radius = FOOTPRINTS[name] * max(scale)
+                if placed.fits(x, z, radius):
+                    placed.add(x, z, radius)
+                    y = float(sample_heightfield(*heightfield, x, z))
+                    transforms[name].append(_godot_transform(x, y, z, rot_y, rot_x, scale))
+                    break
+            else:
+                missed += 1
+        return missed
+
+    def pick_tree():
+        s = rng.uniform(0.8, 1.4)
+        return rng.choice(TREE_SPECIES), rng.random() * math.tau, 0.0, (s, s, s)
+
+    def pick_grass():
+        s = rng.uniform(0.7, 1.5)
+        return "grass_patch", rng.random() * math.tau, 0.0, (s, s, s)
+
+    def pick_rock():
+        rot_y = rng.random() * math.tau
+        rot_x = rng.uniform(-0.2, 0.2)
+        s = rng.uniform(0.5, 2.0)
+        return "rock", rot_y, rot_x, (s, s * rng.uniform(0.6, 1.0), s)
+
+    # Big footprints first so small props fill the gaps between them
+    missed = place(tree_count, clear_radius, pick_tree)
+    missed += place(rock_count, clear_radius, pick_rock)
+    missed += place(grass_count, 2.0, pick_grass)
+    if missed:
+        print(f"WARNING: {missed} instances did not fit within {spawn_radius} m after {max_attempts} attempts")
+
+    return {name: np.array(rows, dtype=np.float32).reshape(-1, 12) for name, rows in transforms.items()}
+
+
+def write_scatter(path, buffers):
+    """Write {species name: (N, 12) transforms} as a scatter file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", SCATTER_MAGIC, SCATTER_VERSION, len(buffers)))
+        for name, rows in buffers.items():
+            encoded = name.encode("utf-8")
+            if len(encoded) >= SPECIES_NAME_SIZE:
+                raise ValueError(f"Species name too long: {name}")
+            f.write(struct.pack(f"<{SPECIES_NAME_SIZE}sI", encoded, len(rows)))
+            f.write(np.ascontiguousarray(rows, dtype="<f4").tobytes())
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Bake nature scatter transforms for MultiMesh.")
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--density", type=float, default=1.0,
+                        help="multiplier applied to all instance counts")
+    parser.add_argument("--tree-count", type=int, default=60)
+    parser.add_argument("--grass-count", type=int, default=120)
+    parser.add_argument("--rock-count", type=int, default=25)
+    parser.add_argument("--spawn-radius", type=float, default=80.0)
+    parser.add_argument("--clear-radius", type=float, default=10.0)
+    parser.add_argument("--heightfield", default=HEIGHTFIELD_PATH,
+                        help="terrain sidecar written by create_grass_terrain.py")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.heightfield):
+        print(f"ERROR: {args.heightfield} not found; export the terrain with create_grass_terrain.py first")
+        raise SystemExit(1)
+    buffers = bake_scatter(
+        read_heightfield(args.heightfield),
+        seed=args.seed,
+        tree_count=round(args.tree_count * args.density),
+        grass_count=round(args.grass_count * args.density),
+        rock_count=round(args.rock_count * args.density),
+        spawn_radius=args.spawn_radius,
+        clear_radius=args.clear_radius,
+    )
+    write_scatter(args.output, buffers)
+    for name, rows in buffers.items():
+        print(f"  {name}: {len(rows)} instances")
+    print(f"Exported: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
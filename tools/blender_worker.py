@@ -0,0 +1,257 @@
+"""
+Pool of warm headless Blender processes that run tool scripts on request.
+
+Inside Blender (the server side) this reads one JSON job per line from
+stdin, runs it and answers with one JSON result line. A job either runs a
+script as if it had been started with
+``blender --background --python <script> -- <args>``, or imports the
+script and calls one of its functions with keyword arguments:
+
+    {"id": 1, "script": "tools/create_trees.py", "args": ["--lods"]}
+    {"id": 2, "script": "tools/create_trees.py", "function": "export_variants",
+     "kwargs": {"jobs": [["oak", 0, 7]], "out_dir": "/tmp/trees"}}
+
+Results are prefixed lines on the original stdout; everything the job
+prints (Python or Blender) is captured into the result instead:
+
+    @blender-worker {"id": 2, "ok": true, "result": [...], "error": null,
+                     "output": "Exported oak_tree_000.glb\\n", "seconds": 0.41}
+
+Between jobs the worker resets to an empty factory scene, restores argv,
+cwd and sys.path, and forgets project modules the job imported, so every
+job sees the fresh Blender the tool scripts were written for.
+
+From plain Python, BlenderPool keeps N such processes alive and hands out
+jobs; run this file directly to stream a JSON-lines job file through a pool:
+
+    python tools/blender_worker.py --workers 4 jobs.jsonl > results.jsonl
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import queue
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+BLENDER = os.environ.get("BLENDER", "blender")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Result lines carry a prefix so Blender's own startup banner on stdout is skipped
+RESULT_PREFIX = "@blender-worker "
+
+
+# ========== SERVER (inside Blender) ==========
+def reset_scene():
+    """Back to an empty factory scene, as a fresh blender --factory-startup would be."""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def _forget_project_modules(before):
+    """Drop modules under the project imported since `before`, so edits and module state don't leak."""
+    for name in set(sys.modules) - before:
+        path = getattr(sys.modules[name], "__file__", None) or ""
+        if os.path.abspath(path).startswith(PROJECT_ROOT + os.sep):
+            del sys.modules[name]
+
+
+def run_job(job):
+    """Run one job dict in this Blender; returns its result dict (without captured output)."""
+    script = os.path.abspath(job["script"])
+    start = time.perf_counter()
+    saved = sys.argv, os.getcwd(), list(sys.path), set(sys.modules)
+    sys.argv = [saved[0][0], "--background", "--python", script, "--", *job.get("args", [])]
+    result, error = None, None
+    try:
+        reset_scene()
+        if job.get("function"):
+            namespace = runpy.run_path(script, run_name="blender_worker_job")
+            result = namespace[job["function"]](**job.get("kwargs", {}))
+        else:
+            runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            error = f"exit code {e.code}"
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        sys.argv = saved[0]
+        os.chdir(saved[1])
+        sys.path[:] = saved[2]
+        _forget_project_modules(saved[3])
+    return {"id": job.get("id"), "ok": error is None, "result": result, "error": error,
+            "seconds": round(time.perf_counter() - start, 3)}
+
+
+def run_captured(job):
+    """run_job with the job's stdout/stderr (file descriptor level) captured into result["output"]."""
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as log:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_out, saved_err = os.dup(1), os.dup(2)
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        try:
+            result = run_job(job)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_out, 1)
+            os.dup2(saved_err, 2)
+            os.close(saved_out)
+            os.close(saved_err)
+        log.seek(0)
+        result["output"] = log.read()
+    return result
+
+
+def serve():
+    """Job loop: JSON lines in on stdin, prefixed JSON lines out on the original stdout."""
+    results = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    # Anything printed outside a job (Blender itself) now lands on stderr
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            result = run_captured(json.loads(line))
+        except Exception:
+            result = {"id": None, "ok": False, "result": None, "error": traceback.format_exc(),
+                      "output": "", "seconds": 0.0}
+        results.write(RESULT_PREFIX + json.dumps(result, default=repr) + "\n")
+
+
+# ========== CLIENT (plain Python) ==========
+class BlenderWorker:
+    """Client handle for one warm Blender running serve()."""
+
+    def __init__(self, blender=BLENDER):
+        cmd = [blender, "--background", "--factory-startup", "--python", os.path.abspath(__file__)]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        self._next_id = 0
+
+    @property
+    def alive(self):
+        return self.proc.poll() is None
+
+    def run(self, script, args=(), function=None, kwargs=None):
+        """Run one job in the worker and wait for its result dict."""
+        self._next_id += 1
+        job = {"id": self._next_id, "script": os.path.abspath(script), "args": list(args)}
+        if function:
+            job["function"] = function
+            job["kwargs"] = kwargs or {}
+        self.proc.stdin.write(json.dumps(job) + "\n")
+        self.proc.stdin.flush()
+        for line in self.proc.stdout:
+            if line.startswith(RESULT_PREFIX):
+                return json.loads(line[len(RESULT_PREFIX):])
+            sys.stderr.write(line)
+        raise RuntimeError(f"Blender worker exited with code {self.proc.wait()}")
+
+    def close(self):
+        if self.alive:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+
+class BlenderPool:
+    """Up to `size` warm Blender workers, started on demand and reused across jobs.
+
+    submit() returns a Future of the job's result dict. A worker that dies
+    mid-job yields a failed result and is replaced on the next job.
+    """
+
+    def __init__(self, size=os.cpu_count() or 1, blender=BLENDER):
+        self.size = max(1, size)
+        self.blender = blender
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.size)
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._workers) < self.size:
+                worker = BlenderWorker(self.blender)
+                self._workers.append(worker)
+                return worker
+        return self._idle.get()
+
+    def _run(self, script, args, function, kwargs):
+        worker = self._acquire()
+        try:
+            return worker.run(script, args, function, kwargs)
+        except (OSError, RuntimeError) as e:
+            return {"id": None, "ok": False, "result": None, "error": f"worker failed: {e}",
+                    "output": "", "seconds": 0.0}
+        finally:
+            if worker.alive:
+                self._idle.put(worker)
+            else:
+                with self._lock:
+                    self._workers.remove(worker)
+
+    def submit(self, script, args=(), function=None, kwargs=None):
+        """Queue a job; returns a Future resolving to its result dict."""
+        return self._executor.submit(self._run, script, args, function, kwargs)
+
+    def run(self, script, args=(), function=None, kwargs=None):
+        """Run a job and wait for its result dict."""
+        return self.submit(script, args, function, kwargs).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for worker in self._workers:
+            worker.close()
+        self._workers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run JSON-lines Blender jobs on a pool of warm workers.")
+    parser.add_argument("jobs", nargs="?", default="-", help="JSON-lines job file (default: stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--blender", default=BLENDER, help="Blender executable (default: $BLENDER or blender)")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.jobs == "-" else open(args.jobs)
+    with source, BlenderPool(args.workers, args.blender) as pool:
+        futures = []
+        for line in source:
+            if line.strip():
+                job = json.loads(line)
+                future = pool.submit(job["script"], job.get("args", ()), job.get("function"), job.get("kwargs"))
+                futures.append((job.get("id"), future))
+        for job_id, future in futures:
+            result = future.result()
+            result["id"] = job_id
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    if bpy is not None:
+        serve()
+    else:
+        main()
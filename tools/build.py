@@ -0,0 +1,288 @@
+"""
+Incremental asset build for every generator under tools/.
+
+Each target declares the script that builds it, the files it reads and the
+files it writes; a target that reads another target's output depends on
+it. Only stale targets run (missing outputs, or inputs whose contents
+changed, a dependency's outputs included), in dependency order, with
+independent targets in parallel. Blender targets are fed to a pool of warm
+Blender workers (tools/blender_worker.py), so a chain of Blender steps pays
+startup once per worker instead of once per script. Per-target timings are
+printed at the end.
+
+    python tools/build.py                   # everything that is stale
+    python tools/build.py trees nature      # just these (plus stale dependencies)
+    python tools/build.py --list
+    python tools/build.py --force --jobs 4
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from blender_worker import BLENDER, BlenderPool
+
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+STATE_PATH = os.path.join(PROJECT_ROOT, ".build_cache", "targets.json")
+
+NATURE = "assets/models/nature"
+BIPED = "assets/models/Meshy_AI_biped"
+
+
+class Target:
+    """One build step: run `script args` (in Blender or plain Python) to turn inputs into outputs."""
+
+    def __init__(self, name, script, inputs, outputs, args=(), blender=True):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        # The script itself is always an input, so editing it makes the target stale
+        self.inputs = [script] + [path for path in inputs if path != script]
+        self.outputs = list(outputs)
+        self.blender = blender
+        self.deps = []
+
+
+TARGETS = [
+    Target("nature_scatter", "tools/bake_scatter.py",
+           inputs=["tools/heightfield.py", f"{NATURE}/terrain.hfield"],
+           outputs=[f"{NATURE}/nature_scatter.bin"],
+           blender=False),
+    Target("trees", "tools/create_trees.py",
+           inputs=["tools/tree_mesh.py", "tools/bulk_mesh.py", "tools/lod.py", "tools/glb_writer.py",
+                   "tools/mesh_optimize.py", "tools/foliage_cards.py", "tools/build_cache.py",
+                   "tools/blender_worker.py"],
+           outputs=[f"{NATURE}/oak_tree.glb", f"{NATURE}/pine_tree.glb", f"{NATURE}/birch_tree.glb"]),
+    Target("nature", "tools/create_grass_terrain.py",
+           inputs=["tools/heightfield.py", "tools/bulk_mesh.py", "tools/lod.py", "tools/glb_writer.py",
+                   "tools/mesh_optimize.py", "tools/build_cache.py"],
+           outputs=[f"{NATURE}/grass_patch.glb", f"{NATURE}/terrain.glb", f"{NATURE}/terrain.hfield",
+                    f"{NATURE}/rock.glb"]),
+    Target("enemy", "tools/create_enemy.py",
+           inputs=["tools/primitives.py", "tools/auto_rig.py", "tools/tree_mesh.py", "tools/bulk_mesh.py",
+                   "tools/glb_writer.py", "tools/mesh_optimize.py", "tools/build_cache.py"],
+           outputs=["assets/models/enemy_creature.glb"]),
+    Target("enemy_variants", "tools/create_enemy_variants.py",
+           inputs=["tools/create_enemy.py", "tools/primitives.py", "tools/auto_rig.py", "tools/tree_mesh.py",
+                   "tools/bulk_mesh.py", "tools/glb_writer.py", "tools/mesh_optimize.py", "tools/build_cache.py"],
+           outputs=["assets/models/enemy_variants.glb"]),
+    Target("death_animation", "tools/create_death_anim.py",
+           inputs=["tools/anim_tracks.py", "tools/anims/death.json", f"{BIPED}/Meshy_AI_Character_output.glb"],
+           outputs=[f"{BIPED}/Meshy_AI_Animation_Death.glb"]),
+    Target("anim_variants", "tools/create_anim_variants.py",
+           inputs=["tools/anim_tracks.py", "tools/anims/death.json", "tools/anims/hit.json",
+                   f"{BIPED}/Meshy_AI_Character_output.glb"],
+           outputs=[f"{BIPED}/Meshy_AI_Animation_Variants.glb", f"{BIPED}/Meshy_AI_Animation_Variants.json"]),
+    Target("merged_animations", "tools/merge_meshy_animations.py",
+           inputs=["tools/anim_tracks.py", "tools/gltf_io.py", "tools/glb_writer.py", "tools/anim_optimize.py",
+                   "tools/root_motion.py",
+                   f"{BIPED}/Meshy_AI_Animation_Long_Breathe_and_Look_Around_withSkin.glb",
+                   f"{BIPED}/Meshy_AI_Animation_Short_Breathe_and_Look_Around_withSkin.glb",
+                   f"{BIPED}/Meshy_AI_Animation_Walking_withSkin.glb",
+                   f"{BIPED}/Meshy_AI_Animation_Running_withSkin.glb"],
+           outputs=[f"{BIPED}/Meshy_AI_Character_AllAnimations.glb"],
+           args=["--root-motion", "--optimize"], blender=False),
+]
+
+
+def _abs(path):
+    return os.path.join(PROJECT_ROOT, path)
+
+
+def link_targets(targets):
+    """Fill in each target's deps from the producers of its inputs; returns them in topological order."""
+    producers = {}
+    for target in targets:
+        for path in target.outputs:
+            if path in producers:
+                raise ValueError(f"{path} is produced by both {producers[path].name} and {target.name}")
+            producers[path] = target
+    for target in targets:
+        target.deps = sorted({producers[p] for p in target.inputs if p in producers and producers[p] is not target},
+                             key=targets.index)
+
+    ordered, state = [], {}
+
+    def visit(target, chain):
+        if state.get(target.name) == "done":
+            return
+        if state.get(target.name) == "visiting":
+            raise ValueError("Dependency cycle: " + " -> ".join(t.name for t in chain + [target]))
+        state[target.name] = "visiting"
+        for dep in target.deps:
+            visit(dep, chain + [target])
+        state[target.name] = "done"
+        ordered.append(target)
+
+    for target in targets:
+        visit(target, [])
+    return ordered
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def target_signature(target):
+    """Hash of the target's command and the contents of all its inputs."""
+    digest = hashlib.sha256(json.dumps([target.script, target.args, target.blender]).encode())
+    for path in target.inputs:
+        digest.update(path.encode())
+        digest.update(file_digest(_abs(path)).encode())
+    return digest.hexdigest()
+
+
+def load_state():
+    try:
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def run_python(script, args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, script, *args], cwd=PROJECT_ROOT)
+    error = None if proc.returncode == 0 else f"exit code {proc.returncode}"
+    return {"ok": error is None, "error": error, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def build(targets, jobs=1, force=False, blender=BLENDER):
+    """Run stale targets (and their stale dependencies); returns {name: (status, seconds)}."""
+    state = load_state()
+    report = {}
+    workers = BlenderPool(jobs, blender)
+    pending = list(targets)
+    running = {}
+
+    def status_of(target):
+        """'stale', 'fresh', 'blocked' (a dependency failed) or 'missing' (an input has no producer)."""
+        if any(report.get(dep.name, ("",))[0] in ("failed", "blocked", "missing") for dep in target.deps):
+            return "blocked"
+        missing = [p for p in target.inputs if not os.path.exists(_abs(p))]
+        if missing:
+            print(f"[{target.name}] missing input(s): {', '.join(missing)}")
+            return "missing"
+        # Dependency outputs are inputs too, so a rebuilt dependency whose
+        # bytes did not change (build cache hit) does not cascade
+        if (force or not all(os.path.exists(_abs(p)) for p in target.outputs)
+                or state.get(target.name) != target_signature(target)):
+            return "stale"
+        return "fresh"
+
+    def execute(target):
+        print(f"[{target.name}] building")
+        script = _abs(target.script)
+        if target.blender:
+            result = workers.run(script, target.args)
+            sys.stdout.write(result.get("output", ""))
+            return result
+        return run_python(script, target.args)
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while pending or running:
+                # Start everything whose dependencies have all finished
+                for target in list(pending):
+                    if any(dep.name not in report for dep in target.deps):
+                        continue
+                    pending.remove(target)
+                    status = status_of(target)
+                    if status == "stale":
+                        running[pool.submit(execute, target)] = target
+                    else:
+                        report[target.name] = ("up to date" if status == "fresh" else status, 0.0)
+                if not running:
+                    continue
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    target = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"ok": False, "error": str(e), "seconds": 0.0}
+                    if result["ok"] and all(os.path.exists(_abs(p)) for p in target.outputs):
+                        state[target.name] = target_signature(target)
+                        report[target.name] = ("built", result["seconds"])
+                    else:
+                        state.pop(target.name, None)
+                        print(f"[{target.name}] failed: {result['error'] or 'outputs missing'}")
+                        report[target.name] = ("failed", result["seconds"])
+                save_state(state)
+    finally:
+        workers.close()
+    return report
+
+
+def select(ordered, names):
+    """The named targets plus everything they depend on, in build order."""
+    by_name = {target.name: target for target in ordered}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise KeyError(", ".join(unknown))
+    wanted = set()
+
+    def add(target):
+        if target.name not in wanted:
+            wanted.add(target.name)
+            for dep in target.deps:
+                add(dep)
+
+    for name in names:
+        add(by_name[name])
+    return [target for target in ordered if target.name in wanted]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build stale generated assets in dependency order.")
+    parser.add_argument("targets", nargs="*", help="targets to build (default: all)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="targets run in parallel (and warm Blender workers started)")
+    parser.add_argument("--force", action="store_true", help="rebuild even up-to-date targets")
+    parser.add_argument("--blender", default=BLENDER, help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--list", action="store_true", help="print the targets and their dependencies")
+    args = parser.parse_args()
+
+    ordered = link_targets(TARGETS)
+    if args.list:
+        for target in ordered:
+            deps = ", ".join(dep.name for dep in target.deps) or "-"
+            print(f"{target.name:<20} {'blender' if target.blender else 'python':<8} deps: {deps}")
+        return
+
+    try:
+        targets = select(ordered, args.targets) if args.targets else ordered
+    except KeyError as e:
+        parser.error(f"unknown target(s): {e.args[0]}")
+
+    start = time.perf_counter()
+    report = build(targets, jobs=args.jobs, force=args.force, blender=args.blender)
+
+    print("\nTarget               Status       Seconds")
+    for target in targets:
+        status, seconds = report[target.name]
+        print(f"{target.name:<20} {status:<12} {seconds:>7.2f}")
+    print(f"Total wall time: {time.perf_counter() - start:.2f} s")
+    if any(status in ("failed", "blocked", "missing") for status, _ in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Content-addressed cache for generated assets.
+
+An asset's key hashes everything that can change its bytes: the source of
+its generator functions, its parameters, its seed (or random stream state)
+and the exporter doing the writing. On a hit the outputs are restored from
+the cache directory; on a miss the generator writes into a staging directory
+and the result is published and stored. Either way a file whose bytes did
+not change is left untouched, so its mtime stays put and Godot does not
+re-import it.
+
+    cache = BuildCache()
+    key = asset_key([build_oak], params={"lods": None}, seed=42)
+    if cache.restore(key, [path]) is None:
+        with cache.stage(key, [path]) as (staged,):
+            write_tree(staged)
+"""
+
+import contextlib
+import filecmp
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from glb_writer import GENERATOR as GLB_WRITER_GENERATOR
+
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_DIR = os.path.join(PROJECT_ROOT, ".build_cache")
+
+# Bump to invalidate every cached asset after a change to the key layout
+CACHE_VERSION = 1
+
+
+def exporter_version():
+    """Identify whatever writes the files: Blender + glTF add-on, or glb_writer."""
+    parts = [f"numpy {np.__version__}"]
+    if bpy is None:
+        parts.append(GLB_WRITER_GENERATOR)
+    else:
+        parts.append(f"blender {bpy.app.version_string}")
+        try:
+            import io_scene_gltf2
+            parts.append("gltf " + ".".join(map(str, io_scene_gltf2.bl_info["version"])))
+        except (ImportError, AttributeError, KeyError):
+            pass
+    return "; ".join(parts)
+
+
+def source_text(obj, exclude=()):
+    """Source of a function, class, module or script path, with the source of `exclude` cut out.
+
+    Excluding lets an asset depend on "everything in this module except the
+    other assets' generators", so editing one generator only invalidates
+    the assets it builds.
+    """
+    if isinstance(obj, str):
+        with open(obj, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = inspect.getsource(obj)
+    for other in exclude:
+        if other is not obj:
+            text = text.replace(inspect.getsource(other), "")
+    return text
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return repr(value)
+
+
+def asset_key(sources, params=None, seed=None, exclude=()):
+    """Hex digest over generator sources, JSON params, seed and exporter version."""
+    digest = hashlib.sha256()
+    digest.update(f"build-cache {CACHE_VERSION}\0{exporter_version()}\0".encode())
+    for obj in sources:
+        digest.update(source_text(obj, exclude).encode())
+        digest.update(b"\0")
+    digest.update(json.dumps([params, seed], sort_keys=True, default=_json_default).encode())
+    return digest.hexdigest()
+
+
+def publish_file(src, dst):
+    """Copy src over dst unless the bytes already match; returns True if dst changed."""
+    if os.path.exists(dst) and filecmp.cmp(src, dst, shallow=False):
+        return False
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    tmp = dst + ".tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+    return True
+
+
+def write_if_changed(path, data):
+    """Write bytes (or str) to path only if its content differs; returns True if written."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+class BuildCache:
+    """Outputs of past builds stored under root/<key[:2]>/<key>/."""
+
+    def __init__(self, root=CACHE_DIR, enabled=True):
+        self.root = root
+        self.enabled = enabled
+
+    def _entry(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def lookup(self, key):
+        """Metadata stored with key, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            with open(os.path.join(self._entry(key), "entry.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def restore(self, key, outputs):
+        """Bring outputs up to date from the cache; returns the entry's meta dict, or None on a miss.
+
+        The meta dict is whatever was passed to stage(), and may be empty, so
+        test the result against None.
+        """
+        entry = self.lookup(key)
+        if entry is None or len(entry["files"]) != len(outputs):
+            return None
+        cached = [os.path.join(self._entry(key), name) for name in entry["files"]]
+        if not all(os.path.exists(path) for path in cached):
+            return None
+        changed = [dst for src, dst in zip(cached, outputs) if publish_file(src, dst)]
+        state = "restored" if changed else "up to date"
+        print(f"Cached ({state}): {', '.join(os.path.basename(p) for p in outputs)}")
+        return entry["meta"]
+
+    @contextlib.contextmanager
+    def stage(self, key, outputs, meta=None):
+        """Yield staging paths for outputs; on success publish them and store the entry.
+
+        meta (JSON-able) is stored with the entry and handed back by restore();
+        it may be filled in inside the with block.
+        """
+        meta = {} if meta is None else meta
+        with tempfile.TemporaryDirectory() as tmp:
+            staged = [os.path.join(tmp, str(i), os.path.basename(path)) for i, path in enumerate(outputs)]
+            for path in staged:
+                os.makedirs(os.path.dirname(path))
+            yield staged
+            for src, dst in zip(staged, outputs):
+                if not publish_file(src, dst):
+                    print(f"Unchanged: {os.path.basename(dst)}")
+            if self.enabled:
+                self._store(key, staged, meta)
+
+    def _store(self, key, staged, meta):
+        entry_dir = self._entry(key)
+        tmp_dir = entry_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        names = [f"{i}_{os.path.basename(path)}" for i, path in enumerate(staged)]
+        for src, name in zip(staged, names):
+            shutil.copyfile(src, os.path.join(tmp_dir, name))
+        with open(os.path.join(tmp_dir, "entry.json"), "w") as f:
+            json.dump({"files": names, "meta": meta}, f)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+
+
+def random_state_to_json(state):
+    """random.getstate() as nested lists (a JSON-able seed or cache meta value)."""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def random_state_from_json(value):
+    """Inverse of random_state_to_json, ready for random.setstate()."""
+    version, internal, gauss_next = value
+    return version, tuple(internal), gauss_next
@@ -0,0 +1,87 @@
+"""
+Bulk mesh construction for the procedural generators.
+
+Builds a bpy Mesh straight from NumPy vertex/face arrays with foreach_set,
+so generators never have to create geometry one BMesh vertex at a time.
+"""
+
+try:
+    import bpy
+except ImportError:
+    # Importable from plain CPython; the functions themselves need Blender
+    bpy = None
+import numpy as np
+
+
+def mesh_from_arrays(name, positions, faces, face_sizes=None, material_indices=None,
+                     normals=None, uvs=None, smooth=True):
+    """Create a mesh datablock from arrays.
+
+    faces is either a uniform (F, k) array (all triangles or all quads) or a
+    flat array of vertex indices together with per-face face_sizes.
+    normals, if given, are per-vertex custom normals; uvs, if given, are
+    per-loop (face corner) coordinates in face order.
+    """
+    return write_mesh_arrays(bpy.data.meshes.new(name), positions, faces, face_sizes, material_indices,
+                             normals, uvs, smooth)
+
+
+def write_mesh_arrays(mesh, positions, faces, face_sizes=None, material_indices=None,
+                      normals=None, uvs=None, smooth=True):
+    """Fill an empty mesh (new, or after clear_geometry) from arrays, as mesh_from_arrays does."""
+    positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int32)
+    if face_sizes is None:
+        face_sizes = np.full(len(faces), faces.shape[1] if faces.ndim == 2 else 0, dtype=np.int32)
+    face_sizes = np.asarray(face_sizes, dtype=np.int32)
+    loops = np.ascontiguousarray(faces.ravel())
+    loop_starts = np.zeros(len(face_sizes), dtype=np.int32)
+    np.cumsum(face_sizes[:-1], out=loop_starts[1:])
+
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loops)
+    mesh.polygons.add(len(face_sizes))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        # Blender < 3.6 still stores face sizes explicitly
+        mesh.polygons.foreach_set("loop_total", face_sizes)
+    if material_indices is not None:
+        mesh.polygons.foreach_set("material_index", np.asarray(material_indices, dtype=np.int32))
+    if smooth:
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(face_sizes), dtype=bool))
+    if uvs is not None:
+        mesh.uv_layers.new(name="UVMap").data.foreach_set(
+            "uv", np.ascontiguousarray(uvs, dtype=np.float32).ravel())
+    mesh.update(calc_edges=True)
+
+    if normals is not None:
+        if hasattr(mesh, "use_auto_smooth"):
+            # Custom normals need auto smooth before Blender 4.1
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set_from_vertices(
+            np.asarray(normals, dtype=np.float32).reshape(-1, 3).tolist())
+    return mesh
+
+
+def object_from_arrays(name, positions, faces, materials=(), location=(0.0, 0.0, 0.0), **kwargs):
+    """Create, link and activate an object whose mesh is built by mesh_from_arrays."""
+    mesh = mesh_from_arrays(name + "Mesh", positions, faces, **kwargs)
+    for mat in materials:
+        mesh.materials.append(mat)
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    bpy.context.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    return obj
+
+
+def add_shape_keys(obj, shapes):
+    """Add a Basis plus one shape key per {name: positions (N, 3)} entry, each written in bulk."""
+    if obj.data.shape_keys is None:
+        obj.shape_key_add(name="Basis", from_mix=False)
+    for name, positions in shapes.items():
+        key = obj.shape_key_add(name=name, from_mix=False)
+        key.data.foreach_set("co", np.ascontiguousarray(positions, dtype=np.float32).ravel())
+    return obj.data.shape_keys
@@ -0,0 +1,308 @@
+"""
+Generate seeded variants of the death and hit-reaction clips so a crowd of
+enemies does not die in lockstep.
+
+Each variant applies to its base clip (tools/anims/*.json):
+  - amplitude: a per-bone gain on rotations and on the horizontal part of
+    the root translation (the vertical part, e.g. the fall to the floor, is
+    kept so the body still ends on the ground)
+  - timing: an overall speed change plus an ease that front- or back-loads
+    the motion (monotonic, so keys never swap order)
+  - asymmetry: Left* bones scaled up and Right* bones down, or the reverse
+
+Variants are generated in a process pool, written as one NLA track each in
+a single GLB, and listed in a JSON manifest (name, duration, root-motion
+displacement) that gameplay code can read without loading the GLB. Like
+tools/root_motion.py, root_motion is the horizontal travel of the Hips in
+meters in the character's glTF/Godot model space ([x, 0, z], +Z forward).
+Clip locations are in Hips pose-bone space (bone axes, armature units), so
+they go through the root frame: the Hips rest orientation times the
+armature's world scale, read from the rig in Blender. Without Blender the
+frame of the Meshy rig (DEFAULT_ROOT_FRAME) is assumed, and the manifest
+says which one was used.
+
+From Blender:
+    blender --background --python tools/create_anim_variants.py -- --count 8
+Without Blender only the variant clips and manifest are written:
+    python tools/create_anim_variants.py --count 8 --clips-dir /tmp/variants
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from anim_tracks import ANIMS_DIR, build_action, clip_frame_count, load_clip, push_nla_track
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "models", "Meshy_AI_biped")
+DEFAULT_MODEL = os.path.join(ASSETS_DIR, "Meshy_AI_Character_output.glb")
+DEFAULT_OUTPUT = os.path.join(ASSETS_DIR, "Meshy_AI_Animation_Variants.glb")
+DEFAULT_CLIPS = [os.path.join(ANIMS_DIR, "death.json"), os.path.join(ANIMS_DIR, "hit.json")]
+
+DEFAULT_COUNT = 8
+DEFAULT_SEED = 7
+DEFAULT_AMPLITUDE = 0.2   # +-20% per-bone gain
+DEFAULT_TIMING = 0.15     # +-15% speed, ease strength
+DEFAULT_ASYMMETRY = 0.2   # +-20% left/right bias
+ROOT_BONE = "Hips"
+# Hips pose-bone space -> Blender model space (Z up, meters) of the Meshy rig as imported:
+# centimeters, bone Y pointing forward (-Y in Blender), bone Z up
+DEFAULT_ROOT_FRAME = ((-0.01, 0.0, 0.0), (0.0, -0.01, 0.0), (0.0, 0.0, 0.01))
+
+
+# ========== VARIANTS ==========
+def scale_quaternion(q, gain):
+    """Scale the rotation angle of a w, x, y, z quaternion by gain, keeping its axis."""
+    w, x, y, z = q
+    sin_half = math.sqrt(x * x + y * y + z * z)
+    if sin_half < 1e-9:
+        return [w, x, y, z]
+    half = math.atan2(sin_half, w) * gain
+    s = math.sin(half) / sin_half
+    return [math.cos(half), x * s, y * s, z * s]
+
+
+def warp_frame(frame, frames, new_frames, ease):
+    """Map frame in [0, frames] onto [0, new_frames] with an ease; |ease| < 1 keeps it monotonic."""
+    u = frame / frames
+    return round((u + ease * math.sin(math.pi * u) / math.pi) * new_frames)
+
+
+def root_up(root_frame):
+    """Unit vector in pose-bone space that root_frame maps onto model-space up (+Z)."""
+    up = np.asarray(root_frame, dtype=np.float64)[2]
+    return up / np.linalg.norm(up)
+
+
+def make_variant(clip, seed, amplitude=DEFAULT_AMPLITUDE, timing=DEFAULT_TIMING, asymmetry=DEFAULT_ASYMMETRY,
+                 name=None, root_frame=DEFAULT_ROOT_FRAME):
+    """Perturbed copy of clip; the same clip, seed and parameters always give the same variant.
+
+    The root bone's location gain only applies across root_frame's up axis.
+    """
+    up = root_up(root_frame)
+    rng = random.Random(f"{clip['name']}:{seed}")
+    speed = 1.0 + rng.uniform(-timing, timing)
+    ease = rng.uniform(-timing, timing)
+    side = rng.uniform(-asymmetry, asymmetry)
+    frames = clip["frames"]
+    new_frames = max(1, round(frames / speed))
+
+    tracks = {}
+    for bone in sorted(clip["tracks"]):
+        gain = 1.0 + rng.uniform(-amplitude, amplitude)
+        if bone.startswith("Left"):
+            gain *= 1.0 + side
+        elif bone.startswith("Right"):
+            gain *= 1.0 - side
+        track = {}
+        for channel, keys in clip["tracks"][bone].items():
+            out = []
+            for frame, value in keys:
+                if len(value) == 4:
+                    value = scale_quaternion(value, gain)
+                elif bone == ROOT_BONE:
+                    height = np.dot(value, up) * up
+                    value = (height + (np.asarray(value) - height) * gain).tolist()
+                else:
+                    value = [v * gain for v in value]
+                out.append([warp_frame(frame, frames, new_frames, ease), [round(v, 4) for v in value]])
+            track[channel] = out
+        tracks[bone] = track
+
+    variant = dict(clip, name=name or f"{clip['name']}_{seed}", frames=new_frames, tracks=tracks)
+    variant["description"] = (f"{clip['name']} variant, seed {seed}: speed {speed:.3f}, ease {ease:+.3f}, "
+                              f"left/right bias {side:+.3f}")
+    return variant
+
+
+def root_motion(clip, root_frame=DEFAULT_ROOT_FRAME, bone=ROOT_BONE):
+    """Horizontal travel of the root bone from the clip's start to its end: [x, 0, z] meters, glTF axes."""
+    keys = clip["tracks"].get(bone, {}).get("location", [])
+    if not keys:
+        return [0.0, 0.0, 0.0]
+    keys = sorted(keys, key=lambda key: key[0])
+    start = keys[0][1] if keys[0][0] == 0 or not clip.get("rest_key") else [0.0, 0.0, 0.0]
+    x, y, _ = np.asarray(root_frame, dtype=np.float64) @ (np.asarray(keys[-1][1]) - np.asarray(start))
+    # Blender model space (x, y, z) -> glTF (x, z, -y), height dropped; + 0.0 turns -0.0 into 0.0
+    return [round(float(v), 4) + 0.0 for v in (x, 0.0, -y)]
+
+
+def manifest_entry(variant, base_name, seed, root_frame=DEFAULT_ROOT_FRAME):
+    return {
+        "name": variant["name"],
+        "base": base_name,
+        "seed": seed,
+        "frames": variant["frames"],
+        "fps": variant["fps"],
+        "duration": round(variant["frames"] / variant["fps"], 4),
+        "loop": bool(variant.get("loop", False)),
+        "root_motion": root_motion(variant, root_frame),
+    }
+
+
+def _variant_job(job):
+    """Process-pool worker: (clip_path, index, seed, amplitude, timing, asymmetry, root_frame) -> (variant, entry)."""
+    clip_path, index, seed, amplitude, timing, asymmetry, root_frame = job
+    clip = load_clip(clip_path)
+    variant = make_variant(clip, seed, amplitude, timing, asymmetry, name=f"{clip['name']}_{index:02d}",
+                           root_frame=root_frame)
+    return variant, manifest_entry(variant, clip["name"], seed, root_frame)
+
+
+def generate_variants(clip_paths=DEFAULT_CLIPS, count=DEFAULT_COUNT, seed=DEFAULT_SEED, amplitude=DEFAULT_AMPLITUDE,
+                      timing=DEFAULT_TIMING, asymmetry=DEFAULT_ASYMMETRY, jobs=None, root_frame=DEFAULT_ROOT_FRAME):
+    """count variants of every clip, computed across jobs processes; returns [(variant, manifest entry)] in order."""
+    if not 0.0 <= timing < 1.0:
+        raise ValueError(f"timing must be in [0, 1), got {timing}")
+    root_frame = tuple(tuple(float(v) for v in row) for row in root_frame)
+    work = [(path, i, seed * 1000 + i, amplitude, timing, asymmetry, root_frame)
+            for path in clip_paths for i in range(count)]
+    if jobs == 1 or len(work) < 2:
+        return [_variant_job(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_variant_job, work))
+
+
+def write_manifest(path, entries, glb_path=None, root_frame_source="default"):
+    """root_frame_source is "rig" when the root frame was read from the character, else "default"."""
+    manifest = {
+        "glb": os.path.basename(glb_path) if glb_path else None,
+        "root_motion": {"bone": ROOT_BONE, "space": "model, glTF axes (+Y up, +Z forward), horizontal only",
+                        "units": "m", "frame": root_frame_source},
+        "clips": entries,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def write_clips(out_dir, variants):
+    """Write each variant as a clip JSON that create_death_anim.py --clip can build."""
+    os.makedirs(out_dir, exist_ok=True)
+    for variant in variants:
+        with open(os.path.join(out_dir, f"{variant['name']}.json"), "w") as f:
+            json.dump(variant, f, indent=2)
+            f.write("\n")
+
+
+# ========== BLENDER ==========
+def clear_scene():
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete()
+    for block in bpy.data.actions:
+        bpy.data.actions.remove(block)
+
+
+def import_character(model_path=DEFAULT_MODEL):
+    """Import the character into a clean scene; returns its armature."""
+    clear_scene()
+    bpy.ops.import_scene.gltf(filepath=model_path)
+    armature = next((obj for obj in bpy.data.objects if obj.type == 'ARMATURE'), None)
+    if armature is None:
+        raise RuntimeError(f"No armature found in {model_path}")
+    # Drop the imported base pose action so only the variants are exported
+    for act in list(bpy.data.actions):
+        bpy.data.actions.remove(act)
+    return armature
+
+
+def rig_root_frame(armature, bone=ROOT_BONE):
+    """The root bone's pose-space -> model-space matrix: its rest orientation times the armature's world transform."""
+    if bone not in armature.data.bones:
+        raise RuntimeError(f"{armature.name} has no '{bone}' bone")
+    matrix = armature.matrix_world.to_3x3() @ armature.data.bones[bone].matrix_local.to_3x3()
+    return tuple(tuple(row) for row in matrix)
+
+
+def export_variants(armature, variants, output_path=DEFAULT_OUTPUT):
+    """Build every variant as its own NLA track on armature and export one GLB."""
+    for variant in variants:
+        push_nla_track(armature, build_action(armature, variant), variant["name"])
+    scene = bpy.context.scene
+    scene.frame_start = 0
+    scene.frame_end = max(clip_frame_count(v) for v in variants)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    bpy.ops.export_scene.gltf(
+        filepath=output_path,
+        export_format='GLB',
+        export_apply=True,
+        export_materials='EXPORT',
+        export_animations=True,
+        export_animation_mode="NLA_TRACKS",
+        export_force_sampling=False,
+        export_skins=True,
+    )
+    print(f"Exported {len(variants)} variants to: {output_path}")
+    return output_path
+
+
+def main():
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = sys.argv[1:] if bpy is None else []
+    parser = argparse.ArgumentParser(description="Generate seeded variants of death/hit clips into one GLB.")
+    parser.add_argument("--clip", action="append", help="base clip JSON, repeatable (default: death and hit)")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="variants per base clip")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--amplitude", type=float, default=DEFAULT_AMPLITUDE, help="max per-bone gain change")
+    parser.add_argument("--timing", type=float, default=DEFAULT_TIMING, help="max speed change and ease strength")
+    parser.add_argument("--asymmetry", type=float, default=DEFAULT_ASYMMETRY, help="max left/right bias")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="rigged character GLB to animate")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="GLB path to write (Blender only)")
+    parser.add_argument("--manifest", help="manifest JSON path (default: next to --output)")
+    parser.add_argument("--clips-dir", help="also write every variant as a clip JSON here")
+    args = parser.parse_args(argv)
+
+    armature = None
+    root_frame = DEFAULT_ROOT_FRAME
+    if bpy is not None:
+        try:
+            armature = import_character(args.model)
+            root_frame = rig_root_frame(armature)
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            raise SystemExit(1)
+
+    start = time.perf_counter()
+    try:
+        results = generate_variants(args.clip or DEFAULT_CLIPS, args.count, args.seed, args.amplitude,
+                                    args.timing, args.asymmetry, args.jobs, root_frame)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        raise SystemExit(1)
+    variants = [variant for variant, _ in results]
+    print(f"Generated {len(variants)} variants in {time.perf_counter() - start:.3f} s")
+
+    if args.clips_dir:
+        write_clips(args.clips_dir, variants)
+        print(f"Wrote clips to: {args.clips_dir}")
+    glb_path = None
+    if armature is not None:
+        glb_path = export_variants(armature, variants, args.output)
+    elif not args.clips_dir:
+        print("Blender not available: writing the manifest only (use --clips-dir to keep the clips)")
+    manifest_path = args.manifest or os.path.splitext(args.output)[0] + ".json"
+    write_manifest(manifest_path, [entry for _, entry in results], glb_path,
+                   "rig" if armature is not None else "default")
+    print(f"Wrote manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,48 @@
-import bpy
-import bmesh
+import argparse
 import math
 import os
-from mathutils import Vector
+import sys
 
-# Clear scene
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    # Plain CPython: the creature is written with glb_writer instead of the glTF exporter
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import auto_rig
+import bulk_mesh
+import glb_writer
+import mesh_optimize
+import primitives
+import tree_mesh
+from auto_rig import Bone, bind_weights, bone_index, create_armature, offset_bones, part_weights
+from build_cache import BuildCache, asset_key
+from bulk_mesh import object_from_arrays
+from glb_writer import GLBWriter, pbr_material
+from mesh_optimize import optimize_objects
+from primitives import PartBuffers, cone, cube, cylinder, uv_sphere
+from tree_mesh import euler_matrix, ground
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "models", "enemy_creature.glb")
+
+
+def clear_scene():
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete()
+    # Remove orphan data
+    for block in bpy.data.meshes:
+        if block.users == 0:
+            bpy.data.meshes.remove(block)
+    for block in bpy.data.materials:
+        if block.users == 0:
+            bpy.data.materials.remove(block)
+    for block in bpy.data.armatures:
+        if block.users == 0:
+            bpy.data.armatures.remove(block)
 
-# Remove orphan data
-for block in bpy.data.meshes:
-    if block.users == 0:
-        bpy.data.meshes.remove(block)
-for block in bpy.data.materials:
-    if block.users == 0:
-        bpy.data.materials.remove(block)
 
 # --- Materials ---
 def make_mat(name, base_color, roughness=0.8, metallic=0.0, emission_color=None, emission_strength=0.0):
@@ -29,234 +57,351 @@ def make_mat(name, base_color, roughness=0.8, metallic=0.0, emission_color=None,
         bsdf.inputs["Emission Strength"].default_value = emission_strength
     return mat
 
-mat_body = make_mat("EnemyBody", (0.15, 0.22, 0.12, 1.0), roughness=0.9)
-mat_belly = make_mat("EnemyBelly", (0.25, 0.18, 0.12, 1.0), roughness=0.85)
-mat_eyes = make_mat("EnemyEyes", (0.9, 0.1, 0.05, 1.0), roughness=0.3, emission_color=(1.0, 0.15, 0.05, 1.0), emission_strength=3.0)
-mat_horns = make_mat("EnemyHorns", (0.35, 0.28, 0.18, 1.0), roughness=0.6, metallic=0.1)
-mat_claws = make_mat("EnemyClaws", (0.2, 0.15, 0.1, 1.0), roughness=0.5, metallic=0.2)
-mat_teeth = make_mat("EnemyTeeth", (0.85, 0.82, 0.7, 1.0), roughness=0.4)
-
-# --- Body (torso) ---
-bpy.ops.mesh.primitive_uv_sphere_add(segments=24, ring_count=16, radius=0.55, location=(0, 0, 1.0))
-body = bpy.context.active_object
-body.name = "Body"
-body.scale = (1.0, 0.85, 1.1)
-bpy.ops.object.shade_smooth()
-body.data.materials.append(mat_body)
-
-# Sculpt-like deformation on body for muscular look
-bm = bmesh.new()
-bm.from_mesh(body.data)
-for v in bm.verts:
-    if v.co.z > 0.3:
-        v.co.x *= 1.15
-        v.co.y *= 1.1
-    if v.co.z < -0.2:
-        v.co.x *= 0.85
-bm.to_mesh(body.data)
-bm.free()
-
-# --- Belly ---
-bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=12, radius=0.38, location=(0, -0.12, 0.85))
-belly = bpy.context.active_object
-belly.name = "Belly"
-belly.scale = (0.9, 0.75, 0.85)
-bpy.ops.object.shade_smooth()
-belly.data.materials.append(mat_belly)
-
-# --- Head ---
-bpy.ops.mesh.primitive_uv_sphere_add(segments=20, ring_count=14, radius=0.32, location=(0, 0, 1.7))
-head = bpy.context.active_object
-head.name = "Head"
-head.scale = (1.1, 1.0, 0.95)
-bpy.ops.object.shade_smooth()
-head.data.materials.append(mat_body)
-
-# Deform head for menacing look
-bm = bmesh.new()
-bm.from_mesh(head.data)
-for v in bm.verts:
-    # Wider jaw area
-    if v.co.z < 0.0:
-        v.co.x *= 1.2
-        v.co.z *= 1.1
-    # Pronounced brow
-    if v.co.z > 0.15 and v.co.y < -0.1:
-        v.co.y -= 0.06
-        v.co.z += 0.04
-bm.to_mesh(head.data)
-bm.free()
-
-# --- Eyes (glowing red) ---
-for side in [-1, 1]:
-    bpy.ops.mesh.primitive_uv_sphere_add(segments=12, ring_count=8, radius=0.06, location=(side * 0.13, -0.26, 1.75))
-    eye = bpy.context.active_object
-    eye.name = f"Eye_{'L' if side == -1 else 'R'}"
-    eye.scale = (1.3, 0.7, 0.9)
-    bpy.ops.object.shade_smooth()
-    eye.data.materials.append(mat_eyes)
-
-# --- Horns ---
-for side in [-1, 1]:
-    bpy.ops.mesh.primitive_cone_add(vertices=12, radius1=0.07, radius2=0.01, depth=0.4, location=(side * 0.2, -0.05, 2.0))
-    horn = bpy.context.active_object
-    horn.name = f"Horn_{'L' if side == -1 else 'R'}"
-    horn.rotation_euler = (math.radians(-30), math.radians(side * 25), 0)
-    bpy.ops.object.shade_smooth()
-    horn.data.materials.append(mat_horns)
-
-# --- Mouth / Jaw ---
-bpy.ops.mesh.primitive_cube_add(size=0.2, location=(0, -0.28, 1.6))
-jaw = bpy.context.active_object
-jaw.name = "Jaw"
-jaw.scale = (1.4, 0.5, 0.4)
-bpy.ops.object.shade_smooth()
-jaw.data.materials.append(mat_body)
-
-# Teeth
-for i in range(5):
-    x_pos = -0.1 + i * 0.05
-    bpy.ops.mesh.primitive_cone_add(vertices=6, radius1=0.015, radius2=0.003, depth=0.05, location=(x_pos, -0.32, 1.56))
-    tooth = bpy.context.active_object
-    tooth.name = f"Tooth_{i}"
-    tooth.rotation_euler = (math.radians(180), 0, 0)
-    bpy.ops.object.shade_smooth()
-    tooth.data.materials.append(mat_teeth)
-
-# --- Arms ---
-for side in [-1, 1]:
-    # Upper arm
-    bpy.ops.mesh.primitive_cylinder_add(vertices=12, radius=0.12, depth=0.5, location=(side * 0.65, 0, 1.2))
-    upper_arm = bpy.context.active_object
-    upper_arm.name = f"UpperArm_{'L' if side == -1 else 'R'}"
-    upper_arm.rotation_euler = (0, 0, math.radians(side * 25))
-    upper_arm.scale = (1.0, 0.9, 1.0)
-    bpy.ops.object.shade_smooth()
-    upper_arm.data.materials.append(mat_body)
-    
-    # Forearm
-    bpy.ops.mesh.primitive_cylinder_add(vertices=12, radius=0.1, depth=0.45, location=(side * 0.85, 0, 0.78))
-    forearm = bpy.context.active_object
-    forearm.name = f"Forearm_{'L' if side == -1 else 'R'}"
-    forearm.rotation_euler = (0, 0, math.radians(side * 10))
-    bpy.ops.object.shade_smooth()
-    forearm.data.materials.append(mat_body)
-    
-    # Shoulder pad (bony protrusion)
-    bpy.ops.mesh.primitive_uv_sphere_add(segments=10, ring_count=8, radius=0.14, location=(side * 0.55, 0, 1.4))
-    shoulder = bpy.context.active_object
-    shoulder.name = f"Shoulder_{'L' if side == -1 else 'R'}"
-    shoulder.scale = (1.2, 0.9, 0.8)
-    bpy.ops.object.shade_smooth()
-    shoulder.data.materials.append(mat_body)
-    
-    # Claws (3 per hand)
-    for claw_i in range(3):
-        angle = math.radians(-20 + claw_i * 20)
-        cx = side * 0.9 + math.sin(angle) * 0.06 * side
-        cz = 0.5 + claw_i * 0.02
-        bpy.ops.mesh.primitive_cone_add(vertices=8, radius1=0.025, radius2=0.005, depth=0.12, location=(cx, -0.04, cz))
-        claw = bpy.context.active_object
-        claw.name = f"Claw_{'L' if side == -1 else 'R'}_{claw_i}"
-        claw.rotation_euler = (math.radians(70), 0, math.radians(side * 10))
-        bpy.ops.object.shade_smooth()
-        claw.data.materials.append(mat_claws)
-
-# --- Legs ---
-for side in [-1, 1]:
-    # Thigh
-    bpy.ops.mesh.primitive_cylinder_add(vertices=12, radius=0.14, depth=0.45, location=(side * 0.25, 0, 0.45))
-    thigh = bpy.context.active_object
-    thigh.name = f"Thigh_{'L' if side == -1 else 'R'}"
-    thigh.scale = (1.1, 0.95, 1.0)
-    bpy.ops.object.shade_smooth()
-    thigh.data.materials.append(mat_body)
-    
-    # Shin
-    bpy.ops.mesh.primitive_cylinder_add(vertices=12, radius=0.1, depth=0.4, location=(side * 0.25, 0.02, 0.1))
-    shin = bpy.context.active_object
-    shin.name = f"Shin_{'L' if side == -1 else 'R'}"
-    bpy.ops.object.shade_smooth()
-    shin.data.materials.append(mat_body)
-    
-    # Foot
-    bpy.ops.mesh.primitive_cube_add(size=0.15, location=(side * 0.25, -0.08, -0.08))
-    foot = bpy.context.active_object
-    foot.name = f"Foot_{'L' if side == -1 else 'R'}"
-    foot.scale = (1.0, 1.8, 0.5)
-    bpy.ops.object.shade_smooth()
-    foot.data.materials.append(mat_body)
-    
-    # Toe claws
-    for tc in range(2):
-        bpy.ops.mesh.primitive_cone_add(vertices=6, radius1=0.02, radius2=0.005, depth=0.08, location=(side * 0.25 + (tc - 0.5) * 0.06, -0.2, -0.1))
-        toe_claw = bpy.context.active_object
-        toe_claw.name = f"ToeClaw_{'L' if side == -1 else 'R'}_{tc}"
-        toe_claw.rotation_euler = (math.radians(80), 0, 0)
-        bpy.ops.object.shade_smooth()
-        toe_claw.data.materials.append(mat_claws)
-
-# --- Tail ---
-segments = 8
-for i in range(segments):
-    t = i / (segments - 1)
-    radius = 0.08 * (1.0 - t * 0.7)
-    z = 0.7 - i * 0.05
-    y = 0.15 + i * 0.12
-    bpy.ops.mesh.primitive_uv_sphere_add(segments=8, ring_count=6, radius=radius, location=(0, y, z))
-    seg = bpy.context.active_object
-    seg.name = f"Tail_{i}"
-    seg.scale = (0.8, 1.2, 0.8)
-    bpy.ops.object.shade_smooth()
-    seg.data.materials.append(mat_body)
-
-# Tail spike
-bpy.ops.mesh.primitive_cone_add(vertices=8, radius1=0.04, radius2=0.005, depth=0.15, location=(0, 0.15 + segments * 0.12, 0.7 - segments * 0.05))
-tail_spike = bpy.context.active_object
-tail_spike.name = "TailSpike"
-tail_spike.rotation_euler = (math.radians(75), 0, 0)
-bpy.ops.object.shade_smooth()
-tail_spike.data.materials.append(mat_claws)
-
-# --- Spinal ridges ---
-for i in range(6):
-    z = 1.5 - i * 0.12
-    bpy.ops.mesh.primitive_cone_add(vertices=6, radius1=0.04, radius2=0.008, depth=0.12, location=(0, 0.18, z))
-    spine = bpy.context.active_object
-    spine.name = f"Spine_{i}"
-    spine.rotation_euler = (math.radians(-60), 0, 0)
-    bpy.ops.object.shade_smooth()
-    spine.data.materials.append(mat_horns)
-
-# --- Join all into one object ---
-bpy.ops.object.select_all(action='SELECT')
-bpy.context.view_layer.objects.active = body
-bpy.ops.object.join()
-
-# Rename final object
-enemy = bpy.context.active_object
-enemy.name = "EnemyCreature"
-
-# Set origin to base of model
-bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-# Move so feet are at Z=0
-bbox = [enemy.matrix_world @ Vector(corner) for corner in enemy.bound_box]
-min_z = min(v.z for v in bbox)
-enemy.location.z -= min_z
-
-# Apply transforms
-bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-
-# --- Export ---
-output_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "models", "enemy_creature.glb")
-os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-bpy.ops.export_scene.gltf(
-    filepath=output_path,
-    export_format='GLB',
-    use_selection=True,
-    export_apply=True,
-    export_materials='EXPORT',
-)
-
-print(f"Exported enemy creature to: {output_path}")
+
+# Material slots: (name, base color, make_mat arguments)
+MATERIALS = [
+    ("EnemyBody", (0.15, 0.22, 0.12, 1.0), dict(roughness=0.9)),
+    ("EnemyBelly", (0.25, 0.18, 0.12, 1.0), dict(roughness=0.85)),
+    ("EnemyEyes", (0.9, 0.1, 0.05, 1.0), dict(roughness=0.3, emission_color=(1.0, 0.15, 0.05, 1.0), emission_strength=3.0)),
+    ("EnemyHorns", (0.35, 0.28, 0.18, 1.0), dict(roughness=0.6, metallic=0.1)),
+    ("EnemyClaws", (0.2, 0.15, 0.1, 1.0), dict(roughness=0.5, metallic=0.2)),
+    ("EnemyTeeth", (0.85, 0.82, 0.7, 1.0), dict(roughness=0.4)),
+]
+BODY, BELLY, EYES, HORNS, CLAWS, TEETH = range(len(MATERIALS))
+
+
+def make_materials():
+    return [make_mat(name, color, **params) for name, color, params in MATERIALS]
+
+
+# --- Geometry ---
+# The creature's proportions; create_enemy_variants.py samples these
+DEFAULT_PROPORTIONS = {
+    "body_scale": 1.0,   # torso size; head, arms, spine and tail move with its surface
+    "horn_length": 1.0,
+    "arm_length": 1.0,
+    "claw_count": 3,     # per hand
+    "tail_segments": 8,
+}
+COLLAPSED = (0.0, 0.0, 0.0)
+
+
+def _along(rotation, length):
+    """Object-space +Z of a part rotated by an XYZ euler, times length."""
+    return euler_matrix(*rotation) @ np.array([0.0, 0.0, length])
+
+
+def build_enemy_parts(resolution=1.0, tail_segments=8, body_scale=1.0, horn_length=1.0, arm_length=1.0,
+                      claw_count=3, max_claw_count=None, max_tail_segments=None):
+    """Lay out every part of the creature as primitives in one PartBuffers (no bpy).
+
+    resolution scales every primitive's segment/ring/vertex count. With
+    max_claw_count / max_tail_segments the claws and tail segments beyond
+    claw_count / tail_segments are still emitted, collapsed to a point, so
+    creatures of different proportions share one vertex layout. Joint
+    positions for enemy_skeleton are kept in parts.landmarks.
+    """
+    def res(count):
+        return max(3, round(count * resolution))
+
+    max_claw_count = max(max_claw_count or claw_count, claw_count)
+    max_tail_segments = max(max_tail_segments or tail_segments, tail_segments)
+    grow = body_scale - 1.0
+    parts = PartBuffers()
+    marks = parts.landmarks
+    sides = [(-1, "L"), (1, "R")]
+
+    # --- Body (torso) ---
+    positions, faces, face_sizes = uv_sphere(res(24), res(16), radius=0.55)
+    # Sculpt-like deformation on body for muscular look
+    upper = positions[:, 2] > 0.3
+    positions[upper, :2] *= (1.15, 1.1)
+    positions[positions[:, 2] < -0.2, 0] *= 0.85
+    parts.add((positions, faces, face_sizes), BODY, location=(0, 0, 1.0),
+              scale=(body_scale, 0.85 * body_scale, 1.1 * body_scale), name="Body")
+    marks["pelvis"] = np.array([0.0, 0.0, 0.675])
+    marks["chest"] = np.array([0.0, 0.0, 1.0])
+    marks["neck"] = np.array([0.0, 0.0, 1.0 + 0.5 * body_scale])
+
+    # --- Belly ---
+    parts.add(uv_sphere(res(16), res(12), radius=0.38), BELLY, location=(0, -0.12 * body_scale, 0.85),
+              scale=(0.9 * body_scale, 0.75 * body_scale, 0.85 * body_scale), name="Belly")
+
+    # --- Head ---
+    # Head, face and horns ride on top of the torso
+    head_z = 0.6 * grow
+    positions, faces, face_sizes = uv_sphere(res(20), res(14), radius=0.32)
+    # Deform head for menacing look: wider jaw area, pronounced brow
+    jaw = positions[:, 2] < 0.0
+    positions[jaw, 0] *= 1.2
+    positions[jaw, 2] *= 1.1
+    brow = (positions[:, 2] > 0.15) & (positions[:, 1] < -0.1)
+    positions[brow, 1] -= 0.06
+    positions[brow, 2] += 0.04
+    parts.add((positions, faces, face_sizes), BODY, location=(0, 0, 1.7 + head_z), scale=(1.1, 1.0, 0.95), name="Head")
+    marks["crown"] = np.array([0.0, 0.0, 2.0 + head_z])
+
+    # --- Eyes (glowing red) ---
+    for side, tag in sides:
+        parts.add(uv_sphere(res(12), res(8), radius=0.06), EYES, location=(side * 0.13, -0.26, 1.75 + head_z),
+                  scale=(1.3, 0.7, 0.9), name=f"Eye_{tag}")
+
+    # --- Horns ---
+    for side, tag in sides:
+        rotation = (math.radians(-30), math.radians(side * 25), 0)
+        # Keep the horn's base where it meets the skull as it grows
+        base = np.array([side * 0.2, -0.05, 2.0 + head_z]) - _along(rotation, 0.2)
+        parts.add(cone(res(12), radius1=0.07, radius2=0.01, depth=0.4 * horn_length), HORNS,
+                  location=base + _along(rotation, 0.2 * horn_length), rotation=rotation, name=f"Horn_{tag}")
+
+    # --- Mouth / Jaw ---
+    parts.add(cube(0.2), BODY, location=(0, -0.28, 1.6 + head_z), scale=(1.4, 0.5, 0.4), name="Jaw")
+
+    # Teeth
+    for i in range(5):
+        parts.add(cone(res(6), radius1=0.015, radius2=0.003, depth=0.05), TEETH,
+                  location=(-0.1 + i * 0.05, -0.32, 1.56 + head_z), rotation=(math.radians(180), 0, 0), name=f"Tooth_{i}")
+
+    # --- Arms ---
+    for side, tag in sides:
+        # Shoulders sit on the torso's flank; each arm segment keeps its top joint as it lengthens
+        shoulder = np.array([side * 0.55 * grow, 0.0, 0.4 * grow])
+        upper_rotation = (0, 0, math.radians(side * 25))
+        upper_top = np.array([side * 0.65, 0, 1.2]) + _along(upper_rotation, 0.25) + shoulder
+        upper_shift = _along(upper_rotation, -0.5 * (arm_length - 1.0))
+        parts.add(cylinder(res(12), radius=0.12, depth=0.5 * arm_length), BODY,
+                  location=upper_top - _along(upper_rotation, 0.25 * arm_length),
+                  rotation=upper_rotation, scale=(1.0, 0.9, 1.0), name=f"UpperArm_{tag}")
+        fore_rotation = (0, 0, math.radians(side * 10))
+        fore_top = np.array([side * 0.85, 0, 0.78]) + _along(fore_rotation, 0.225) + shoulder + upper_shift
+        hand_shift = shoulder + upper_shift + _along(fore_rotation, -0.45 * (arm_length - 1.0))
+        parts.add(cylinder(res(12), radius=0.1, depth=0.45 * arm_length), BODY,
+                  location=fore_top - _along(fore_rotation, 0.225 * arm_length),
+                  rotation=fore_rotation, name=f"Forearm_{tag}")
+        marks[f"shoulder_{tag}"] = upper_top
+        marks[f"elbow_{tag}"] = fore_top
+        marks[f"wrist_{tag}"] = fore_top - _along(fore_rotation, 0.45 * arm_length)
+        marks[f"fingers_{tag}"] = np.array([side * 0.9, -0.04, 0.44]) + hand_shift
+        # Shoulder pad (bony protrusion)
+        parts.add(uv_sphere(res(10), res(8), radius=0.14), BODY, location=np.array([side * 0.55, 0, 1.4]) + shoulder,
+                  scale=(1.2, 0.9, 0.8), name=f"Shoulder_{tag}")
+
+        # Claws fanned over 40 degrees
+        for claw_i in range(max_claw_count):
+            spread = claw_i / (claw_count - 1) if claw_count > 1 else 0.5
+            angle = math.radians(-20 + min(spread, 1.0) * 40)
+            cx = side * 0.9 + math.sin(angle) * 0.06 * side
+            cz = 0.5 + min(claw_i, claw_count - 1) * 0.02
+            parts.add(cone(res(8), radius1=0.025, radius2=0.005, depth=0.12), CLAWS,
+                      location=np.array([cx, -0.04, cz]) + hand_shift,
+                      rotation=(math.radians(70), 0, math.radians(side * 10)),
+                      scale=(1.0, 1.0, 1.0) if claw_i < claw_count else COLLAPSED, name=f"Claw_{tag}_{claw_i}")
+
+    # --- Legs ---
+    for side, tag in sides:
+        parts.add(cylinder(res(12), radius=0.14, depth=0.45), BODY, location=(side * 0.25, 0, 0.45),
+                  scale=(1.1, 0.95, 1.0), name=f"Thigh_{tag}")
+        parts.add(cylinder(res(12), radius=0.1, depth=0.4), BODY, location=(side * 0.25, 0.02, 0.1), name=f"Shin_{tag}")
+        parts.add(cube(0.15), BODY, location=(side * 0.25, -0.08, -0.08), scale=(1.0, 1.8, 0.5), name=f"Foot_{tag}")
+
+        # Toe claws
+        for tc in range(2):
+            parts.add(cone(res(6), radius1=0.02, radius2=0.005, depth=0.08), CLAWS,
+                      location=(side * 0.25 + (tc - 0.5) * 0.06, -0.2, -0.1),
+                      rotation=(math.radians(80), 0, 0), name=f"ToeClaw_{tag}_{tc}")
+        marks[f"hip_{tag}"] = np.array([side * 0.25, 0.0, 0.675])
+        marks[f"knee_{tag}"] = np.array([side * 0.25, 0.01, 0.25])
+        marks[f"ankle_{tag}"] = np.array([side * 0.25, 0.02, -0.08])
+        marks[f"toes_{tag}"] = np.array([side * 0.25, -0.22, -0.1])
+
+    # --- Tail ---
+    tail_root = 0.15 * body_scale
+    marks["tail_0"] = np.array([0.0, tail_root - 0.06, 0.725])
+    for i in range(max_tail_segments):
+        k = min(i, tail_segments - 1)
+        t = k / (tail_segments - 1)
+        radius = 0.08 * (1.0 - t * 0.7)
+        parts.add(uv_sphere(res(8), res(6), radius=radius), BODY, location=(0, tail_root + k * 0.12, 0.7 - k * 0.05),
+                  scale=(0.8, 1.2, 0.8) if i < tail_segments else COLLAPSED, name=f"Tail_{i}")
+        # Tail joints sit halfway between neighbouring spheres
+        marks[f"tail_{k + 1}"] = np.array([0.0, tail_root + (k + 0.5) * 0.12, 0.7 - (k + 0.5) * 0.05])
+
+    # Tail spike
+    spike = np.array([0.0, tail_root + tail_segments * 0.12, 0.7 - tail_segments * 0.05])
+    parts.add(cone(res(8), radius1=0.04, radius2=0.005, depth=0.15), CLAWS, location=spike,
+              rotation=(math.radians(75), 0, 0), name="TailSpike")
+    marks[f"tail_{tail_segments}"] = spike
+
+    # --- Spinal ridges ---
+    for i in range(6):
+        z = 1.5 - i * 0.12
+        parts.add(cone(res(6), radius1=0.04, radius2=0.008, depth=0.12), HORNS,
+                  location=(0, 0.18 * body_scale, 1.0 + (z - 1.0) * body_scale),
+                  rotation=(math.radians(-60), 0, 0), name=f"Spine_{i}")
+    return parts
+
+
+# --- Rig ---
+def enemy_skeleton(landmarks, tail_segments=8):
+    """Bones of the creature (parents first) from build_enemy_parts' landmarks.
+
+    Hips -> Spine -> Head up the middle, Shoulder -> UpperArm -> Forearm ->
+    Hand per arm, Thigh -> Shin -> Foot per leg and one bone per tail sphere.
+    """
+    bones = []
+
+    def add(name, head, tail, parent=None):
+        bones.append(Bone(name, landmarks[head], landmarks[tail],
+                          None if parent is None else bone_index(bones)[parent]))
+
+    add("Hips", "pelvis", "chest")
+    add("Spine", "chest", "neck", "Hips")
+    bones.append(Bone("Head", landmarks["neck"], landmarks["crown"], bone_index(bones)["Spine"]))
+    for tag in ("L", "R"):
+        # The shoulder bone reaches out from the spine axis at shoulder height
+        shoulder = landmarks[f"shoulder_{tag}"]
+        bones.append(Bone(f"Shoulder_{tag}", shoulder * (0.25, 0.0, 1.0), shoulder, bone_index(bones)["Spine"]))
+        add(f"UpperArm_{tag}", f"shoulder_{tag}", f"elbow_{tag}", f"Shoulder_{tag}")
+        add(f"Forearm_{tag}", f"elbow_{tag}", f"wrist_{tag}", f"UpperArm_{tag}")
+        add(f"Hand_{tag}", f"wrist_{tag}", f"fingers_{tag}", f"Forearm_{tag}")
+    for tag in ("L", "R"):
+        add(f"Thigh_{tag}", f"hip_{tag}", f"knee_{tag}", "Hips")
+        add(f"Shin_{tag}", f"knee_{tag}", f"ankle_{tag}", f"Thigh_{tag}")
+        add(f"Foot_{tag}", f"ankle_{tag}", f"toes_{tag}", f"Shin_{tag}")
+    for i in range(tail_segments):
+        add(f"Tail_{i}", f"tail_{i}", f"tail_{i + 1}", "Hips" if i == 0 else f"Tail_{i - 1}")
+    return bones
+
+
+def part_bone(name, tail_segments=8):
+    """(bone name, rigid) driving a part; rigid parts (eyes, claws, teeth...) follow that bone alone."""
+    kind, _, rest = name.partition("_")
+    side = rest.split("_")[0]
+    if kind in ("Eye", "Horn", "Jaw", "Tooth"):
+        return "Head", True
+    if kind == "Claw":
+        return f"Hand_{side}", True
+    if kind == "ToeClaw":
+        return f"Foot_{side}", True
+    if kind == "Shoulder":
+        return name, True
+    if kind == "Tail":
+        return f"Tail_{min(int(rest), tail_segments - 1)}", False
+    if kind == "TailSpike":
+        return f"Tail_{tail_segments - 1}", True
+    # Spine_i are the ridges along the back
+    return {"Body": "Spine", "Belly": "Hips", "Spine": "Spine"}.get(kind, name), False
+
+
+def enemy_arrays(resolution=1.0, tail_segments=8, **proportions):
+    """Return (positions, faces, face_sizes, material indices) of the whole creature, feet at Z=0.
+
+    proportions are build_enemy_parts' keyword arguments.
+    """
+    positions, faces, face_sizes, material_indices = build_enemy_parts(resolution, tail_segments,
+                                                                       **proportions).arrays()
+    return ground(positions), faces, face_sizes, material_indices
+
+
+def rigged_enemy_arrays(resolution=1.0, tail_segments=8, **proportions):
+    """enemy_arrays plus the skeleton and skin: (arrays, bones, joints (N, 4), weights (N, 4)).
+
+    The bones get the same grounding shift as the mesh.
+    """
+    parts = build_enemy_parts(resolution, tail_segments, **proportions)
+    positions, faces, face_sizes, material_indices = parts.arrays()
+    offset = np.array([0.0, 0.0, -positions[:, 2].min()])
+    bones = offset_bones(enemy_skeleton(parts.landmarks, tail_segments), offset)
+    index = bone_index(bones)
+    part_bones = [(index[bone], rigid) for bone, rigid in (part_bone(name, tail_segments) for name in parts.part_names)]
+    joints, weights = part_weights(positions + offset, parts.vertex_parts(), part_bones, bones)
+    return (positions + offset, faces, face_sizes, material_indices), bones, joints, weights
+
+
+def build_enemy(resolution=1.0, tail_segments=8, rig=True):
+    """Create the creature in the current scene as one mesh in a single bulk write; returns the object.
+
+    With rig, the mesh is bound to an "EnemyArmature" object through vertex
+    groups and an Armature modifier, and both are selected for export.
+    """
+    arrays, bones, joints, weights = rigged_enemy_arrays(resolution, tail_segments)
+    positions, faces, face_sizes, material_indices = arrays
+    enemy = object_from_arrays("EnemyCreature", positions, faces, materials=make_materials(),
+                               face_sizes=face_sizes, material_indices=material_indices)
+    if rig:
+        armature = create_armature("EnemyArmature", bones)
+        bind_weights(enemy, armature, bones, joints, weights)
+        armature.select_set(True)
+    enemy.select_set(True)
+    return enemy
+
+
+def write_enemy_glb(filepath, resolution=1.0, tail_segments=8, rig=True):
+    """Write the creature with glb_writer, without Blender; skinned to an EnemyArmature skin with rig."""
+    arrays, bones, joints, weights = rigged_enemy_arrays(resolution, tail_segments)
+    positions, faces, face_sizes, material_indices = arrays
+    materials = [pbr_material(name, color, **params) for name, color, params in MATERIALS]
+    glb = GLBWriter()
+    if rig:
+        skin, armature = glb.add_skin("EnemyArmature", bones)
+        glb.add_mesh_node("EnemyCreature", positions, faces, face_sizes=face_sizes, material_indices=material_indices,
+                          materials=materials, joints=joints, weights=weights, parent=armature, skin=skin)
+    else:
+        glb.add_mesh_node("EnemyCreature", positions, faces, face_sizes=face_sizes,
+                          material_indices=material_indices, materials=materials)
+    glb.write(filepath)
+
+
+def export_enemy(output_path=DEFAULT_OUTPUT, resolution=1.0, tail_segments=8, cache=None, rig=True):
+    """Build and export the creature, or restore it from the build cache when nothing changed."""
+    cache = cache or BuildCache()
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    # The script and the mesh code it builds on are the generator: skip the
+    # rebuild when none of them (nor the exporter) changed since the cached export
+    cache_key = asset_key([os.path.abspath(__file__), primitives, tree_mesh, bulk_mesh, glb_writer, auto_rig,
+                           mesh_optimize],
+                          params={"resolution": resolution, "tail_segments": tail_segments, "rig": rig})
+    if cache.restore(cache_key, [output_path]) is not None:
+        return output_path
+
+    with cache.stage(cache_key, [output_path]) as (staged_path,):
+        if bpy is None:
+            write_enemy_glb(staged_path, resolution, tail_segments, rig)
+        else:
+            clear_scene()
+            build_enemy(resolution, tail_segments, rig)
+            optimize_objects(bpy.context.selected_objects)
+            bpy.ops.export_scene.gltf(
+                filepath=staged_path,
+                export_format='GLB',
+                use_selection=True,
+                export_apply=True,  # the exporter never applies Armature modifiers
+                export_materials='EXPORT',
+                export_skins=True,
+            )
+    print(f"Exported enemy creature to: {output_path}")
+    return output_path
+
+
+def main():
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = sys.argv[1:] if bpy is None else []
+    parser = argparse.ArgumentParser(description="Generate the enemy creature GLB "
+                                                 "(in Blender, or with glb_writer under plain Python).")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="GLB path to write")
+    parser.add_argument("--resolution", type=float, default=1.0,
+                        help="multiplier on primitive segment counts (default 1.0)")
+    parser.add_argument("--tail-segments", type=int, default=8)
+    parser.add_argument("--no-rig", action="store_true", help="export a static mesh without armature and skin")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild even if the cached export is current")
+    args = parser.parse_args(argv)
+    if args.tail_segments < 2:
+        parser.error("--tail-segments must be at least 2")
+    export_enemy(args.output, args.resolution, args.tail_segments, BuildCache(enabled=not args.no_cache),
+                 rig=not args.no_rig)
+
+
+if __name__ == "__main__":
+    main()
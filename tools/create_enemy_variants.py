@@ -0,0 +1,218 @@
+"""
+Enemy variant factory: many creature proportions and palettes in one mesh.
+
+Each variant is a sample of create_enemy's proportion vector (body scale,
+horn length, arm length, claw count, tail segments) plus a color palette.
+All variants are built with the same claw and tail maxima, so they share
+one vertex count and ordering (missing claws and tail segments collapse to
+a point); the base creature is the mesh and every variant is a morph
+target on it. A Godot MeshInstance3D picks a variant by setting that blend
+shape to 1, so any number of different-looking enemies draw from one mesh.
+
+Palettes are not geometry: each variant's material colors are stored with
+its proportions in the node's extras ("enemy_variants", keyed by target
+name) for the runtime to apply as material overrides.
+
+The base creature is rigged and skinned like create_enemy's (one skin for
+every variant). Its bones stay on the base creature's joints: morph
+targets deform the mesh in bind pose, so a variant whose body_scale or
+arm_length moves a shoulder, elbow or tail joint still bends about the
+base joint's position.
+
+From Blender (shape keys, glTF exporter):
+    blender --background --python tools/create_enemy_variants.py -- --count 8
+Or plain Python (glb_writer):
+    python tools/create_enemy_variants.py --count 8 --seed 3
+"""
+
+import argparse
+import os
+import random
+import sys
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import auto_rig
+import bulk_mesh
+import create_enemy
+import glb_writer
+import mesh_optimize
+import primitives
+import tree_mesh
+from build_cache import BuildCache, asset_key
+from bulk_mesh import add_shape_keys, object_from_arrays
+from auto_rig import bind_weights, create_armature
+from create_enemy import DEFAULT_PROPORTIONS, MATERIALS, clear_scene, enemy_arrays, make_mat, rigged_enemy_arrays
+from glb_writer import GLBWriter, pbr_material
+from mesh_optimize import optimize_objects
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "models", "enemy_variants.glb")
+DEFAULT_COUNT = 8
+DEFAULT_SEED = 1
+
+# Sampling ranges of the proportion vector: (low, high), ints are inclusive
+PROPORTION_RANGES = {
+    "body_scale": (0.85, 1.2),
+    "horn_length": (0.6, 1.6),
+    "arm_length": (0.85, 1.2),
+    "claw_count": (2, 4),
+    "tail_segments": (5, 10),
+}
+
+# Base colors per material slot (eyes stay emissive red in every palette)
+PALETTES = {
+    "swamp": {name: color for name, color, _ in MATERIALS},
+    "ash": {"EnemyBody": (0.2, 0.19, 0.18, 1.0), "EnemyBelly": (0.32, 0.3, 0.27, 1.0),
+            "EnemyHorns": (0.12, 0.1, 0.09, 1.0), "EnemyClaws": (0.08, 0.07, 0.07, 1.0)},
+    "rust": {"EnemyBody": (0.32, 0.12, 0.06, 1.0), "EnemyBelly": (0.4, 0.26, 0.14, 1.0),
+             "EnemyHorns": (0.45, 0.4, 0.3, 1.0)},
+    "bog": {"EnemyBody": (0.08, 0.14, 0.16, 1.0), "EnemyBelly": (0.18, 0.22, 0.18, 1.0),
+            "EnemyHorns": (0.28, 0.3, 0.22, 1.0), "EnemyClaws": (0.15, 0.18, 0.15, 1.0)},
+}
+
+
+def sample_variant(rng):
+    """One random proportion vector and palette name."""
+    proportions = {}
+    for key, (low, high) in PROPORTION_RANGES.items():
+        proportions[key] = rng.randint(low, high) if isinstance(low, int) else round(rng.uniform(low, high), 3)
+    return proportions, rng.choice(sorted(PALETTES))
+
+
+def palette_colors(palette):
+    """Full material-name -> base color map of a palette (unlisted slots keep the default color)."""
+    colors = {name: color for name, color, _ in MATERIALS}
+    colors.update(PALETTES[palette])
+    return colors
+
+
+def make_variants(count=DEFAULT_COUNT, seed=DEFAULT_SEED):
+    """[(name, proportions, palette)] for count variants; variant k draws from random.Random(seed + k)."""
+    return [(f"Variant_{k:02d}", *sample_variant(random.Random(seed + k))) for k in range(count)]
+
+
+def variant_arrays(variants, resolution=1.0):
+    """Rigged base creature plus {name: positions} for each variant, all on one vertex layout.
+
+    Returns ((positions, faces, face_sizes, material indices), shapes, bones,
+    joints, weights) with the rig of the base creature.
+    """
+    max_counts = {
+        "max_claw_count": max([DEFAULT_PROPORTIONS["claw_count"]] + [p["claw_count"] for _, p, _ in variants]),
+        "max_tail_segments": max([DEFAULT_PROPORTIONS["tail_segments"]] + [p["tail_segments"] for _, p, _ in variants]),
+    }
+    base, bones, joints, weights = rigged_enemy_arrays(resolution, **DEFAULT_PROPORTIONS, **max_counts)
+    shapes = {}
+    for name, proportions, _ in variants:
+        positions, faces, face_sizes, _ = enemy_arrays(resolution, **proportions, **max_counts)
+        if len(positions) != len(base[0]) or (faces != base[1]).any() or (face_sizes != base[2]).any():
+            raise RuntimeError(f"{name} does not share the base creature's topology")
+        shapes[name] = positions
+    return base, shapes, bones, joints, weights
+
+
+def variant_extras(variants):
+    return {name: {"proportions": proportions, "palette": palette,
+                   "colors": {mat: list(color) for mat, color in palette_colors(palette).items()}}
+            for name, proportions, palette in variants}
+
+
+def build_variants_object(variants, resolution=1.0, rig=True):
+    """Create the base creature with one shape key per variant in the current scene; returns the object.
+
+    With rig, it is bound to an "EnemyArmature" object as in create_enemy.build_enemy.
+    """
+    (positions, faces, face_sizes, material_indices), shapes, bones, joints, weights = variant_arrays(
+        variants, resolution)
+    materials = [make_mat(name, color, **params) for name, color, params in MATERIALS]
+    enemy = object_from_arrays("EnemyVariants", positions, faces, materials=materials,
+                               face_sizes=face_sizes, material_indices=material_indices)
+    add_shape_keys(enemy, shapes)
+    enemy["enemy_variants"] = variant_extras(variants)
+    if rig:
+        armature = create_armature("EnemyArmature", bones)
+        bind_weights(enemy, armature, bones, joints, weights)
+        armature.select_set(True)
+    enemy.select_set(True)
+    return enemy
+
+
+def write_variants_glb(filepath, variants, resolution=1.0, rig=True):
+    """Write the base creature with one morph target per variant using glb_writer, skinned with rig."""
+    (positions, faces, face_sizes, material_indices), shapes, bones, joints, weights = variant_arrays(
+        variants, resolution)
+    materials = [pbr_material(name, color, **params) for name, color, params in MATERIALS]
+    glb = GLBWriter()
+    extras = {"enemy_variants": variant_extras(variants)}
+    if rig:
+        skin, armature = glb.add_skin("EnemyArmature", bones)
+        glb.add_mesh_node("EnemyVariants", positions, faces, face_sizes=face_sizes,
+                          material_indices=material_indices, materials=materials, morph_targets=shapes,
+                          joints=joints, weights=weights, extras=extras, parent=armature, skin=skin)
+    else:
+        glb.add_mesh_node("EnemyVariants", positions, faces, face_sizes=face_sizes,
+                          material_indices=material_indices, materials=materials, morph_targets=shapes,
+                          extras=extras)
+    glb.write(filepath)
+
+
+def export_variants(output_path=DEFAULT_OUTPUT, count=DEFAULT_COUNT, seed=DEFAULT_SEED, resolution=1.0, cache=None,
+                    rig=True):
+    """Build and export count variants as morph targets of one mesh, unless the cached export is current."""
+    cache = cache or BuildCache()
+    variants = make_variants(count, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    cache_key = asset_key([os.path.abspath(__file__), create_enemy, primitives, tree_mesh, bulk_mesh, glb_writer,
+                           mesh_optimize, auto_rig],
+                          params={"variants": variants, "resolution": resolution, "rig": rig})
+    if cache.restore(cache_key, [output_path]) is None:
+        with cache.stage(cache_key, [output_path]) as (staged_path,):
+            if bpy is None:
+                write_variants_glb(staged_path, variants, resolution, rig)
+            else:
+                clear_scene()
+                build_variants_object(variants, resolution, rig)
+                optimize_objects(bpy.context.selected_objects)
+                bpy.ops.export_scene.gltf(
+                    filepath=staged_path,
+                    export_format='GLB',
+                    use_selection=True,
+                    export_apply=False,  # applying modifiers would drop the shape keys
+                    export_materials='EXPORT',
+                    export_morph=True,
+                    export_morph_normal=True,
+                    export_skins=True,
+                    export_extras=True,
+                )
+        print(f"Exported {count} enemy variants to: {output_path}")
+    for name, proportions, palette in variants:
+        print(f"  {name}: {palette:<6} " + " ".join(f"{key}={value}" for key, value in proportions.items()))
+    return output_path
+
+
+def main():
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = sys.argv[1:] if bpy is None else []
+    parser = argparse.ArgumentParser(description="Generate enemy variants as morph targets of one creature mesh.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="GLB path to write")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="number of variants")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="variant k is sampled from seed + k")
+    parser.add_argument("--resolution", type=float, default=1.0,
+                        help="multiplier on primitive segment counts (default 1.0)")
+    parser.add_argument("--no-rig", action="store_true", help="export the mesh without the armature and skin")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild even if the cached export is current")
+    args = parser.parse_args(argv)
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    export_variants(args.output, args.count, args.seed, args.resolution, BuildCache(enabled=not args.no_cache),
+                    rig=not args.no_rig)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,35 @@
-import bpy
-import bmesh
+import argparse
+import json
 import math
 import os
 import random
-from mathutils import Vector, Euler
+import sys
+import numpy as np
 
-random.seed(123)
+try:
+    import bpy
+    import bmesh
+    from mathutils import Vector, Euler
+except ImportError:
+    # Plain CPython can still export terrain tiles through glb_writer
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bulk_mesh
+import glb_writer
+import heightfield
+import lod as lod_module
+import mesh_optimize
+from build_cache import (BuildCache, asset_key, random_state_from_json, random_state_to_json,
+                         write_if_changed)
+from bulk_mesh import mesh_from_arrays, object_from_arrays
+from glb_writer import GLBWriter, pbr_material
+from heightfield import (add_skirt, godot_height_grid, grid_border, grid_mesh, terrain_height,
+                         terrain_normals, write_heightfield)
+from lod import DEFAULT_LOD_DISTANCES, add_decimated_copy, assign_visibility_ranges, create_impostor
+from mesh_optimize import optimize_objects
+
+DEFAULT_SEED = 123
 
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
@@ -29,12 +53,11 @@ def make_mat(name, color, roughness=0.85, subsurface=0.0, subsurface_color=None)
             bsdf.inputs["Subsurface Radius"].default_value = subsurface_color
     return mat
 
-output_dir = "/home/nem0nxt/tt/athena-saga/assets/models/nature/"
-os.makedirs(output_dir, exist_ok=True)
+output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "models", "nature")
 
 
 # ========== GRASS PATCH ==========
-def create_grass_patch():
+def make_grass_materials():
     mat_grass_base = make_mat("GrassBase", (0.08, 0.28, 0.04, 1.0), roughness=0.95,
                               subsurface=0.2, subsurface_color=(0.15, 0.4, 0.08))
     mat_grass_mid = make_mat("GrassMid", (0.12, 0.38, 0.06, 1.0), roughness=0.93,
@@ -42,8 +65,11 @@ def create_grass_patch():
     mat_grass_tip = make_mat("GrassTip", (0.18, 0.48, 0.1, 1.0), roughness=0.9,
                              subsurface=0.1, subsurface_color=(0.25, 0.55, 0.12))
     mat_dry = make_mat("GrassDry", (0.35, 0.32, 0.15, 1.0), roughness=0.96)
-    
-    grass_mats = [mat_grass_base, mat_grass_mid, mat_grass_tip, mat_dry]
+    return [mat_grass_base, mat_grass_mid, mat_grass_tip, mat_dry]
+
+
+def create_grass_patch(blade_count=80):
+    grass_mats = make_grass_materials()
     
     mesh = bpy.data.meshes.new("GrassPatchMesh")
     obj = bpy.data.objects.new("GrassPatch", mesh)
@@ -55,7 +81,7 @@ def create_grass_patch():
     
     bm = bmesh.new()
     
-    for i in range(80):
+    for i in range(blade_count):
         x = random.uniform(-1.5, 1.5)
         y = random.uniform(-1.5, 1.5)
         
@@ -110,12 +136,9 @@ def create_grass_patch():
             else:
                 mat_i = 2  # tip
             
-            try:
-                f = bm.faces.new([left_verts[si], right_verts[si],
-                                  right_verts[si+1], left_verts[si+1]])
-                f.material_index = mat_i
-            except:
-                pass
+            f = bm.faces.new([left_verts[si], right_verts[si],
+                              right_verts[si+1], left_verts[si+1]])
+            f.material_index = mat_i
     
     # Small ground cover flowers (tiny colored dots)
     for _ in range(5):
@@ -128,11 +151,8 @@ def create_grass_patch():
         v2 = bm.verts.new((fx + fw, fy, fh))
         v3 = bm.verts.new((fx, fy - fw, fh))
         v4 = bm.verts.new((fx, fy + fw, fh))
-        try:
-            f = bm.faces.new([v1, v3, v2, v4])
-            f.material_index = 2
-        except:
-            pass
+        f = bm.faces.new([v1, v3, v2, v4])
+        f.material_index = 2
     
     bm.to_mesh(mesh)
     bm.free()
@@ -140,13 +160,117 @@ def create_grass_patch():
     return obj
 
 
+# ========== INSTANCED GRASS PATCH ==========
+BLADE_SEGMENTS = 4
+GRASS_GREEN = 0
+GRASS_DRY = 1
+
+# One row per blade or flower in an instanced patch
+GRASS_INSTANCE_DTYPE = np.dtype([
+    ("archetype", "<u2"),
+    ("position", "<f4", 3),
+    ("rotation", "<f4"),
+    ("scale", "<f4"),
+    ("material", "<u1"),
+])
+
+
+def blade_archetype_geometry(height, width, curve_x, curve_y, bend, material):
+    """Vertices, quads and material indices of one blade rooted at the origin.
+
+    Same blade profile as create_grass_patch, unrotated. material selects the
+    base/mid/tip gradient (GRASS_GREEN) or an all-dry blade (GRASS_DRY).
+    """
+    t = np.arange(BLADE_SEGMENTS + 1) / BLADE_SEGMENTS
+    z = t * height
+    w = width * (1.0 - t * 0.8)
+    cx = curve_x * t * t + bend * t * t * t
+    cy = curve_y * t * t
+    left = np.stack([cx, cy + w, z], axis=-1)
+    right = np.stack([cx, cy - w, z], axis=-1)
+    verts = np.stack([left, right], axis=1).reshape(-1, 3)
+
+    si = np.arange(BLADE_SEGMENTS)
+    faces = np.stack([2 * si, 2 * si + 1, 2 * si + 3, 2 * si + 2], axis=-1)
+    if material == GRASS_DRY:
+        mat_idx = np.full(BLADE_SEGMENTS, 3)
+    else:
+        ts = si / BLADE_SEGMENTS
+        mat_idx = np.where(ts < 0.3, 0, np.where(ts < 0.7, 1, 2))
+    return verts, faces, mat_idx
+
+
+def flower_archetype_geometry():
+    """The tiny ground-cover flower quad, centered at the origin."""
+    fw = 0.02
+    verts = np.array([(-fw, 0, 0), (0, -fw, 0), (fw, 0, 0), (0, fw, 0)], dtype=np.float64)
+    return verts, np.array([[0, 1, 2, 3]]), np.array([2])
+
+
+def grass_instance_table(archetype_count, blade_count, flower_count=5):
+    """Describe a patch as instance rows; the last archetype id is the flower."""
+    rows = np.zeros(blade_count + flower_count, dtype=GRASS_INSTANCE_DTYPE)
+    for row in rows[:blade_count]:
+        row["archetype"] = random.randrange(archetype_count)
+        row["position"] = (random.uniform(-1.5, 1.5), random.uniform(-1.5, 1.5), 0.0)
+        row["rotation"] = random.uniform(0, math.pi * 2)
+        row["scale"] = random.uniform(0.85, 1.15)
+        row["material"] = GRASS_DRY if random.random() < 0.15 else GRASS_GREEN
+    for row in rows[blade_count:]:
+        row["archetype"] = archetype_count
+        row["position"] = (random.uniform(-1.2, 1.2), random.uniform(-1.2, 1.2), random.uniform(0.1, 0.2))
+        row["rotation"] = 0.0
+        row["scale"] = 1.0
+        row["material"] = GRASS_GREEN
+    return rows
+
+
+def create_instanced_grass_patch(archetype_count=12, blade_count=80):
+    """Grass patch as a few shared blade archetypes plus a table of instances.
+
+    Every blade object links one archetype mesh and is parented to an empty,
+    so the glTF exporter writes each archetype once and the instances as
+    EXT_mesh_gpu_instancing transforms. Returns (root empty, instance rows).
+    """
+    grass_mats = make_grass_materials()
+    shapes = [(random.uniform(0.15, 0.55), random.uniform(0.01, 0.035),
+               random.uniform(-0.08, 0.08), random.uniform(-0.08, 0.08),
+               random.uniform(0.05, 0.2)) for _ in range(archetype_count)]
+    rows = grass_instance_table(archetype_count, blade_count)
+
+    meshes = {}
+
+    def archetype_mesh(archetype, material):
+        key = (archetype, material)
+        if key not in meshes:
+            if archetype == archetype_count:
+                verts, faces, mat_idx = flower_archetype_geometry()
+            else:
+                verts, faces, mat_idx = blade_archetype_geometry(*shapes[archetype], material)
+            mesh = mesh_from_arrays(f"GrassArchetype_{archetype}_{material}", verts, faces,
+                                    material_indices=mat_idx)
+            for m in grass_mats:
+                mesh.materials.append(m)
+            meshes[key] = mesh
+        return meshes[key]
+
+    root = bpy.data.objects.new("GrassPatch", None)
+    bpy.context.collection.objects.link(root)
+    for i, row in enumerate(rows):
+        mesh = archetype_mesh(int(row["archetype"]), int(row["material"]))
+        obj = bpy.data.objects.new(f"GrassInstance_{i}", mesh)
+        obj.parent = root
+        obj.location = row["position"].tolist()
+        obj.rotation_euler = (0.0, 0.0, float(row["rotation"]))
+        obj.scale = (float(row["scale"]),) * 3
+        bpy.context.collection.objects.link(obj)
+    return root, rows
+
+
 # ========== TERRAIN ==========
-def create_terrain():
+def create_terrain(subdivisions=80, size=200):
     mat_terrain = make_mat("TerrainGround", (0.22, 0.4, 0.12, 1.0), roughness=0.95)
     
-    subdivisions = 80
-    size = 200
-    
     bpy.ops.mesh.primitive_grid_add(
         x_subdivisions=subdivisions, y_subdivisions=subdivisions,
         size=size, location=(0, 0, 0)
@@ -154,26 +278,14 @@ def create_terrain():
     terrain = bpy.context.active_object
     terrain.name = "Terrain"
     
-    bm = bmesh.new()
-    bm.from_mesh(terrain.data)
-    
-    for v in bm.verts:
-        x, y = v.co.x, v.co.y
-        
-        h = 3.0 * math.sin(x * 0.03) * math.cos(y * 0.025)
-        h += 1.5 * math.sin(x * 0.08 + 1.5) * math.cos(y * 0.06 + 0.7)
-        h += 0.5 * math.sin(x * 0.2 + 3.0) * math.cos(y * 0.25 + 2.1)
-        h += 0.2 * math.sin(x * 0.5) * math.sin(y * 0.5)
-        
-        dist_from_center = math.sqrt(x*x + y*y)
-        if dist_from_center < 15:
-            flatten = 1.0 - max(0, (15 - dist_from_center) / 15)
-            h *= flatten
-        
-        v.co.z = h
-    
-    bm.to_mesh(terrain.data)
-    bm.free()
+    # Evaluate the whole grid at once and write it back in one bulk call
+    mesh = terrain.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    co[:, 2] = terrain_height(co[:, 0], co[:, 1])
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.update()
     
     terrain.data.materials.append(mat_terrain)
     bpy.ops.object.shade_smooth()
@@ -181,6 +293,24 @@ def create_terrain():
     return terrain
 
 
+def export_heightfield_sidecar(terrain, path):
+    """Write the terrain's vertex grid as a HeightMapShape3D-ready sidecar.
+
+    The grid axes are read back from the mesh so the sidecar samples exactly
+    the exported vertices, whatever vertex count primitive_grid_add produced.
+    """
+    mesh = terrain.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    xs = np.unique(co[:, 0])
+    zs = np.unique(-co[:, 1])
+    spacing_x = float(xs[-1] - xs[0]) / (len(xs) - 1)
+    spacing_z = float(zs[-1] - zs[0]) / (len(zs) - 1)
+    heights = godot_height_grid(float(xs[0]), float(zs[0]), spacing_x, spacing_z, len(xs), len(zs))
+    write_heightfield(path, heights, float(xs[0]), float(zs[0]), spacing_x, spacing_z)
+
+
 # ========== ROCK ==========
 def create_rock():
     mat_rock = make_mat("Rock", (0.38, 0.36, 0.33, 1.0), roughness=0.97)
@@ -224,32 +354,229 @@ def create_rock():
     return rock
 
 
-# --- Export Grass ---
-clear_scene()
-create_grass_patch()
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.export_scene.gltf(
-    filepath=os.path.join(output_dir, "grass_patch.glb"),
-    export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT'
-)
-print("Exported grass_patch.glb")
-
-# --- Export Terrain ---
-clear_scene()
-create_terrain()
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.export_scene.gltf(
-    filepath=os.path.join(output_dir, "terrain.glb"),
-    export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT'
-)
-print("Exported terrain.glb")
-
-# --- Export Rock ---
-clear_scene()
-create_rock()
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.export_scene.gltf(
-    filepath=os.path.join(output_dir, "rock.glb"),
-    export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT'
-)
-print("Exported rock.glb")
+def add_rock_lods(rock, ratios, distances=DEFAULT_LOD_DISTANCES):
+    """Turn rock into Rock_LOD0, add one Decimate level per ratio and a billboard impostor."""
+    rock.name = "Rock_LOD0"
+    levels = [rock]
+    for ratio in ratios:
+        levels.append(add_decimated_copy(rock, f"Rock_LOD{len(levels)}", ratio))
+    levels.append(create_impostor(rock, f"Rock_LOD{len(levels)}"))
+    assign_visibility_ranges(levels, distances)
+    return levels
+
+
+# ========== TERRAIN TILES ==========
+def export_terrain_tiles(tiles_dir, bounds, chunk_size, lods, skirt_depth, cache):
+    """Export one GLB per (chunk, LOD) plus a manifest.json for chunk streaming.
+
+    bounds is (min_x, min_z, max_x, max_z) in Godot world coordinates. Chunk
+    (i, j) covers x in [i, i+1] * chunk_size and z in [j, j+1] * chunk_size,
+    matching ChunkManager.get_chunk_coordinates. glTF/Godot +Z is Blender -Y,
+    so the tile grids are generated at y = -z. Each tile mesh is local to its
+    chunk center and the node carries the world offset, so a tile scene can be
+    instanced at the origin. Outside Blender the tiles are written with
+    glb_writer. Tiles and manifest are only rewritten when their bytes change.
+    """
+    os.makedirs(tiles_dir, exist_ok=True)
+    min_x, min_z, max_x, max_z = bounds
+    i_range = range(math.floor(min_x / chunk_size), math.ceil(max_x / chunk_size))
+    j_range = range(math.floor(min_z / chunk_size), math.ceil(max_z / chunk_size))
+
+    tiles = []
+    for j in j_range:
+        for i in i_range:
+            x0, x1 = i * chunk_size, (i + 1) * chunk_size
+            y0, y1 = -(j + 1) * chunk_size, -j * chunk_size
+            center = np.array([(x0 + x1) * 0.5, (y0 + y1) * 0.5, 0.0])
+            for lod, subdivisions in enumerate(lods):
+                positions, faces = grid_mesh(x0, y0, x1, y1, subdivisions)
+                min_h = float(positions[:, 2].min())
+                max_h = float(positions[:, 2].max())
+                if skirt_depth > 0:
+                    positions, faces = add_skirt(positions, faces, grid_border(subdivisions), skirt_depth)
+                normals = terrain_normals(positions[:, 0], positions[:, 1])
+
+                name = f"Terrain_{i}_{j}_LOD{lod}"
+                filename = f"terrain_{i}_{j}_lod{lod}.glb"
+                key = asset_key([heightfield, glb_writer, bulk_mesh, mesh_optimize, __file__],
+                                params={"chunk": [i, j], "chunk_size": chunk_size, "lod": lod,
+                                        "subdivisions": subdivisions, "skirt_depth": skirt_depth},
+                                exclude=ASSET_BUILDERS)
+                path = os.path.join(tiles_dir, filename)
+                if cache.restore(key, [path]) is None:
+                    with cache.stage(key, [path]) as (staged,):
+                        if bpy is None:
+                            glb = GLBWriter()
+                            glb.add_mesh_node(name, positions - center, faces, location=center, normals=normals,
+                                              materials=[pbr_material("TerrainGround", (0.22, 0.4, 0.12, 1.0),
+                                                                      roughness=0.95)])
+                            glb.write(staged)
+                            print(f"Exported {filename}")
+                        else:
+                            clear_scene()
+                            mat_terrain = make_mat("TerrainGround", (0.22, 0.4, 0.12, 1.0), roughness=0.95)
+                            object_from_arrays(name, positions - center, faces,
+                                               materials=[mat_terrain], location=center, normals=normals)
+                            export_selected(staged)
+                tiles.append({
+                    "chunk": [i, j],
+                    "lod": lod,
+                    "subdivisions": subdivisions,
+                    "file": filename,
+                    "bounds": {"min": [x0, min_h, j * chunk_size],
+                               "max": [x1, max_h, (j + 1) * chunk_size]},
+                    "min_height": min_h,
+                    "max_height": max_h,
+                })
+
+    manifest = {
+        "chunk_size": chunk_size,
+        "bounds": list(bounds),
+        "lods": list(lods),
+        "skirt_depth": skirt_depth,
+        "tiles": tiles,
+    }
+    write_if_changed(os.path.join(tiles_dir, "manifest.json"), json.dumps(manifest, indent=2))
+    print(f"Wrote manifest for {len(tiles)} tiles to {tiles_dir}")
+
+
+def export_selected(filepath, **options):
+    """Optimize every mesh in the scene and export them all as a GLB."""
+    bpy.ops.object.select_all(action='SELECT')
+    optimize_objects(bpy.context.selected_objects)
+    bpy.ops.export_scene.gltf(
+        filepath=filepath,
+        export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT',
+        **options
+    )
+    print(f"Exported {os.path.basename(filepath)}")
+
+
+# Generators of a single asset each. Keys hash this whole script minus these,
+# plus the asset's own, so editing one generator only rebuilds its asset
+ASSET_BUILDERS = [create_grass_patch, create_instanced_grass_patch, blade_archetype_geometry,
+                  flower_archetype_geometry, grass_instance_table, create_terrain, export_heightfield_sidecar,
+                  create_rock, add_rock_lods]
+
+
+def export_cached(cache, out_dir, filenames, sources, params, build, uses_random=True):
+    """Call build(*staged paths) unless the cache already has these outputs.
+
+    sources are the asset's own generators (from ASSET_BUILDERS) and the
+    modules it uses; the rest of this script is always part of the key.
+    Assets that draw from the module-level random stream include its state
+    in the key, and on a hit the stream is fast-forwarded exactly as build
+    would have left it.
+    """
+    outputs = [os.path.join(out_dir, name) for name in filenames]
+    seed = random_state_to_json(random.getstate()) if uses_random else None
+    key = asset_key([*sources, __file__, mesh_optimize], params, seed=seed, exclude=ASSET_BUILDERS)
+    meta = cache.restore(key, outputs)
+    if meta is not None:
+        if uses_random:
+            random.setstate(random_state_from_json(meta["random_state"]))
+        return
+    meta = {}
+    with cache.stage(key, outputs, meta) as staged:
+        build(*staged)
+        if uses_random:
+            meta["random_state"] = random_state_to_json(random.getstate())
+
+
+def export_nature_assets(cache, out_dir=output_dir, seed=DEFAULT_SEED, grass_blades=80, grass_archetypes=0,
+                         terrain_subdivisions=80, terrain_size=200, rock_lods=None):
+    """Export grass, terrain and rock into out_dir, all drawing from one seeded random stream.
+
+    The optional instanced grass patch draws from the stream last, so turning
+    it on or off leaves the other assets (and their cache keys) unchanged.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    random.seed(seed)
+
+    def grass(path):
+        clear_scene()
+        create_grass_patch(grass_blades)
+        export_selected(path)
+
+    def instanced_grass(path):
+        clear_scene()
+        _, rows = create_instanced_grass_patch(archetype_count=grass_archetypes, blade_count=grass_blades)
+        export_selected(path, export_gpu_instances=True)
+        print(f"  {grass_archetypes} archetypes, {len(rows)} instances")
+
+    def terrain(glb_path, hfield_path):
+        clear_scene()
+        terrain = create_terrain(terrain_subdivisions, terrain_size)
+        export_selected(glb_path)
+        export_heightfield_sidecar(terrain, hfield_path)
+        print(f"Exported {os.path.basename(hfield_path)}")
+
+    def rock(path):
+        clear_scene()
+        rock = create_rock()
+        if rock_lods:
+            add_rock_lods(rock, rock_lods)
+        export_selected(path, export_extras=True)
+
+    export_cached(cache, out_dir, ["grass_patch.glb"], [create_grass_patch],
+                  {"blades": grass_blades}, grass)
+    export_cached(cache, out_dir, ["terrain.glb", "terrain.hfield"],
+                  [create_terrain, export_heightfield_sidecar, heightfield],
+                  {"subdivisions": terrain_subdivisions, "size": terrain_size}, terrain, uses_random=False)
+    export_cached(cache, out_dir, ["rock.glb"], [create_rock, add_rock_lods, lod_module],
+                  {"rock_lods": rock_lods}, rock)
+    if grass_archetypes > 0:
+        export_cached(cache, out_dir, ["grass_patch_instanced.glb"],
+                      [create_instanced_grass_patch, blade_archetype_geometry, flower_archetype_geometry,
+                       grass_instance_table],
+                      {"archetypes": grass_archetypes, "blades": grass_blades, "dtype": GRASS_INSTANCE_DTYPE.descr},
+                      instanced_grass)
+
+
+def main():
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = sys.argv[1:] if bpy is None else []
+    parser = argparse.ArgumentParser(description="Generate grass, terrain and rock assets.")
+    parser.add_argument("--output-dir", default=output_dir)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed of the grass and rock random stream")
+    parser.add_argument("--grass-blades", type=int, default=80, help="blades in grass_patch.glb")
+    parser.add_argument("--terrain-subdivisions", type=int, default=80,
+                        help="grid subdivisions per side of terrain.glb")
+    parser.add_argument("--terrain-size", type=float, default=200.0, help="edge length of terrain.glb in meters")
+    parser.add_argument("--tiles", action="store_true",
+                        help="export chunked terrain tiles with LODs instead of the single assets")
+    parser.add_argument("--bounds", type=float, nargs=4, default=(-100.0, -100.0, 100.0, 100.0),
+                        metavar=("MIN_X", "MIN_Z", "MAX_X", "MAX_Z"),
+                        help="world bounds covered by tiles, in Godot coordinates")
+    parser.add_argument("--chunk-size", type=float, default=50.0,
+                        help="tile edge length in meters (ChunkManager.chunk_size)")
+    parser.add_argument("--lods", type=lambda s: [int(v) for v in s.split(",")], default=[64, 32, 16, 8],
+                        help="comma-separated grid subdivisions per tile, LOD0 first")
+    parser.add_argument("--skirt-depth", type=float, default=1.0,
+                        help="depth of the crack-hiding skirt around each tile (0 disables)")
+    parser.add_argument("--grass-archetypes", type=int, default=0,
+                        help="also export grass_patch_instanced.glb built from this many blade archetypes")
+    parser.add_argument("--rock-lods", type=lambda s: [float(v) for v in s.split(",")], default=None,
+                        help="comma-separated Decimate ratios for rock LOD1.. (e.g. 0.5,0.2); "
+                             "an impostor LOD is appended")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="rebuild every asset instead of reusing unchanged ones from the build cache")
+    args = parser.parse_args(argv)
+    if bpy is None and not args.tiles:
+        parser.error("only --tiles can run outside Blender; run the rest with blender --background --python")
+
+    cache = BuildCache(enabled=not args.no_cache)
+    if args.tiles:
+        export_terrain_tiles(os.path.join(args.output_dir, "terrain_tiles"), args.bounds,
+                             args.chunk_size, args.lods, args.skirt_depth, cache)
+    else:
+        export_nature_assets(cache, args.output_dir, seed=args.seed, grass_blades=args.grass_blades,
+                             grass_archetypes=args.grass_archetypes,
+                             terrain_subdivisions=args.terrain_subdivisions, terrain_size=args.terrain_size,
+                             rock_lods=args.rock_lods)
+
+
+if __name__ == "__main__":
+    main()
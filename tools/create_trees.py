@@ -1,11 +1,39 @@
-import bpy
-import bmesh
-import math
+import argparse
+import json
+import numpy as np
 import os
 import random
-from mathutils import Vector, Matrix, Euler
+import subprocess
+import sys
+import tempfile
+
+try:
+    import bpy
+except ImportError:
+    # Plain CPython: trees are written with glb_writer instead of the glTF exporter
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bulk_mesh
+import foliage_cards
+import glb_writer
+import lod as lod_module
+import mesh_optimize
+import tree_mesh
+from blender_worker import BlenderPool
+from build_cache import (BuildCache, asset_key, random_state_from_json, random_state_to_json,
+                         write_if_changed)
+from bulk_mesh import object_from_arrays
+from foliage_cards import ALPHA_CUTOFF, DEFAULT_CARDS, DEFAULT_CELL_SIZE, bake_cards, card_material
+from glb_writer import GLBWriter, pbr_material
+from lod import (DEFAULT_LOD_DISTANCES, assign_visibility_ranges, create_impostor, triangle_count,
+                 visibility_bands)
+from mesh_optimize import optimize_objects
+from tree_mesh import build_birch, build_oak, build_pine, ground, lod_arrays, select_lods
+
+# Triangle budgets of LOD1 and LOD2 as fractions of LOD0, the full tree; LOD3 is the impostor
+DEFAULT_LOD_BUDGETS = (0.6, 0.25)
 
-random.seed(42)
 
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
@@ -16,6 +44,9 @@ def clear_scene():
     for block in bpy.data.materials:
         if block.users == 0:
             bpy.data.materials.remove(block)
+    for block in bpy.data.images:
+        if block.users == 0:
+            bpy.data.images.remove(block)
 
 def make_mat(name, color, roughness=0.85, subsurface=0.0, subsurface_color=None):
     mat = bpy.data.materials.new(name)
@@ -30,403 +61,346 @@ def make_mat(name, color, roughness=0.85, subsurface=0.0, subsurface_color=None)
     return mat
 
 
-def grow_branch(bm, origin, direction, length, radius, depth, max_depth, mat_bark_idx, mat_leaf_idx):
-    """Recursively grow branches with natural tapering and splitting."""
-    if depth > max_depth or length < 0.05:
-        return
-    
-    segments = 5
-    verts_rings = []
-    current_pos = origin.copy()
-    current_dir = direction.normalized()
-    
-    for i in range(segments + 1):
-        t = i / segments
-        r = radius * (1.0 - t * 0.7)
-        
-        # Curve direction with gravity and randomness
-        gravity_influence = 0.02 * depth
-        current_dir.z -= gravity_influence
-        current_dir.x += random.uniform(-0.1, 0.1) * depth
-        current_dir.y += random.uniform(-0.1, 0.1) * depth
-        current_dir = current_dir.normalized()
-        
-        # Create ring of vertices
-        ring = []
-        sides = max(4, 8 - depth)
-        for j in range(sides):
-            angle = j * 2 * math.pi / sides
-            # Create perpendicular vectors
-            if abs(current_dir.z) < 0.9:
-                perp1 = current_dir.cross(Vector((0, 0, 1))).normalized()
-            else:
-                perp1 = current_dir.cross(Vector((1, 0, 0))).normalized()
-            perp2 = current_dir.cross(perp1).normalized()
-            
-            offset = (perp1 * math.cos(angle) + perp2 * math.sin(angle)) * r
-            v = bm.verts.new(current_pos + offset)
-            ring.append(v)
-        verts_rings.append(ring)
-        
-        current_pos += current_dir * (length / segments)
-    
-    # Create faces between rings
-    for i in range(len(verts_rings) - 1):
-        ring1 = verts_rings[i]
-        ring2 = verts_rings[i + 1]
-        sides = len(ring1)
-        for j in range(sides):
-            j_next = (j + 1) % sides
-            try:
-                f = bm.faces.new([ring1[j], ring1[j_next], ring2[j_next], ring2[j]])
-                f.material_index = mat_bark_idx
-            except:
-                pass
-    
-    tip = current_pos
-    
-    # Add leaf clusters at branch tips
-    if depth >= max_depth - 1:
-        for _ in range(random.randint(2, 4)):
-            leaf_offset = Vector((
-                random.uniform(-0.3, 0.3),
-                random.uniform(-0.3, 0.3),
-                random.uniform(-0.1, 0.3)
-            ))
-            leaf_pos = tip + leaf_offset
-            leaf_size = random.uniform(0.3, 0.8) * (1.0 / (depth * 0.5 + 1))
-            _add_leaf_cluster(bm, leaf_pos, leaf_size, mat_leaf_idx)
-    
-    # Spawn child branches
-    if depth < max_depth:
-        num_children = random.randint(1, 3) if depth < 2 else random.randint(1, 2)
-        for _ in range(num_children):
-            child_angle = random.uniform(20, 60)
-            child_twist = random.uniform(0, 360)
-            
-            child_dir = current_dir.copy()
-            rot_x = Matrix.Rotation(math.radians(child_angle), 3, 'X')
-            rot_z = Matrix.Rotation(math.radians(child_twist), 3, 'Z')
-            child_dir = rot_z @ rot_x @ child_dir
-            
-            child_length = length * random.uniform(0.5, 0.75)
-            child_radius = radius * random.uniform(0.4, 0.65)
-            
-            grow_branch(bm, tip, child_dir, child_length, child_radius,
-                       depth + 1, max_depth, mat_bark_idx, mat_leaf_idx)
-
-
-def _add_leaf_cluster(bm, center, size, mat_idx):
-    """Add a cluster of flat leaf quads."""
-    num_leaves = random.randint(4, 8)
-    for _ in range(num_leaves):
-        offset = Vector((
-            random.uniform(-size, size),
-            random.uniform(-size, size),
-            random.uniform(-size * 0.5, size * 0.5)
-        ))
-        pos = center + offset
-        leaf_w = random.uniform(0.08, 0.15) * size * 3
-        leaf_h = random.uniform(0.1, 0.2) * size * 3
-        
-        # Random orientation
-        rx = random.uniform(-0.5, 0.5)
-        ry = random.uniform(-0.5, 0.5)
-        rz = random.uniform(0, math.pi * 2)
-        rot = Euler((rx, ry, rz)).to_matrix()
-        
-        v1 = bm.verts.new(pos + rot @ Vector((-leaf_w, 0, 0)))
-        v2 = bm.verts.new(pos + rot @ Vector((leaf_w, 0, 0)))
-        v3 = bm.verts.new(pos + rot @ Vector((leaf_w, 0, leaf_h)))
-        v4 = bm.verts.new(pos + rot @ Vector((-leaf_w, 0, leaf_h)))
-        try:
-            f = bm.faces.new([v1, v2, v3, v4])
-            f.material_index = mat_idx
-        except:
-            pass
-
-
-def create_oak_tree():
-    mat_bark = make_mat("OakBark", (0.18, 0.1, 0.05, 1.0), roughness=0.98)
-    mat_leaves = make_mat("OakLeaves", (0.12, 0.35, 0.08, 1.0), roughness=0.92,
-                          subsurface=0.3, subsurface_color=(0.2, 0.5, 0.1))
-    mat_leaves_light = make_mat("OakLeavesLight", (0.2, 0.45, 0.12, 1.0), roughness=0.9,
-                                subsurface=0.2, subsurface_color=(0.3, 0.6, 0.15))
-    
-    mesh = bpy.data.meshes.new("OakTreeMesh")
-    obj = bpy.data.objects.new("OakTree", mesh)
-    bpy.context.collection.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
-    
-    mesh.materials.append(mat_bark)       # 0
-    mesh.materials.append(mat_leaves)     # 1
-    mesh.materials.append(mat_leaves_light)  # 2
-    
-    bm = bmesh.new()
-    
-    # Main trunk
-    grow_branch(bm, Vector((0, 0, 0)), Vector((0, 0, 1)),
-                length=3.5, radius=0.25, depth=0, max_depth=4,
-                mat_bark_idx=0, mat_leaf_idx=1)
-    
-    # Extra branches from lower trunk
-    for i in range(3):
-        angle = i * 2.1 + random.uniform(-0.3, 0.3)
-        branch_start = Vector((0, 0, 1.5 + random.uniform(0, 1.0)))
-        branch_dir = Vector((math.cos(angle) * 0.6, math.sin(angle) * 0.6, 0.8))
-        grow_branch(bm, branch_start, branch_dir,
-                    length=2.0, radius=0.1, depth=1, max_depth=4,
-                    mat_bark_idx=0, mat_leaf_idx=2)
-    
-    bm.to_mesh(mesh)
-    bm.free()
-    
-    bpy.ops.object.shade_smooth()
-    
-    # Set origin and ground level
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-    bbox = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-    min_z = min(v.z for v in bbox)
-    obj.location.z -= min_z
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    return obj
+def _loop_uvs(faces, uvs):
+    """Per-vertex UVs as the per-loop array object_from_arrays takes."""
+    return np.asarray(uvs)[np.asarray(faces).ravel()]
 
 
-def create_pine_tree():
-    mat_bark = make_mat("PineBark", (0.22, 0.12, 0.06, 1.0), roughness=0.97)
-    mat_needles = make_mat("PineNeedles", (0.06, 0.22, 0.06, 1.0), roughness=0.95,
-                           subsurface=0.15, subsurface_color=(0.1, 0.3, 0.05))
-    mat_needles_tip = make_mat("PineNeedlesTip", (0.1, 0.3, 0.08, 1.0), roughness=0.93)
-    
-    mesh = bpy.data.meshes.new("PineTreeMesh")
-    obj = bpy.data.objects.new("PineTree", mesh)
-    bpy.context.collection.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
-    
-    mesh.materials.append(mat_bark)       # 0
-    mesh.materials.append(mat_needles)    # 1
-    mesh.materials.append(mat_needles_tip)  # 2
-    
-    bm = bmesh.new()
-    
-    # Tall straight trunk
-    trunk_height = 7.0
-    trunk_segments = 12
-    trunk_rings = []
-    for i in range(trunk_segments + 1):
-        t = i / trunk_segments
-        z = t * trunk_height
-        r = 0.15 * (1.0 - t * 0.6)
-        ring = []
-        for j in range(8):
-            angle = j * 2 * math.pi / 8
-            x = math.cos(angle) * r + random.uniform(-0.01, 0.01)
-            y = math.sin(angle) * r + random.uniform(-0.01, 0.01)
-            v = bm.verts.new((x, y, z))
-            ring.append(v)
-        trunk_rings.append(ring)
-    
-    for i in range(len(trunk_rings) - 1):
-        for j in range(8):
-            j_next = (j + 1) % 8
-            try:
-                f = bm.faces.new([trunk_rings[i][j], trunk_rings[i][j_next],
-                                  trunk_rings[i+1][j_next], trunk_rings[i+1][j]])
-                f.material_index = 0
-            except:
-                pass
-    
-    # Layered conical foliage with drooping branch tips
-    layers = 7
-    for li in range(layers):
-        t = li / (layers - 1)
-        base_z = 2.0 + t * 5.0
-        base_radius = 2.0 * (1.0 - t * 0.8) + 0.2
-        
-        branches_in_layer = random.randint(6, 10)
-        for bi in range(branches_in_layer):
-            angle = bi * 2 * math.pi / branches_in_layer + random.uniform(-0.2, 0.2)
-            
-            # Branch extends outward and slightly down
-            branch_len = base_radius * random.uniform(0.7, 1.1)
-            segments = 4
-            
-            for si in range(segments):
-                st = si / segments
-                st_next = (si + 1) / segments
-                
-                r1 = branch_len * st
-                r2 = branch_len * st_next
-                droop1 = -st * st * 0.3
-                droop2 = -st_next * st_next * 0.3
-                
-                # Create needle quad
-                w = 0.15 * (1.0 - st * 0.5)
-                
-                x1 = math.cos(angle) * r1
-                y1 = math.sin(angle) * r1
-                z1 = base_z + droop1
-                
-                x2 = math.cos(angle) * r2
-                y2 = math.sin(angle) * r2
-                z2 = base_z + droop2
-                
-                perp_x = -math.sin(angle) * w
-                perp_y = math.cos(angle) * w
-                
-                v1 = bm.verts.new((x1 + perp_x, y1 + perp_y, z1))
-                v2 = bm.verts.new((x1 - perp_x, y1 - perp_y, z1))
-                v3 = bm.verts.new((x2 - perp_x, y2 - perp_y, z2))
-                v4 = bm.verts.new((x2 + perp_x, y2 + perp_y, z2))
-                try:
-                    f = bm.faces.new([v1, v2, v3, v4])
-                    f.material_index = 2 if t > 0.7 else 1
-                except:
-                    pass
-    
-    bm.to_mesh(mesh)
-    bm.free()
-    bpy.ops.object.shade_smooth()
-    
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-    bbox = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-    min_z = min(v.z for v in bbox)
-    obj.location.z -= min_z
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    return obj
+def create_tree_object(name, buffers, materials, lod_budgets=None, lod_distances=DEFAULT_LOD_DISTANCES):
+    """Ground the generated arrays and load them into one object in a single bulk write.
 
+    With lod_budgets, the full tree becomes <name>_LOD0 and is followed by one
+    thinned mesh per triangle budget (a fraction of LOD0's) plus a billboard
+    impostor, each tagged with the visibility range it covers. Budgets that
+    would not thin the previous level are skipped (select_lods). Returns the
+    LOD0 object.
+    """
+    positions, faces, material_indices = buffers.arrays()
+    uvs = _loop_uvs(faces, buffers.uvs()) if buffers.has_uvs else None
+    obj = object_from_arrays(name, ground(positions), faces, materials=materials,
+                             material_indices=material_indices, uvs=uvs)
+    if lod_budgets is None:
+        return obj
 
-def create_birch_tree():
-    mat_bark = make_mat("BirchBark", (0.88, 0.85, 0.78, 1.0), roughness=0.75)
-    mat_bark_dark = make_mat("BirchBarkDark", (0.2, 0.18, 0.15, 1.0), roughness=0.85)
-    mat_leaves = make_mat("BirchLeaves", (0.25, 0.5, 0.12, 1.0), roughness=0.88,
-                          subsurface=0.25, subsurface_color=(0.3, 0.6, 0.15))
-    
-    mesh = bpy.data.meshes.new("BirchTreeMesh")
-    obj = bpy.data.objects.new("BirchTree", mesh)
-    bpy.context.collection.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
-    
-    mesh.materials.append(mat_bark)       # 0
-    mesh.materials.append(mat_bark_dark)  # 1
-    mesh.materials.append(mat_leaves)     # 2
-    
-    bm = bmesh.new()
-    
-    # Slender trunk with slight curve
-    trunk_height = 6.0
-    segments = 16
-    trunk_rings = []
-    curve_x = 0
-    for i in range(segments + 1):
-        t = i / segments
-        z = t * trunk_height
-        r = 0.08 * (1.0 - t * 0.5)
-        curve_x += random.uniform(-0.02, 0.02)
-        
-        ring = []
-        for j in range(6):
-            angle = j * 2 * math.pi / 6
-            x = math.cos(angle) * r + curve_x
-            y = math.sin(angle) * r
-            v = bm.verts.new((x, y, z))
-            ring.append(v)
-        trunk_rings.append(ring)
-    
-    for i in range(len(trunk_rings) - 1):
-        for j in range(6):
-            j_next = (j + 1) % 6
-            try:
-                f = bm.faces.new([trunk_rings[i][j], trunk_rings[i][j_next],
-                                  trunk_rings[i+1][j_next], trunk_rings[i+1][j]])
-                f.material_index = 0 if random.random() > 0.3 else 1
-            except:
-                pass
-    
-    # Delicate hanging leaf clusters
-    for i in range(12):
-        angle = i * math.pi / 6 + random.uniform(-0.3, 0.3)
-        dist = random.uniform(0.5, 1.5)
-        z = random.uniform(3.5, 6.5)
-        x = math.cos(angle) * dist + curve_x
-        y = math.sin(angle) * dist
-        
-        # Hanging leaf strand
-        strand_length = random.uniform(0.5, 1.2)
-        strand_segments = random.randint(3, 5)
-        for si in range(strand_segments):
-            st = si / strand_segments
-            sz = z - st * strand_length
-            leaf_w = random.uniform(0.05, 0.12)
-            leaf_h = random.uniform(0.08, 0.15)
-            
-            lx = x + random.uniform(-0.15, 0.15)
-            ly = y + random.uniform(-0.15, 0.15)
-            
-            rx = random.uniform(-0.3, 0.3)
-            ry = random.uniform(-0.3, 0.3)
-            rz = random.uniform(0, math.pi * 2)
-            rot = Euler((rx, ry, rz)).to_matrix()
-            
-            pos = Vector((lx, ly, sz))
-            v1 = bm.verts.new(pos + rot @ Vector((-leaf_w, 0, 0)))
-            v2 = bm.verts.new(pos + rot @ Vector((leaf_w, 0, 0)))
-            v3 = bm.verts.new(pos + rot @ Vector((leaf_w, 0, leaf_h)))
-            v4 = bm.verts.new(pos + rot @ Vector((-leaf_w, 0, leaf_h)))
-            try:
-                f = bm.faces.new([v1, v2, v3, v4])
-                f.material_index = 2
-            except:
-                pass
-    
-    # Top canopy
-    for _ in range(6):
-        cx = curve_x + random.uniform(-0.4, 0.4)
-        cy = random.uniform(-0.4, 0.4)
-        cz = random.uniform(5.0, 6.5)
-        _add_leaf_cluster(bm, Vector((cx, cy, cz)), random.uniform(0.4, 0.7), 2)
-    
-    bm.to_mesh(mesh)
-    bm.free()
-    bpy.ops.object.shade_smooth()
-    
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-    bbox = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-    min_z = min(v.z for v in bbox)
-    obj.location.z -= min_z
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+    obj.name = f"{name}_LOD0"
+    levels = [obj]
+    base_z = positions[:, 2].min()
+    reductions, lod_distances = select_lods(buffers, lod_budgets, lod_distances)
+    for depth, density in reductions:
+        lod_positions, lod_faces, lod_materials, lod_uvs = lod_arrays(buffers, depth, density, uvs=True)
+        lod_positions[:, 2] -= base_z
+        levels.append(object_from_arrays(f"{name}_LOD{len(levels)}", lod_positions, lod_faces,
+                                         materials=materials, material_indices=lod_materials,
+                                         uvs=_loop_uvs(lod_faces, lod_uvs) if buffers.has_uvs else None))
+    levels.append(create_impostor(obj, f"{name}_LOD{len(levels)}"))
+    assign_visibility_ranges(levels, lod_distances)
     return obj
 
 
-output_dir = "/home/nem0nxt/tt/athena-saga/assets/models/nature/"
-os.makedirs(output_dir, exist_ok=True)
-
-# --- Oak ---
-clear_scene()
-create_oak_tree()
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.export_scene.gltf(
-    filepath=os.path.join(output_dir, "oak_tree.glb"),
-    export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT'
-)
-print("Exported oak_tree.glb")
-
-# --- Pine ---
-clear_scene()
-create_pine_tree()
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.export_scene.gltf(
-    filepath=os.path.join(output_dir, "pine_tree.glb"),
-    export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT'
-)
-print("Exported pine_tree.glb")
-
-# --- Birch ---
-clear_scene()
-create_birch_tree()
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.export_scene.gltf(
-    filepath=os.path.join(output_dir, "birch_tree.glb"),
-    export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT'
-)
-print("Exported birch_tree.glb")
+# name: (object name, skeleton builder, make_mat arguments per material slot)
+SPECIES = {
+    "oak": ("OakTree", build_oak, [
+        ("OakBark", (0.18, 0.1, 0.05, 1.0), dict(roughness=0.98)),
+        ("OakLeaves", (0.12, 0.35, 0.08, 1.0), dict(roughness=0.92,
+                                                    subsurface=0.3, subsurface_color=(0.2, 0.5, 0.1))),
+        ("OakLeavesLight", (0.2, 0.45, 0.12, 1.0), dict(roughness=0.9,
+                                                        subsurface=0.2, subsurface_color=(0.3, 0.6, 0.15))),
+    ]),
+    "pine": ("PineTree", build_pine, [
+        ("PineBark", (0.22, 0.12, 0.06, 1.0), dict(roughness=0.97)),
+        ("PineNeedles", (0.06, 0.22, 0.06, 1.0), dict(roughness=0.95,
+                                                      subsurface=0.15, subsurface_color=(0.1, 0.3, 0.05))),
+        ("PineNeedlesTip", (0.1, 0.3, 0.08, 1.0), dict(roughness=0.93)),
+    ]),
+    "birch": ("BirchTree", build_birch, [
+        ("BirchBark", (0.88, 0.85, 0.78, 1.0), dict(roughness=0.75)),
+        ("BirchBarkDark", (0.2, 0.18, 0.15, 1.0), dict(roughness=0.85)),
+        ("BirchLeaves", (0.25, 0.5, 0.12, 1.0), dict(roughness=0.88,
+                                                     subsurface=0.25, subsurface_color=(0.3, 0.6, 0.15))),
+    ]),
+}
+
+
+def build_tree_buffers(species, rng, cards=0, card_cell_size=DEFAULT_CELL_SIZE):
+    """Generate a tree's MeshBuffers; with cards, its foliage is baked onto that many cards per cluster.
+
+    Returns (buffers, atlas); the atlas is None without cards, otherwise the
+    cards use one extra material slot after the species' own.
+    """
+    _, build, material_args = SPECIES[species]
+    buffers = build(rng)
+    if not cards:
+        return buffers, None
+    return bake_cards(buffers, [color for _, color, _ in material_args], cards, card_cell_size)
+
+
+def _card_roughness(material_args):
+    """Mean roughness of the species' foliage slots (all but the first, the bark)."""
+    return float(np.mean([params.get("roughness", 0.85) for _, _, params in material_args[1:]]))
+
+
+def create_tree(species, rng, cards=0, card_cell_size=DEFAULT_CELL_SIZE, **lod):
+    """Build one tree of the given species as a Blender object (LOD0 with lod_budgets)."""
+    name, _, material_args = SPECIES[species]
+    materials = [make_mat(mat_name, color, **params) for mat_name, color, params in material_args]
+    buffers, atlas = build_tree_buffers(species, rng, cards, card_cell_size)
+    if atlas is not None:
+        materials.append(card_material(name + "FoliageCards", atlas, _card_roughness(material_args)))
+    return create_tree_object(name, buffers, materials, **lod)
+
+
+def write_tree_glb(species, rng, filepath, lod_budgets=None, lod_distances=DEFAULT_LOD_DISTANCES, cards=0,
+                   card_cell_size=DEFAULT_CELL_SIZE):
+    """Build one tree and write it with glb_writer, without Blender; returns its index entry.
+
+    Matches export_tree except that the LOD chain stops at the last mesh
+    level: the billboard impostor needs a Cycles render.
+    """
+    name, _, material_args = SPECIES[species]
+    materials = [pbr_material(mat_name, color, **params) for mat_name, color, params in material_args]
+    buffers, atlas = build_tree_buffers(species, rng, cards, card_cell_size)
+    if atlas is not None:
+        materials.append(pbr_material(name + "FoliageCards", (1.0, 1.0, 1.0, 1.0), _card_roughness(material_args),
+                                      base_color_texture=atlas.color_png(), normal_texture=atlas.normal_png(),
+                                      alpha_cutoff=ALPHA_CUTOFF))
+    positions, faces, material_indices = buffers.arrays()
+    uvs = buffers.uvs() if buffers.has_uvs else None
+    grounded = ground(positions)
+
+    levels = [(grounded, faces, material_indices, uvs)]
+    reductions, lod_distances = select_lods(buffers, lod_budgets or (), lod_distances)
+    for depth, density in reductions:
+        lod_positions, lod_faces, lod_materials, lod_uvs = lod_arrays(buffers, depth, density, uvs=True)
+        lod_positions[:, 2] -= positions[:, 2].min()
+        levels.append((lod_positions, lod_faces, lod_materials, lod_uvs if buffers.has_uvs else None))
+
+    glb = GLBWriter()
+    if lod_budgets is None:
+        glb.add_mesh_node(name, grounded, faces, material_indices=material_indices, materials=materials, uvs=uvs)
+    else:
+        for k, ((level_positions, level_faces, level_materials, level_uvs), (begin, end)) in enumerate(
+                zip(levels, visibility_bands(len(levels), lod_distances))):
+            glb.add_mesh_node(f"{name}_LOD{k}", level_positions, level_faces,
+                              material_indices=level_materials, materials=materials, uvs=level_uvs,
+                              extras={"visibility_range_begin": begin, "visibility_range_end": end})
+    glb.write(filepath)
+
+    stats = {
+        "vertices": len(positions),
+        "faces": len(faces),
+        "height": round(float(grounded[:, 2].max()), 4),
+    }
+    if lod_budgets is not None:
+        stats["lod_triangles"] = [2 * len(level[1]) for level in levels]
+    print(f"Exported {os.path.basename(filepath)}")
+    return stats
+
+
+output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "models", "nature")
+
+
+def export_tree(species, rng, filepath, lod_budgets=None, lod_distances=DEFAULT_LOD_DISTANCES, cards=0,
+                card_cell_size=DEFAULT_CELL_SIZE):
+    """Build one tree in a clean scene and export it; returns its index entry.
+
+    With lod_budgets the whole LOD chain goes into the same GLB, its
+    visibility ranges carried as node extras. With cards the foliage is
+    replaced by that many alpha-tested cards per cluster (foliage_cards).
+    """
+    if bpy is None:
+        return write_tree_glb(species, rng, filepath, lod_budgets, lod_distances, cards, card_cell_size)
+    clear_scene()
+    obj = create_tree(species, rng, cards=cards, card_cell_size=card_cell_size,
+                      lod_budgets=lod_budgets, lod_distances=lod_distances)
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", co)
+    stats = {
+        "vertices": len(obj.data.vertices),
+        "faces": len(obj.data.polygons),
+        "height": round(float(co[2::3].max()), 4),
+    }
+    if lod_budgets is not None:
+        base = obj.name[:-len("_LOD0")]
+        stats["lod_triangles"] = [triangle_count(o) for o in sorted(bpy.data.objects, key=lambda o: o.name)
+                                  if o.type == 'MESH' and o.name.startswith(base + "_LOD")]
+    bpy.ops.object.select_all(action='SELECT')
+    optimize_objects(bpy.context.selected_objects)
+    bpy.ops.export_scene.gltf(
+        filepath=filepath,
+        export_format='GLB', use_selection=True, export_apply=True, export_materials='EXPORT',
+        export_extras=True
+    )
+    print(f"Exported {os.path.basename(filepath)}")
+    return stats
+
+
+def export_tree_cached(cache, species, rng, filepath, **options):
+    """export_tree through the build cache.
+
+    The key covers the species' builder, this script and the shared tree
+    code (minus the other species' builders), its materials, LOD and card
+    settings, and the incoming RNG state; on a hit the RNG is advanced to where the build
+    would have left it, so shared streams stay in step.
+    """
+    name, build, material_args = SPECIES[species]
+    builders = [builder for _, builder, _ in SPECIES.values()]
+    key = asset_key(
+        [build, tree_mesh, glb_writer, lod_module, bulk_mesh, mesh_optimize, foliage_cards, __file__],
+        params={"species": species, "name": name, "materials": material_args, **options},
+        seed=random_state_to_json(rng.getstate()), exclude=builders)
+    meta = cache.restore(key, [filepath])
+    if meta is not None:
+        rng.setstate(random_state_from_json(meta["rng_state"]))
+        return meta["stats"]
+
+    meta = {}
+    with cache.stage(key, [filepath], meta) as (staged,):
+        meta["stats"] = export_tree(species, rng, staged, **options)
+        meta["rng_state"] = random_state_to_json(rng.getstate())
+    return meta["stats"]
+
+
+def export_default_trees(out_dir, cache, seed=42, **options):
+    """The classic one-oak, one-pine, one-birch set from a single seeded stream."""
+    rng = random.Random(seed)
+    for species in ("oak", "pine", "birch"):
+        export_tree_cached(cache, species, rng, os.path.join(out_dir, f"{species}_tree.glb"), **options)
+
+
+def export_variants(jobs, out_dir, cache, **options):
+    """Export (species, variant, seed) jobs in this process, each from its own RNG."""
+    entries = []
+    for species, variant, seed in jobs:
+        filename = f"{species}_tree_{variant:03d}.glb"
+        stats = export_tree_cached(cache, species, random.Random(seed), os.path.join(out_dir, filename), **options)
+        entries.append({"species": species, "variant": variant, "seed": seed, "file": filename, **stats})
+    return entries
+
+
+def export_variant_shard(jobs, out_dir, use_cache=True, **options):
+    """export_variants entry point for pool workers: plain JSON arguments in and out."""
+    return export_variants([tuple(job) for job in jobs], out_dir, BuildCache(enabled=use_cache), **options)
+
+
+def run_variant_workers(jobs, out_dir, workers, use_cache=True, **options):
+    """Spread jobs over parallel workers and collect their index entries.
+
+    Inside Blender each variant is a function job on a pool of warm Blender
+    workers; under plain Python the jobs are sharded over subprocesses.
+    """
+    if bpy is not None:
+        with BlenderPool(workers, bpy.app.binary_path) as pool:
+            futures = [pool.submit(__file__, function="export_variant_shard",
+                                   kwargs={"jobs": [job], "out_dir": out_dir, "use_cache": use_cache, **options})
+                       for job in jobs]
+            entries = []
+            for future in futures:
+                result = future.result()
+                if not result["ok"]:
+                    raise RuntimeError(f"Tree worker failed:\n{result['output']}{result['error']}")
+                entries.extend(result["result"])
+        return entries
+
+    worker_args = [] if use_cache else ["--no-cache"]
+    if "lod_budgets" in options:
+        worker_args += ["--lods", "--lod-budgets", ",".join(map(str, options["lod_budgets"])),
+                        "--lod-distances", ",".join(map(str, options["lod_distances"]))]
+    if options.get("cards"):
+        worker_args += ["--cards", "--card-count", str(options["cards"]),
+                        "--card-cell-size", str(options["card_cell_size"])]
+    shards = [jobs[i::workers] for i in range(workers)]
+    shards = [shard for shard in shards if shard]
+    with tempfile.TemporaryDirectory() as tmp:
+        procs = []
+        for i, shard in enumerate(shards):
+            shard_path = os.path.join(tmp, f"shard_{i}.json")
+            with open(shard_path, "w") as f:
+                json.dump(shard, f)
+            cmd = [sys.executable, os.path.abspath(__file__), "--",
+                   "--output-dir", out_dir, "--worker-shard", shard_path, *worker_args]
+            procs.append((shard_path, subprocess.Popen(cmd, stdout=subprocess.DEVNULL)))
+
+        entries = []
+        for shard_path, proc in procs:
+            if proc.wait() != 0:
+                raise RuntimeError(f"Tree worker for {shard_path} failed with exit code {proc.returncode}")
+            with open(shard_path + ".out") as f:
+                entries.extend(json.load(f))
+    return entries
+
+
+def main():
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = sys.argv[1:] if bpy is None else []
+    parser = argparse.ArgumentParser(description="Generate procedural tree GLBs "
+                                                 "(in Blender, or with glb_writer under plain Python).")
+    parser.add_argument("--species", type=lambda s: s.split(","), default=None,
+                        help=f"comma-separated species for batch mode ({', '.join(SPECIES)})")
+    parser.add_argument("--variants", type=int, default=1, help="variants per species in batch mode")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the default oak/pine/birch set")
+    parser.add_argument("--seed-start", type=int, default=0, help="seed of variant 0; variant k uses seed-start + k")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="parallel workers (warm Blender processes, or Python subprocesses) for batch mode")
+    parser.add_argument("--output-dir", default=output_dir)
+    parser.add_argument("--lods", action="store_true",
+                        help="export LOD0-LOD2 meshes plus an LOD3 billboard impostor in each GLB")
+    parser.add_argument("--lod-budgets", type=lambda s: [float(v) for v in s.split(",")],
+                        default=list(DEFAULT_LOD_BUDGETS),
+                        help="triangle budgets of the reduced mesh LODs, as fractions of LOD0's")
+    parser.add_argument("--lod-distances", type=lambda s: [float(v) for v in s.split(",")],
+                        default=list(DEFAULT_LOD_DISTANCES),
+                        help="distances (m) where each following LOD takes over")
+    parser.add_argument("--cards", action="store_true",
+                        help="replace leaf and needle clusters with alpha-tested cards baked into an atlas")
+    parser.add_argument("--card-count", type=int, choices=(2, 3), default=DEFAULT_CARDS,
+                        help="crossed cards per foliage cluster")
+    parser.add_argument("--card-cell-size", type=int, default=DEFAULT_CELL_SIZE,
+                        help="atlas cell size (px) of each baked card")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="rebuild every tree instead of reusing unchanged ones from the build cache")
+    parser.add_argument("--worker-shard", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    cache = BuildCache(enabled=not args.no_cache)
+    options = {}
+    if args.lods:
+        if len(args.lod_distances) != len(args.lod_budgets) + 1:
+            parser.error("--lod-distances needs one more entry than --lod-budgets")
+        options = {"lod_budgets": args.lod_budgets, "lod_distances": args.lod_distances}
+    if args.cards:
+        if args.card_cell_size < 4:
+            parser.error("--card-cell-size must be at least 4")
+        options.update(cards=args.card_count, card_cell_size=args.card_cell_size)
+
+    if args.worker_shard:
+        with open(args.worker_shard) as f:
+            jobs = [tuple(job) for job in json.load(f)]
+        with open(args.worker_shard + ".out", "w") as f:
+            json.dump(export_variants(jobs, args.output_dir, cache, **options), f)
+        return
+
+    if not args.species:
+        export_default_trees(args.output_dir, cache, args.seed, **options)
+        return
+
+    unknown = set(args.species) - set(SPECIES)
+    if unknown:
+        parser.error(f"unknown species: {', '.join(sorted(unknown))}")
+    jobs = [(species, k, args.seed_start + k) for species in args.species for k in range(args.variants)]
+    if args.jobs > 1 and len(jobs) > 1:
+        entries = run_variant_workers(jobs, args.output_dir, min(args.jobs, len(jobs)),
+                                      use_cache=not args.no_cache, **options)
+    else:
+        entries = export_variants(jobs, args.output_dir, cache, **options)
+    entries.sort(key=lambda e: (e["species"], e["variant"]))
+
+    index_path = os.path.join(args.output_dir, "tree_variants.json")
+    write_if_changed(index_path, json.dumps({"variants": entries}, indent=2))
+    print(f"Exported {len(entries)} tree variants, index: {index_path}")
+
+
+if __name__ == "__main__":
+    main()
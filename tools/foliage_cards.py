@@ -0,0 +1,348 @@
+"""
+Foliage card baking: leaf and needle clusters replaced by crossed, alpha-tested cards.
+
+tree_mesh tags every foliage face with a cluster (the leaves of one cluster,
+the needle strip of one pine branch, one birch strand). Neighbouring
+clusters are merged until each group holds at least min_faces quads, and
+each group is replaced by 2 or 3 cards crossing at its centroid. Elongated
+or flat groups (pine branches) fan their cards about their longest
+principal axis, the first one facing the thinnest direction so it shows
+the most needle area. Round groups get two upright cards at right angles,
+the first facing their thinnest horizontal direction, plus a level one
+as the third, so the canopy also keeps its outline seen from above.
+
+Each card is baked by rasterizing the group's own leaf quads
+orthographically onto it (2x supersampled, z-buffered) into one atlas
+cell: base color with coverage as alpha, and a tangent-space normal map of
+the leaves' orientation. The card material alpha-tests the atlas (glTF
+alphaMode MASK), so the canopy keeps its silhouette with a fraction of the
+triangles.
+
+The bake is pure Python + NumPy (encode_png writes the atlas images for
+glb_writer); card_material builds the Blender material from the same
+pixels.
+"""
+
+import math
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+from tree_mesh import MeshBuffers
+
+DEFAULT_CARDS = 3
+DEFAULT_CELL_SIZE = 64
+DEFAULT_MIN_FACES = 16
+SUPERSAMPLE = 2
+ALPHA_CUTOFF = 0.5
+# Principal variance ratio above which a group's cards follow its own axis instead of world Z
+ANISOTROPY = 3.0
+# Minimum card side as a fraction of its longer side, so edge-on cards keep some area
+MIN_ASPECT = 0.1
+
+
+class CardAtlas:
+    """Baked atlas: color (H, W, 4) linear RGBA and normal (H, W, 3) in [-1, 1], row 0 at the top."""
+
+    def __init__(self, color, normal, columns, rows, cell_size):
+        self.color = color
+        self.normal = normal
+        self.columns = columns
+        self.rows = rows
+        self.cell_size = cell_size
+
+    def color_png(self):
+        """Base color + alpha as an sRGB PNG."""
+        return encode_png(to_bytes(np.concatenate([linear_to_srgb(self.color[..., :3]), self.color[..., 3:]], axis=-1)))
+
+    def normal_png(self):
+        """Tangent-space normal map as a PNG (OpenGL convention, +Y up in UV space)."""
+        return encode_png(to_bytes(self.normal * 0.5 + 0.5))
+
+
+# ========== IMAGES ==========
+def linear_to_srgb(values):
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1.0 / 2.4) - 0.055)
+
+
+def to_bytes(values):
+    return np.round(np.clip(values, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+def encode_png(pixels):
+    """Encode (H, W, 3 or 4) uint8 pixels, row 0 at the top, as PNG bytes."""
+    height, width, channels = pixels.shape
+    color_type = {3: 2, 4: 6}[channels]
+    # Filter type 0 (None) in front of every scanline
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, -1)], axis=1)
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 9)) + chunk(b"IEND", b""))
+
+
+# ========== GROUPS ==========
+def group_clusters(positions, faces, clusters, min_faces=DEFAULT_MIN_FACES):
+    """Merge foliage clusters into groups of at least min_faces faces; returns a group id per cluster.
+
+    The smallest group is repeatedly merged into the group with the nearest
+    centroid, so groups stay spatially compact.
+    """
+    ids = np.unique(clusters)
+    centroids = np.array([positions[faces[clusters == c]].reshape(-1, 3).mean(axis=0) for c in ids])
+    counts = np.array([np.count_nonzero(clusters == c) for c in ids], dtype=np.float64)
+    members = [[i] for i in range(len(ids))]
+    while len(members) > 1 and counts.min() < min_faces:
+        small = int(np.argmin(counts))
+        distance = np.linalg.norm(centroids - centroids[small], axis=1)
+        distance[small] = np.inf
+        near = int(np.argmin(distance))
+        total = counts[small] + counts[near]
+        centroids[near] = (centroids[near] * counts[near] + centroids[small] * counts[small]) / total
+        counts[near] = total
+        members[near] += members[small]
+        centroids = np.delete(centroids, small, axis=0)
+        counts = np.delete(counts, small)
+        del members[small]
+    group = np.empty(len(ids), dtype=np.int64)
+    for g, indices in enumerate(members):
+        group[indices] = g
+    return dict(zip(ids.tolist(), group.tolist()))
+
+
+def _perpendicular_basis(axis):
+    helper = np.array([1.0, 0.0, 0.0]) if abs(axis[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    u = np.cross(axis, helper)
+    u /= np.linalg.norm(u)
+    return u, np.cross(axis, u)
+
+
+def card_frames(points, cards):
+    """(center, axis, normal, tangent) of each card for a group of points."""
+    center = points.mean(axis=0)
+    offsets = points - center
+    covariance = offsets.T @ offsets / max(len(points), 1)
+    values, vectors = np.linalg.eigh(covariance)
+    values = np.maximum(values, 1e-12)
+    elongated = values[2] > ANISOTROPY * values[1] or values[1] > ANISOTROPY * values[0]
+    axis = vectors[:, 2] if elongated else np.array([0.0, 0.0, 1.0])
+    u, w = _perpendicular_basis(axis)
+    basis = np.stack([u, w], axis=1)
+    _, across = np.linalg.eigh(basis.T @ covariance @ basis)
+    e1 = basis @ across[:, 0]
+    e1 /= np.linalg.norm(e1)
+    e2 = np.cross(axis, e1)
+
+    if elongated:
+        angles = [k * math.pi / cards for k in range(cards)]
+    else:
+        angles = [k * math.pi / 2 for k in range(min(cards, 2))]
+    frames = []
+    for theta in angles:
+        normal = math.cos(theta) * e1 + math.sin(theta) * e2
+        frames.append((center, axis, normal, np.cross(axis, normal)))
+    if not elongated and cards > 2:
+        # Level card: up is e2, facing +Z
+        frames.append((center, e2, axis, np.cross(e2, axis)))
+    return frames
+
+
+# ========== BAKE ==========
+def _rasterize(tris, depth, colors, normals, width, height):
+    """Z-buffered rasterization of pixel-space triangles (T, 3, 2); returns coverage, color, normal buffers."""
+    zbuffer = np.full((height, width), -np.inf)
+    color = np.zeros((height, width, 3))
+    normal = np.zeros((height, width, 3))
+    for tri, z, tri_color, tri_normal in zip(tris, depth, colors, normals):
+        x0, y0 = np.floor(tri.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(tri.max(axis=0)).astype(int)
+        x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        px, py = np.meshgrid(np.arange(x0, x1) + 0.5, np.arange(y0, y1) + 0.5)
+        (ax, ay), (bx, by), (cx, cy) = tri
+        area = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+        if abs(area) < 1e-12:
+            continue
+        w0 = ((bx - px) * (cy - py) - (by - py) * (cx - px)) / area
+        w1 = ((cx - px) * (ay - py) - (cy - py) * (ax - px)) / area
+        w2 = 1.0 - w0 - w1
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+        pixel_depth = w0 * z[0] + w1 * z[1] + w2 * z[2]
+        region = zbuffer[y0:y1, x0:x1]
+        nearer = inside & (pixel_depth > region)
+        region[nearer] = pixel_depth[nearer]
+        color[y0:y1, x0:x1][nearer] = tri_color
+        normal[y0:y1, x0:x1][nearer] = tri_normal
+    return np.isfinite(zbuffer), color, normal
+
+
+def bake_card(tris, tri_colors, frame, cell_size):
+    """Bake one card of a group; returns (corners (4, 3), color (cell, cell, 4), normal (cell, cell, 3)).
+
+    frame is (center, axis, normal, tangent). Corners run counter-clockwise
+    seen from +normal, starting at the card's lower left.
+    """
+    center, axis, card_normal, tangent = frame
+    offsets = tris - center
+    s, h, d = offsets @ tangent, offsets @ axis, offsets @ card_normal
+    s_lo, s_hi = s.min(), s.max()
+    h_lo, h_hi = h.min(), h.max()
+    # Keep edge-on cards from collapsing to a line
+    side = max(s_hi - s_lo, h_hi - h_lo, 1e-6)
+    grow_s = max(0.0, MIN_ASPECT * side - (s_hi - s_lo)) * 0.5
+    grow_h = max(0.0, MIN_ASPECT * side - (h_hi - h_lo)) * 0.5
+    s_lo, s_hi, h_lo, h_hi = s_lo - grow_s, s_hi + grow_s, h_lo - grow_h, h_hi + grow_h
+
+    # Card edges land on the outer texel centers, matching the half-texel UV inset
+    size = cell_size * SUPERSAMPLE
+    scale = (cell_size - 1) * SUPERSAMPLE
+    px = SUPERSAMPLE * 0.5 + (s - s_lo) / (s_hi - s_lo) * scale
+    py = SUPERSAMPLE * 0.5 + (h_hi - h) / (h_hi - h_lo) * scale
+
+    leaf_normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    leaf_normals /= np.maximum(np.linalg.norm(leaf_normals, axis=1, keepdims=True), 1e-12)
+    # Leaves are double sided: always show the side facing the card's viewer
+    leaf_normals *= np.where(leaf_normals @ card_normal < 0.0, -1.0, 1.0)[:, None]
+    tangent_normals = np.stack([leaf_normals @ tangent, leaf_normals @ axis, leaf_normals @ card_normal], axis=-1)
+    # Darken leaves seen edge-on and those behind the group center, like self-shadowing
+    facing = 0.75 + 0.25 * tangent_normals[:, 2]
+    depth_shade = 0.85 + 0.15 * np.clip(d.mean(axis=1) / max(np.abs(d).max(), 1e-6), -1.0, 1.0)
+    shaded = tri_colors * (facing * depth_shade)[:, None]
+
+    coverage, color, normal = _rasterize(np.stack([px, py], axis=-1), d, shaded, tangent_normals, size, size)
+
+    # Box-filter the supersamples, averaging color and normal over covered samples only
+    def reduce(values):
+        return values.reshape(cell_size, SUPERSAMPLE, cell_size, SUPERSAMPLE, -1).sum(axis=(1, 3))
+
+    weight = reduce(coverage[..., None].astype(np.float64))
+    alpha = weight[..., 0] / SUPERSAMPLE ** 2
+    covered = weight[..., 0] > 0
+    mean_color = shaded.mean(axis=0) if len(shaded) else np.zeros(3)
+    cell_color = np.where(covered[..., None], reduce(color * coverage[..., None]) / np.maximum(weight, 1), mean_color)
+    cell_normal = np.where(covered[..., None], reduce(normal * coverage[..., None]), [0.0, 0.0, 1.0])
+    cell_normal /= np.maximum(np.linalg.norm(cell_normal, axis=-1, keepdims=True), 1e-12)
+
+    corners = center + np.array([s_lo, s_hi, s_hi, s_lo])[:, None] * tangent \
+        + np.array([h_lo, h_lo, h_hi, h_hi])[:, None] * axis
+    return corners, np.concatenate([cell_color, alpha[..., None]], axis=-1), cell_normal
+
+
+def bake_cards(buffers, colors, cards=DEFAULT_CARDS, cell_size=DEFAULT_CELL_SIZE, min_faces=DEFAULT_MIN_FACES,
+               material_index=None):
+    """Replace a tree's foliage with baked cards; returns (new MeshBuffers, CardAtlas).
+
+    colors are the linear RGBA base colors of the tree's material slots. The
+    cards use material_index (default: one past the last slot) and carry
+    UVs into the atlas; branch faces are copied unchanged.
+    """
+    if cards < 1:
+        raise ValueError("cards must be at least 1")
+    positions, faces, mats = buffers.arrays()
+    depth, foliage = buffers.face_tags()
+    clusters = buffers.face_clusters()
+    uvs = buffers.uvs()
+    material_index = len(colors) if material_index is None else material_index
+    colors = np.asarray(colors, dtype=np.float64)[:, :3]
+
+    result = MeshBuffers()
+    branch = ~foliage
+    used, remap = np.unique(faces[branch], return_inverse=True)
+    result.add(positions[used], remap.reshape(-1, 4), mats[branch], depth=depth[branch],
+               uvs=uvs[used] if buffers.has_uvs else None)
+
+    # Foliage without a cluster tag becomes one cluster per face
+    clusters = clusters.copy()
+    loose = foliage & (clusters < 0)
+    clusters[loose] = clusters.max(initial=-1) + 1 + np.arange(np.count_nonzero(loose))
+    foliage_faces = np.flatnonzero(foliage)
+    if not len(foliage_faces):
+        return result, CardAtlas(np.zeros((1, 1, 4)), np.tile([0.0, 0.0, 1.0], (1, 1, 1)), 1, 1, 1)
+    group_of = group_clusters(positions, faces[foliage_faces], clusters[foliage_faces], min_faces)
+    face_group = np.array([group_of[c] for c in clusters[foliage_faces].tolist()])
+    group_count = max(group_of.values()) + 1
+
+    cell_count = group_count * cards
+    columns = math.ceil(math.sqrt(cell_count))
+    rows = math.ceil(cell_count / columns)
+    width, height = columns * cell_size, rows * cell_size
+    atlas_color = np.zeros((height, width, 4))
+    atlas_normal = np.tile([0.0, 0.0, 1.0], (height, width, 1))
+
+    card_positions, card_uvs, card_groups = [], [], []
+    for g in range(group_count):
+        group_faces = foliage_faces[face_group == g]
+        quads = positions[faces[group_faces]]
+        tris = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+        tri_colors = np.tile(colors[mats[group_faces]], (2, 1))
+        for k, frame in enumerate(card_frames(quads.reshape(-1, 3), cards)):
+            corners, cell_color, cell_normal = bake_card(tris, tri_colors, frame, cell_size)
+            row, column = divmod(g * cards + k, columns)
+            y, x = row * cell_size, column * cell_size
+            atlas_color[y:y + cell_size, x:x + cell_size] = cell_color
+            atlas_normal[y:y + cell_size, x:x + cell_size] = cell_normal
+
+            # Blender UVs (v up), inset half a texel so filtering stays inside the cell
+            u0, u1 = (x + 0.5) / width, (x + cell_size - 0.5) / width
+            v0, v1 = 1.0 - (y + cell_size - 0.5) / height, 1.0 - (y + 0.5) / height
+            card_positions.append(corners)
+            card_uvs.append([(u0, v0), (u1, v0), (u1, v1), (u0, v1)])
+            card_groups.append(g)
+
+    card_count = len(card_positions)
+    result.add(np.concatenate(card_positions), np.arange(card_count * 4).reshape(-1, 4), material_index,
+               foliage=True, cluster=np.array(card_groups), uvs=np.concatenate(card_uvs))
+    return result, CardAtlas(atlas_color, atlas_normal, columns, rows, cell_size)
+
+
+# ========== BLENDER ==========
+def _packed_image(name, pixels, non_color=False):
+    height, width, channels = pixels.shape
+    if channels == 3:
+        pixels = np.concatenate([pixels, np.ones((height, width, 1))], axis=-1)
+    image = bpy.data.images.new(name, width, height, alpha=True)
+    if non_color:
+        image.colorspace_settings.name = 'Non-Color'
+    # Blender images store rows bottom-up
+    image.pixels.foreach_set(np.ascontiguousarray(pixels[::-1], dtype=np.float32).ravel())
+    image.pack()
+    return image
+
+
+def card_material(name, atlas, roughness=0.9):
+    """Alpha-clipped material sampling the atlas color, alpha and normal map."""
+    color = np.concatenate([linear_to_srgb(atlas.color[..., :3]), atlas.color[..., 3:]], axis=-1)
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    bsdf = nodes.get("Principled BSDF")
+    bsdf.inputs["Roughness"].default_value = roughness
+    tex = nodes.new("ShaderNodeTexImage")
+    tex.image = _packed_image(name + "Color", color)
+    normal_tex = nodes.new("ShaderNodeTexImage")
+    normal_tex.image = _packed_image(name + "Normal", atlas.normal * 0.5 + 0.5, non_color=True)
+    normal_map = nodes.new("ShaderNodeNormalMap")
+    # Math Round on alpha is exported as glTF alphaMode MASK with cutoff 0.5
+    clip = nodes.new("ShaderNodeMath")
+    clip.operation = 'ROUND'
+    links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
+    links.new(tex.outputs["Alpha"], clip.inputs[0])
+    links.new(clip.outputs["Value"], bsdf.inputs["Alpha"])
+    links.new(normal_tex.outputs["Color"], normal_map.inputs["Color"])
+    links.new(normal_map.outputs["Normal"], bsdf.inputs["Normal"])
+    if hasattr(mat, "blend_method"):
+        mat.blend_method = 'CLIP'
+    return mat
@@ -0,0 +1,388 @@
+"""
+Minimal GLB writer for the procedural generators.
+
+Writes binary glTF 2.0 straight from NumPy buffers, without Blender: one
+buffer, 4-byte aligned bufferViews, accessors with min/max, metallic-roughness
+materials built from the same parameters as the scripts' make_mat, and one
+primitive per material group. Generators keep working in Blender's Z-up
+space; positions, normals and node translations are converted to glTF's Y-up
+(+Z = Blender -Y) on the way out. Every mesh goes through
+mesh_optimize.optimize_triangles (weld, degenerate/duplicate removal, vertex
+cache order) unless the writer is made with optimize=False. Skinned meshes get JOINTS_0/WEIGHTS_0 and a
+skin whose joints are nodes at the bones' rest heads (see add_skin). UVs
+are given v-up like Blender's and flipped to glTF's v-down; PNG textures
+passed to pbr_material are embedded in the buffer.
+
+Pure Python + NumPy:
+    from glb_writer import GLBWriter, pbr_material
+    glb = GLBWriter()
+    glb.add_mesh_node("Rock", positions, faces, materials=[pbr_material("Rock", (0.4, 0.4, 0.4, 1.0))])
+    glb.write("rock.glb")
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from mesh_optimize import format_report, optimize_triangles
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+ACCESSOR_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4", 16: "MAT4"}
+
+GENERATOR = "athena-saga glb_writer"
+
+
+def to_gltf_axes(vectors):
+    """Blender Z-up (x, y, z) -> glTF Y-up (x, z, -y)."""
+    vectors = np.asarray(vectors, dtype=np.float64)
+    return np.stack([vectors[..., 0], vectors[..., 2], -vectors[..., 1]], axis=-1)
+
+
+def pbr_material(name, color, roughness=0.85, subsurface=0.0, subsurface_color=None, metallic=0.0,
+                 emission_color=None, emission_strength=0.0, base_color_texture=None, normal_texture=None,
+                 alpha_cutoff=None):
+    """glTF material equivalent to make_mat(name, color, roughness, ...).
+
+    The Blender exporter writes the Principled BSDF defaults (double sided)
+    and has no core glTF slot for subsurface, so the subsurface parameters
+    are accepted for signature parity and dropped. Emission stronger than 1
+    goes to KHR_materials_emissive_strength, as the exporter does.
+    base_color_texture and normal_texture are PNG bytes (sampled with
+    TEXCOORD_0); with alpha_cutoff the base color alpha is alpha-tested
+    (alphaMode MASK).
+    """
+    material = {
+        "name": name,
+        "pbrMetallicRoughness": {
+            "baseColorFactor": [float(c) for c in color],
+            "metallicFactor": float(metallic),
+            "roughnessFactor": float(roughness),
+        },
+        "doubleSided": True,
+    }
+    if emission_color and emission_strength > 0.0:
+        material["emissiveFactor"] = [float(c) for c in emission_color[:3]]
+        if emission_strength != 1.0:
+            material["extensions"] = {"KHR_materials_emissive_strength": {"emissiveStrength": float(emission_strength)}}
+    # Texture infos hold the PNG bytes until GLBWriter.add_material embeds them
+    if base_color_texture is not None:
+        material["pbrMetallicRoughness"]["baseColorTexture"] = {"png": base_color_texture}
+    if normal_texture is not None:
+        material["normalTexture"] = {"png": normal_texture}
+    if alpha_cutoff is not None:
+        material["alphaMode"] = "MASK"
+        material["alphaCutoff"] = float(alpha_cutoff)
+    return material
+
+
+def triangulate(faces, face_sizes=None):
+    """Fan-triangulate faces into (T, 3) indices plus each triangle's source face.
+
+    faces is either a uniform (F, k) array or a flat index array with
+    per-face face_sizes, as accepted by bulk_mesh.mesh_from_arrays.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    if face_sizes is None:
+        faces = faces.reshape(len(faces), -1)
+        k = faces.shape[1]
+        fan = np.stack([np.zeros(k - 2, dtype=np.int64), np.arange(1, k - 1), np.arange(2, k)], axis=-1)
+        tris = faces[:, fan].reshape(-1, 3)
+        return tris, np.repeat(np.arange(len(faces)), k - 2)
+
+    face_sizes = np.asarray(face_sizes, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(face_sizes)[:-1]])
+    source = np.repeat(np.arange(len(face_sizes)), face_sizes - 2)
+    # Corner j of each fan triangle: (first, first + j + 1, first + j + 2)
+    offset = np.arange(len(source)) - np.repeat(np.cumsum(face_sizes - 2) - (face_sizes - 2), face_sizes - 2)
+    first = starts[source]
+    tris = np.stack([faces[first], faces[first + offset + 1], faces[first + offset + 2]], axis=-1)
+    return tris, source
+
+
+def vertex_normals(positions, tris):
+    """Area-weighted smooth vertex normals (close to Blender's shade_smooth)."""
+    positions = np.asarray(positions, dtype=np.float64)
+    face_normals = np.cross(positions[tris[:, 1]] - positions[tris[:, 0]],
+                            positions[tris[:, 2]] - positions[tris[:, 0]])
+    normals = np.zeros_like(positions)
+    for corner in range(3):
+        np.add.at(normals, tris[:, corner], face_normals)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, length, out=np.tile([0.0, 0.0, 1.0], (len(normals), 1)), where=length > 0)
+
+
+class GLBWriter:
+    """Accumulates glTF JSON and one binary buffer, then writes a .glb.
+
+    With optimize, add_mesh welds and reorders each mesh and prints its
+    mesh_optimize report; the reports are also kept in self.reports.
+    """
+
+    def __init__(self, optimize=True):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": GENERATOR},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+        }
+        self._bin = bytearray()
+        self._materials = {}
+        self.optimize = optimize
+        self.reports = {}
+
+    def add_buffer_view(self, data, target=None):
+        """Append raw bytes 4-byte aligned; returns the bufferView index."""
+        self._bin.extend(b"\0" * (-len(self._bin) % 4))
+        view = {"buffer": 0, "byteOffset": len(self._bin), "byteLength": len(data)}
+        if target is not None:
+            view["target"] = target
+        self._bin.extend(data)
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(self, array, target=None):
+        """Store an (N,) or (N, k) array as a tightly packed accessor with min/max."""
+        array = np.ascontiguousarray(array)
+        if array.dtype not in COMPONENT_TYPES:
+            raise ValueError(f"Unsupported accessor dtype: {array.dtype}")
+        columns = 1 if array.ndim == 1 else array.shape[1]
+        rows = array.reshape(len(array), columns)
+        accessor = {
+            "bufferView": self.add_buffer_view(array.astype(array.dtype.newbyteorder("<")).tobytes(), target),
+            "componentType": COMPONENT_TYPES[array.dtype],
+            "count": len(array),
+            "type": ACCESSOR_TYPES[columns],
+        }
+        if len(array):
+            cast = float if array.dtype.kind == "f" else int
+            accessor["min"] = [cast(v) for v in rows.min(axis=0)]
+            accessor["max"] = [cast(v) for v in rows.max(axis=0)]
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def add_texture(self, png, name=None):
+        """Embed PNG bytes as an image with a repeating, mipmapped sampler; returns the texture index."""
+        image = {"bufferView": self.add_buffer_view(png), "mimeType": "image/png"}
+        if name:
+            image["name"] = name
+        self.gltf.setdefault("images", []).append(image)
+        samplers = self.gltf.setdefault("samplers", [])
+        if not samplers:
+            samplers.append({"magFilter": 9729, "minFilter": 9987})  # LINEAR, LINEAR_MIPMAP_LINEAR
+        self.gltf.setdefault("textures", []).append({"sampler": 0, "source": len(self.gltf["images"]) - 1})
+        return len(self.gltf["textures"]) - 1
+
+    def add_material(self, material):
+        """Add a pbr_material dict once per name; returns its index."""
+        name = material["name"]
+        if name not in self._materials:
+            for extension in material.get("extensions", {}):
+                if extension not in self.gltf.setdefault("extensionsUsed", []):
+                    self.gltf["extensionsUsed"].append(extension)
+            material = dict(material, pbrMetallicRoughness=dict(material["pbrMetallicRoughness"]))
+            for owner, key, suffix in ((material["pbrMetallicRoughness"], "baseColorTexture", "Color"),
+                                       (material, "normalTexture", "Normal")):
+                if key in owner:
+                    owner[key] = {"index": self.add_texture(owner[key]["png"], name + suffix)}
+            self.gltf["materials"].append(material)
+            self._materials[name] = len(self.gltf["materials"]) - 1
+        return self._materials[name]
+
+    def add_mesh(self, name, positions, faces, face_sizes=None, material_indices=None,
+                 materials=(), normals=None, smooth=True, morph_targets=None, joints=None, weights=None,
+                 uvs=None):
+        """Add a mesh given Blender-space arrays; returns the mesh index.
+
+        Vertex attributes are shared by all primitives, which only differ in
+        their index accessor and material. With smooth=False every triangle
+        gets its own vertices and face normal. normals, if given, are
+        per-vertex (like mesh_from_arrays' custom normals). morph_targets is
+        a {name: positions} dict of shapes with the same vertices (like
+        shape keys); each becomes a POSITION/NORMAL delta target. joints and
+        weights are per-vertex (N, 4) skin influences (indices into the skin's
+        joint list), written as JOINTS_0/WEIGHTS_0. uvs are per-vertex (N, 2)
+        with v up, written as TEXCOORD_0.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        tris, source = triangulate(faces, face_sizes)
+        groups = (np.zeros(len(tris), dtype=np.int64) if material_indices is None
+                  else np.asarray(material_indices, dtype=np.int64)[source])
+        if normals is not None:
+            normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+
+        if self.optimize:
+            attributes = {key: value for key, value in (("normal", normals), ("joints", joints),
+                                                        ("weights", weights), ("uv", uvs)) if value is not None}
+            optimized = optimize_triangles(positions, tris, groups, vertex_attributes=attributes,
+                                           shapes=morph_targets)
+            positions, tris, groups = optimized.positions, optimized.tris, optimized.materials
+            normals = optimized.vertex_attributes.get("normal")
+            joints = optimized.vertex_attributes.get("joints")
+            weights = optimized.vertex_attributes.get("weights")
+            uvs = optimized.vertex_attributes.get("uv")
+            if morph_targets:
+                morph_targets = optimized.shapes
+            self.reports[name] = optimized.report
+            print(format_report(name, optimized.report))
+
+        if normals is None and smooth:
+            normals = vertex_normals(positions, tris)
+        elif normals is None:
+            if morph_targets or joints is not None:
+                raise ValueError("morph targets and skins need shared vertices (smooth=True or explicit normals)")
+            corners = positions[tris]
+            flat = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            flat /= np.maximum(np.linalg.norm(flat, axis=1, keepdims=True), 1e-12)
+            positions = corners.reshape(-1, 3)
+            normals = np.repeat(flat, 3, axis=0)
+            if uvs is not None:
+                uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)[tris].reshape(-1, 2)
+            tris = np.arange(len(positions)).reshape(-1, 3)
+
+        attributes = {
+            "POSITION": self.add_accessor(to_gltf_axes(positions).astype(np.float32), ARRAY_BUFFER),
+            "NORMAL": self.add_accessor(to_gltf_axes(normals).astype(np.float32), ARRAY_BUFFER),
+        }
+        if uvs is not None:
+            uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)
+            attributes["TEXCOORD_0"] = self.add_accessor(np.stack([uvs[:, 0], 1.0 - uvs[:, 1]], axis=-1)
+                                                         .astype(np.float32), ARRAY_BUFFER)
+        if joints is not None:
+            attributes["JOINTS_0"] = self.add_accessor(np.asarray(joints).reshape(-1, 4), ARRAY_BUFFER)
+            attributes["WEIGHTS_0"] = self.add_accessor(np.asarray(weights, dtype=np.float32).reshape(-1, 4),
+                                                        ARRAY_BUFFER)
+        targets = []
+        for shape in (morph_targets or {}).values():
+            shape = np.asarray(shape, dtype=np.float64).reshape(-1, 3)
+            if shape.shape != positions.shape:
+                raise ValueError(f"morph target of {name} has {len(shape)} vertices, mesh has {len(positions)}")
+            targets.append({
+                "POSITION": self.add_accessor(to_gltf_axes(shape - positions).astype(np.float32), ARRAY_BUFFER),
+                "NORMAL": self.add_accessor(to_gltf_axes(vertex_normals(shape, tris) - normals).astype(np.float32),
+                                            ARRAY_BUFFER),
+            })
+        index_dtype = np.uint16 if len(positions) < 0xFFFF else np.uint32
+        primitives = []
+        for group in np.unique(groups):
+            primitive = {
+                "attributes": attributes,
+                "indices": self.add_accessor(tris[groups == group].ravel().astype(index_dtype),
+                                             ELEMENT_ARRAY_BUFFER),
+                "mode": 4,
+            }
+            if group < len(materials):
+                primitive["material"] = self.add_material(materials[group])
+            if targets:
+                primitive["targets"] = targets
+            primitives.append(primitive)
+
+        mesh = {"name": name, "primitives": primitives}
+        if targets:
+            mesh["weights"] = [0.0] * len(targets)
+            mesh["extras"] = {"targetNames": list(morph_targets)}
+        self.gltf["meshes"].append(mesh)
+        return len(self.gltf["meshes"]) - 1
+
+    def add_node(self, name, mesh=None, location=None, extras=None, parent=None, skin=None):
+        """Add a node (Blender-space location) under parent or the scene root."""
+        node = {"name": name}
+        if mesh is not None:
+            node["mesh"] = mesh
+        if skin is not None:
+            node["skin"] = skin
+        if location is not None and any(location):
+            node["translation"] = [float(v) for v in to_gltf_axes(location)]
+        if extras:
+            node["extras"] = extras
+        self.gltf["nodes"].append(node)
+        index = len(self.gltf["nodes"]) - 1
+        if parent is None:
+            self.gltf["scenes"][0]["nodes"].append(index)
+        else:
+            self.gltf["nodes"][parent].setdefault("children", []).append(index)
+        return index
+
+    def add_mesh_node(self, name, positions, faces, location=None, extras=None, parent=None, skin=None, **kwargs):
+        """add_mesh + add_node, the analogue of bulk_mesh.object_from_arrays."""
+        return self.add_node(name, self.add_mesh(name + "Mesh", positions, faces, **kwargs),
+                             location=location, extras=extras, parent=parent, skin=skin)
+
+    def add_skin(self, name, bones, parent=None):
+        """Add an armature node with one joint node per bone; returns (skin index, armature node index).
+
+        bones are objects with name, head (Blender space, rest pose) and
+        parent (index into bones or None), listed parents first, like
+        auto_rig.Bone. Joints carry no rotation, so each inverse bind matrix
+        is a translation by -head. Parent the skinned mesh node to the
+        returned armature node and pass the skin index to add_node.
+        """
+        armature = self.add_node(name, parent=parent)
+        nodes = []
+        for bone in bones:
+            head = np.asarray(bone.head, dtype=np.float64)
+            if bone.parent is None:
+                nodes.append(self.add_node(bone.name, location=head, parent=armature))
+            else:
+                nodes.append(self.add_node(bone.name, location=head - np.asarray(bones[bone.parent].head),
+                                           parent=nodes[bone.parent]))
+        inverse_binds = np.tile(np.eye(4, dtype=np.float32), (len(bones), 1, 1))
+        inverse_binds[:, 3, :3] = -to_gltf_axes([bone.head for bone in bones])  # column-major translation
+        skin = {"name": name, "joints": nodes, "skeleton": armature,
+                "inverseBindMatrices": self.add_accessor(inverse_binds.reshape(len(bones), 16))}
+        self.gltf.setdefault("skins", []).append(skin)
+        return len(self.gltf["skins"]) - 1, armature
+
+    def to_bytes(self):
+        """Serialize as GLB: header, JSON chunk (space padded), BIN chunk (zero padded)."""
+        gltf = {key: value for key, value in self.gltf.items() if value != []}
+        self._bin.extend(b"\0" * (-len(self._bin) % 4))
+        if self._bin:
+            gltf["buffers"] = [{"byteLength": len(self._bin)}]
+        payload = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+        payload += b" " * (-len(payload) % 4)
+
+        chunks = struct.pack("<II", len(payload), CHUNK_JSON) + payload
+        if self._bin:
+            chunks += struct.pack("<II", len(self._bin), CHUNK_BIN) + bytes(self._bin)
+        return struct.pack("<III", GLB_MAGIC, GLB_VERSION, 12 + len(chunks)) + chunks
+
+    def write(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def read_glb(path):
+    """Return (gltf JSON dict, BIN chunk bytes) of a .glb file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    if magic != GLB_MAGIC or version != GLB_VERSION:
+        raise ValueError(f"Not a glTF 2.0 binary: {path}")
+    json_length, _ = struct.unpack_from("<II", data, 12)
+    gltf = json.loads(data[20:20 + json_length])
+    offset = 20 + json_length
+    binary = b""
+    if offset < length:
+        bin_length, _ = struct.unpack_from("<II", data, offset)
+        binary = data[offset + 8:offset + 8 + bin_length]
+    return gltf, binary
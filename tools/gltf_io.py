@@ -0,0 +1,464 @@
+"""
+Streaming reader for .glb files.
+
+GLBFile parses the header and JSON chunk and leaves the binary chunk on
+disk; accessors and bufferViews are read on demand by seeking to their byte
+range. Pulling the animation samplers out of a 20 MB skinned clip therefore
+touches a few hundred KB instead of the mesh, skin weights and embedded
+textures.
+
+GLTFFile reads a .gltf with data: URI or side-file buffers through the same
+interface; open_gltf() picks the right one.
+
+merge_animations() builds on it to merge clips that share a skeleton
+straight into a base GLB, without Blender and without resampling.
+
+Pure Python + NumPy:
+    from gltf_io import GLBFile, skeleton_animation_glb
+    with GLBFile("Meshy_AI_Animation_Walking_withSkin.glb") as glb:
+        times = glb.read_accessor(glb.gltf["animations"][0]["samplers"][0]["input"])
+        skeleton_animation_glb(glb).write("/tmp/walk_anim_only.glb")
+"""
+
+import base64
+import json
+import os
+import struct
+import sys
+import urllib.parse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from glb_writer import ACCESSOR_TYPES, CHUNK_BIN, CHUNK_JSON, COMPONENT_TYPES, GLB_MAGIC, GLB_VERSION, GLBWriter
+
+COMPONENT_DTYPES = {code: dtype for dtype, code in COMPONENT_TYPES.items()}
+TYPE_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+
+class GLBFile:
+    """An open .glb whose JSON is parsed up front and whose BIN chunk is read lazily."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            magic, version, self.length = struct.unpack("<III", self._file.read(12))
+            if magic != GLB_MAGIC or version != GLB_VERSION:
+                raise ValueError(f"Not a glTF 2.0 binary: {path}")
+            json_length, chunk_type = struct.unpack("<II", self._file.read(8))
+            if chunk_type != CHUNK_JSON:
+                raise ValueError(f"First chunk of {path} is not JSON")
+            self.gltf = json.loads(self._file.read(json_length))
+            self.bin_offset, self.bin_length = None, 0
+            offset = 20 + json_length
+            if offset + 8 <= self.length:
+                self._file.seek(offset)
+                bin_length, chunk_type = struct.unpack("<II", self._file.read(8))
+                if chunk_type == CHUNK_BIN:
+                    self.bin_offset, self.bin_length = offset + 8, bin_length
+        except Exception:
+            self._file.close()
+            raise
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def node_names(self):
+        """Node names by index (unnamed nodes get None)."""
+        return [node.get("name") for node in self.gltf.get("nodes", [])]
+
+    def read_range(self, offset, length, buffer=0):
+        """length bytes starting at offset within the BIN chunk (buffer 0)."""
+        buffers = self.gltf.get("buffers", [])
+        if buffer != 0 or not buffers or "uri" in buffers[0]:
+            raise ValueError(f"buffer {buffer} of {self.path} is not in the GLB's BIN chunk")
+        if self.bin_offset is None or offset + length > self.bin_length:
+            raise ValueError(f"Byte range {offset}+{length} outside the BIN chunk of {self.path}")
+        self._file.seek(self.bin_offset + offset)
+        data = self._file.read(length)
+        if len(data) != length:
+            raise ValueError(f"Truncated BIN chunk in {self.path}")
+        return data
+
+    def read_view(self, index):
+        """Raw bytes of a bufferView."""
+        view = self.gltf["bufferViews"][index]
+        return self.read_range(view.get("byteOffset", 0), view["byteLength"], view["buffer"])
+
+    def read_accessor(self, index):
+        """Accessor data as an (N,) or (N, k) array in its stored component type.
+
+        Strided views are de-interleaved; normalized integers are returned
+        as stored (check accessor["normalized"]). Sparse accessors are not
+        used by the exporters we read and raise ValueError.
+        """
+        accessor = self.gltf["accessors"][index]
+        if "sparse" in accessor:
+            raise ValueError(f"Sparse accessor {index} in {self.path} is not supported")
+        dtype = np.dtype(COMPONENT_DTYPES[accessor["componentType"]]).newbyteorder("<")
+        columns = TYPE_COMPONENTS[accessor["type"]]
+        count = accessor["count"]
+        shape = (count,) if columns == 1 else (count, columns)
+        if "bufferView" not in accessor:
+            return np.zeros(shape, dtype=dtype.newbyteorder("="))
+
+        view = self.gltf["bufferViews"][accessor["bufferView"]]
+        element = dtype.itemsize * columns
+        stride = view.get("byteStride", element)
+        start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+        span = stride * (count - 1) + element if count else 0
+        data = self.read_range(start, span, view["buffer"])
+        rows = np.ndarray((count, columns), dtype=dtype, buffer=data, strides=(stride, dtype.itemsize))
+        return np.ascontiguousarray(rows.astype(dtype.newbyteorder("="))).reshape(shape)
+
+
+class GLTFFile(GLBFile):
+    """A .gltf whose buffers are data: URIs or side files, read through the GLBFile interface.
+
+    Each buffer is loaded whole the first time one of its ranges is read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.gltf = json.load(f)
+        self.length = os.path.getsize(path)
+        self.bin_offset, self.bin_length = None, 0
+        self._buffers = {}
+
+    def close(self):
+        self._buffers.clear()
+
+    def _buffer(self, index):
+        if index not in self._buffers:
+            uri = self.gltf["buffers"][index].get("uri")
+            if uri is None:
+                raise ValueError(f"buffer {index} of {self.path} has no uri")
+            self._buffers[index] = read_uri(self.path, uri)
+        return self._buffers[index]
+
+    def read_range(self, offset, length, buffer=0):
+        data = self._buffer(buffer)
+        if offset + length > len(data):
+            raise ValueError(f"Byte range {offset}+{length} outside buffer {buffer} of {self.path}")
+        return data[offset:offset + length]
+
+
+def read_uri(gltf_path, uri):
+    """Bytes behind a glTF uri: a base64 data: URI or a file relative to the glTF."""
+    if uri.startswith("data:"):
+        header, _, payload = uri.partition(",")
+        return base64.b64decode(payload) if header.endswith(";base64") else urllib.parse.unquote_to_bytes(payload)
+    with open(os.path.join(os.path.dirname(gltf_path), urllib.parse.unquote(uri)), "rb") as f:
+        return f.read()
+
+
+def open_gltf(path):
+    """GLBFile for a .glb, GLTFFile for a .gltf (chosen by the file's magic, not its extension)."""
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    return GLBFile(path) if magic == struct.pack("<I", GLB_MAGIC) else GLTFFile(path)
+
+
+def copy_accessor(glb, index, writer):
+    """Copy one accessor of glb into a GLBWriter, keeping its component type; returns the new index."""
+    accessor = glb.gltf["accessors"][index]
+    new_index = writer.add_accessor(glb.read_accessor(index))
+    if accessor.get("normalized"):
+        writer.gltf["accessors"][new_index]["normalized"] = True
+    return new_index
+
+
+def skeleton_animation_glb(glb, animations=None):
+    """GLBWriter holding only glb's node hierarchy, skins and animations.
+
+    Meshes, materials, textures and images are dropped, and only the bytes
+    of the skins' inverse bind matrices and the animation samplers are read.
+    Importers still build the armature, because every skin joint becomes a
+    bone whether or not a mesh uses the skin. animations optionally selects
+    animation indices to keep.
+    """
+    source = glb.gltf
+    writer = GLBWriter()
+    copied = {}
+
+    def accessor(index):
+        if index not in copied:
+            copied[index] = copy_accessor(glb, index, writer)
+        return copied[index]
+
+    nodes = []
+    for node in source.get("nodes", []):
+        nodes.append({key: value for key, value in node.items()
+                      if key in ("name", "children", "translation", "rotation", "scale", "matrix", "extras")})
+    writer.gltf["nodes"] = nodes
+    writer.gltf["scenes"] = [{key: value for key, value in scene.items() if key in ("name", "nodes")}
+                             for scene in source.get("scenes", [{"nodes": []}])]
+    writer.gltf["scene"] = source.get("scene", 0)
+
+    skins = []
+    for skin in source.get("skins", []):
+        skin = dict(skin)
+        if "inverseBindMatrices" in skin:
+            skin["inverseBindMatrices"] = accessor(skin["inverseBindMatrices"])
+        skins.append(skin)
+    if skins:
+        writer.gltf["skins"] = skins
+
+    kept = []
+    for i, animation in enumerate(source.get("animations", [])):
+        if animations is not None and i not in animations:
+            continue
+        samplers = [dict(sampler, input=accessor(sampler["input"]), output=accessor(sampler["output"]))
+                    for sampler in animation["samplers"]]
+        kept.append(dict(animation, samplers=samplers))
+    if kept:
+        writer.gltf["animations"] = kept
+    return writer
+
+
+def write_glb(path, gltf, binary):
+    """Write a glTF JSON dict and its BIN chunk bytes as a .glb."""
+    payload = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    payload += b" " * (-len(payload) % 4)
+    binary = bytes(binary) + b"\0" * (-len(binary) % 4)
+    chunks = struct.pack("<II", len(payload), CHUNK_JSON) + payload
+    if binary:
+        chunks += struct.pack("<II", len(binary), CHUNK_BIN) + binary
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", GLB_MAGIC, GLB_VERSION, 12 + len(chunks)))
+        f.write(chunks)
+
+
+def append_accessor(gltf, binary, array, accessor_type=None, normalized=False):
+    """Append an array to a glTF dict's BIN bytearray as a new bufferView + accessor (with min/max).
+
+    accessor_type defaults from the column count (MAT2/MAT3 must be given).
+    Returns the accessor index.
+    """
+    array = np.ascontiguousarray(array)
+    if array.dtype not in COMPONENT_TYPES:
+        raise ValueError(f"Unsupported accessor dtype: {array.dtype}")
+    columns = 1 if array.ndim == 1 else array.shape[1]
+    data = array.astype(array.dtype.newbyteorder("<")).tobytes()
+    binary.extend(b"\0" * (-len(binary) % 4))
+    gltf.setdefault("bufferViews", []).append({"buffer": 0, "byteOffset": len(binary), "byteLength": len(data)})
+    binary.extend(data)
+    accessor = {
+        "bufferView": len(gltf["bufferViews"]) - 1,
+        "componentType": COMPONENT_TYPES[array.dtype],
+        "count": len(array),
+        "type": accessor_type or ACCESSOR_TYPES[columns],
+    }
+    if normalized:
+        accessor["normalized"] = True
+    if len(array):
+        rows = array.reshape(len(array), columns)
+        cast = float if array.dtype.kind == "f" else int
+        accessor["min"] = [cast(v) for v in rows.min(axis=0)]
+        accessor["max"] = [cast(v) for v in rows.max(axis=0)]
+    gltf.setdefault("accessors", []).append(accessor)
+    return len(gltf["accessors"]) - 1
+
+
+def compact_buffers(gltf, binary):
+    """Drop accessors and bufferViews nothing references any more; returns the repacked BIN bytes.
+
+    Covers the references the core spec defines (mesh attributes, indices
+    and morph targets, skins, animation samplers, sparse accessors, images).
+    Kept bufferViews are copied in their original order, 4-byte aligned.
+    """
+    used_accessors = set()
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            used_accessors.update(primitive["attributes"].values())
+            if "indices" in primitive:
+                used_accessors.add(primitive["indices"])
+            for target in primitive.get("targets", []):
+                used_accessors.update(target.values())
+    for skin in gltf.get("skins", []):
+        if "inverseBindMatrices" in skin:
+            used_accessors.add(skin["inverseBindMatrices"])
+    for animation in gltf.get("animations", []):
+        for sampler in animation["samplers"]:
+            used_accessors.update((sampler["input"], sampler["output"]))
+
+    accessors = gltf.get("accessors", [])
+    accessor_map = {old: new for new, old in enumerate(sorted(used_accessors))}
+    used_views = {image["bufferView"] for image in gltf.get("images", []) if "bufferView" in image}
+    for old in accessor_map:
+        accessor = accessors[old]
+        if "bufferView" in accessor:
+            used_views.add(accessor["bufferView"])
+        sparse = accessor.get("sparse")
+        if sparse:
+            used_views.update((sparse["indices"]["bufferView"], sparse["values"]["bufferView"]))
+
+    views = gltf.get("bufferViews", [])
+    view_map = {}
+    packed = bytearray()
+    for new, old in enumerate(sorted(used_views)):
+        view = views[old]
+        start = view.get("byteOffset", 0)
+        packed.extend(b"\0" * (-len(packed) % 4))
+        view_map[old] = new
+        chunk = binary[start:start + view["byteLength"]]
+        view["byteOffset"] = len(packed)
+        packed.extend(chunk)
+    packed.extend(b"\0" * (-len(packed) % 4))
+
+    def remap_view(holder):
+        if "bufferView" in holder:
+            holder["bufferView"] = view_map[holder["bufferView"]]
+
+    gltf["bufferViews"] = [views[old] for old in sorted(used_views)]
+    gltf["accessors"] = [accessors[old] for old in sorted(used_accessors)]
+    for accessor in gltf["accessors"]:
+        remap_view(accessor)
+        if "sparse" in accessor:
+            remap_view(accessor["sparse"]["indices"])
+            remap_view(accessor["sparse"]["values"])
+    for image in gltf.get("images", []):
+        remap_view(image)
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            primitive["attributes"] = {k: accessor_map[v] for k, v in primitive["attributes"].items()}
+            if "indices" in primitive:
+                primitive["indices"] = accessor_map[primitive["indices"]]
+            if "targets" in primitive:
+                primitive["targets"] = [{k: accessor_map[v] for k, v in target.items()}
+                                        for target in primitive["targets"]]
+    for skin in gltf.get("skins", []):
+        if "inverseBindMatrices" in skin:
+            skin["inverseBindMatrices"] = accessor_map[skin["inverseBindMatrices"]]
+    for animation in gltf.get("animations", []):
+        for sampler in animation["samplers"]:
+            sampler["input"] = accessor_map[sampler["input"]]
+            sampler["output"] = accessor_map[sampler["output"]]
+    for key in ("accessors", "bufferViews"):
+        if not gltf[key]:
+            del gltf[key]
+    if gltf.get("buffers"):
+        gltf["buffers"][0]["byteLength"] = len(packed)
+    return packed
+
+
+def _accessor_bytes(glb, index):
+    """An accessor's elements tightly packed, exactly as stored (little endian)."""
+    array = glb.read_accessor(index)
+    return array.astype(array.dtype.newbyteorder("<")).tobytes()
+
+
+def merge_animations(base_path, clips):
+    """Merge the first animation of each clip GLB into the base GLB, by node name.
+
+    clips is a list of (path, animation name); the first entry may be the
+    base file itself, whose first animation is then renamed. Everything of
+    the base (JSON and BIN bytes) is kept; each clip animation's sampler
+    accessors are appended to the BIN chunk byte for byte and its channel
+    targets are remapped to the base node with the same name. Identical
+    accessors (typically the shared keyframe times) are stored once.
+
+    Returns (gltf, binary, sources) where sources maps every new accessor
+    index to the (clip path, accessor index) it was copied from, for
+    validate_merge().
+    """
+    with GLBFile(base_path) as base:
+        gltf = base.gltf
+        binary = bytearray(base.read_range(0, base.bin_length)) if base.bin_offset is not None else bytearray()
+    if len(gltf.get("buffers", [])) > 1 or any("uri" in buffer for buffer in gltf.get("buffers", [])):
+        raise ValueError(f"{base_path} uses external buffers; only self-contained GLBs can be merged")
+
+    node_index = {}
+    for i, name in enumerate(node.get("name") for node in gltf.get("nodes", [])):
+        if name is not None:
+            node_index.setdefault(name, i)
+    animations = []
+    sources = {}
+    stored = {}
+
+    def append(glb, index):
+        accessor = glb.gltf["accessors"][index]
+        data = _accessor_bytes(glb, index)
+        key = (accessor["componentType"], accessor["type"], bool(accessor.get("normalized")), data)
+        if key not in stored:
+            stored[key] = append_accessor(gltf, binary, glb.read_accessor(index), accessor["type"],
+                                          accessor.get("normalized", False))
+            sources[stored[key]] = (glb.path, index)
+        return stored[key]
+
+    for path, name in clips:
+        if os.path.abspath(path) == os.path.abspath(base_path):
+            if not gltf.get("animations"):
+                raise ValueError(f"{path} has no animation")
+            animations.append(dict(gltf["animations"][0], name=name))
+            continue
+        with GLBFile(path) as clip:
+            if not clip.gltf.get("animations"):
+                raise ValueError(f"{path} has no animation")
+            clip_names = clip.node_names()
+            source = clip.gltf["animations"][0]
+            missing = sorted({clip_names[channel["target"]["node"]] or f"#{channel['target']['node']}"
+                              for channel in source["channels"]
+                              if clip_names[channel["target"]["node"]] not in node_index})
+            if missing:
+                raise ValueError(f"{path} animates nodes missing from {base_path}: {', '.join(missing)}")
+            samplers = [dict(sampler, input=append(clip, sampler["input"]), output=append(clip, sampler["output"]))
+                        for sampler in source["samplers"]]
+            channels = [dict(channel, target=dict(channel["target"],
+                                                  node=node_index[clip_names[channel["target"]["node"]]]))
+                        for channel in source["channels"]]
+            animations.append({"name": name, "samplers": samplers, "channels": channels})
+
+    gltf["animations"] = animations
+    binary.extend(b"\0" * (-len(binary) % 4))
+    if binary:
+        gltf.setdefault("buffers", [{}])[0]["byteLength"] = len(binary)
+    return gltf, binary, sources
+
+
+def validate_merge(output_path, base_path, sources):
+    """Check a merged GLB byte for byte; returns a list of problems (empty when valid).
+
+    The base BIN chunk must be an unchanged prefix of the output's, every
+    copied accessor must hold exactly the clip's bytes, and every animation
+    must reference valid nodes and samplers with matching key counts.
+    """
+    problems = []
+    with GLBFile(output_path) as merged, GLBFile(base_path) as base:
+        if base.bin_offset is not None and merged.read_range(0, base.bin_length) != base.read_range(0, base.bin_length):
+            problems.append("base BIN chunk changed")
+        by_clip = {}
+        for index, (path, source_index) in sources.items():
+            by_clip.setdefault(path, []).append((index, source_index))
+        for path, pairs in by_clip.items():
+            with GLBFile(path) as clip:
+                for index, source_index in pairs:
+                    if _accessor_bytes(merged, index) != _accessor_bytes(clip, source_index):
+                        problems.append(f"accessor {index} differs from {os.path.basename(path)}#{source_index}")
+
+        nodes = len(merged.gltf.get("nodes", []))
+        for animation in merged.gltf.get("animations", []):
+            name = animation.get("name")
+            for channel in animation["channels"]:
+                if not 0 <= channel["target"].get("node", -1) < nodes:
+                    problems.append(f"{name}: channel targets missing node {channel['target'].get('node')}")
+                if not 0 <= channel["sampler"] < len(animation["samplers"]):
+                    problems.append(f"{name}: channel uses missing sampler {channel['sampler']}")
+            for sampler in animation["samplers"]:
+                keys = merged.gltf["accessors"][sampler["input"]]["count"]
+                values = merged.gltf["accessors"][sampler["output"]]["count"]
+                per_key = 3 if sampler.get("interpolation") == "CUBICSPLINE" else 1
+                if values % (keys * per_key):
+                    problems.append(f"{name}: sampler has {keys} keys but {values} values")
+                times = merged.read_accessor(sampler["input"])
+                if len(times) > 1 and not (np.diff(times) > 0).all():
+                    problems.append(f"{name}: keyframe times are not strictly increasing")
+    return problems
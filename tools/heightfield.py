@@ -0,0 +1,150 @@
+"""
+Vectorized terrain heightfield shared by the terrain exporters.
+
+Evaluates the formula create_terrain has always used (and that
+scripts/nature_spawner.gd mirrors in _get_terrain_height) over whole NumPy
+arrays at once instead of one vertex at a time. Pure NumPy, so it can be
+imported from Blender or from plain CPython.
+"""
+
+import struct
+
+import numpy as np
+
+# Radius (m) around the world origin that is flattened for the player spawn
+FLATTEN_RADIUS = 15.0
+
+# Heightfield sidecar: little-endian header followed by float32 heights,
+# row-major with one row per Godot Z sample and one column per X sample.
+#   magic "HFLD", u32 version, u32 width (X), u32 depth (Z),
+#   f32 origin_x, f32 origin_z, f32 spacing_x, f32 spacing_z
+SIDECAR_MAGIC = b"HFLD"
+SIDECAR_VERSION = 1
+SIDECAR_HEADER = struct.Struct("<4sIIIffff")
+
+
+def terrain_height(x, y):
+    """Terrain height at Blender ground coordinates (x, y).
+
+    Accepts scalars or arrays of any (broadcastable) shape and returns float64.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    h = 3.0 * np.sin(x * 0.03) * np.cos(y * 0.025)
+    h += 1.5 * np.sin(x * 0.08 + 1.5) * np.cos(y * 0.06 + 0.7)
+    h += 0.5 * np.sin(x * 0.2 + 3.0) * np.cos(y * 0.25 + 2.1)
+    h += 0.2 * np.sin(x * 0.5) * np.sin(y * 0.5)
+
+    dist_from_center = np.sqrt(x * x + y * y)
+    flatten = 1.0 - np.maximum(0.0, (FLATTEN_RADIUS - dist_from_center) / FLATTEN_RADIUS)
+    return np.where(dist_from_center < FLATTEN_RADIUS, h * flatten, h)
+
+
+def height_grid(xs, ys):
+    """Heights over the grid spanned by 1-D axes xs and ys, shape (len(ys), len(xs))."""
+    gx, gy = np.meshgrid(xs, ys)
+    return terrain_height(gx, gy)
+
+
+def terrain_normals(x, y, eps=0.05):
+    """Unit surface normals (Blender Z-up) at (x, y) from central differences.
+
+    Normals come from the continuous height function rather than from the
+    triangles around a vertex, so tiles that share an edge also share their
+    edge normals and light seamlessly.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    dx = (terrain_height(x + eps, y) - terrain_height(x - eps, y)) / (2.0 * eps)
+    dy = (terrain_height(x, y + eps) - terrain_height(x, y - eps)) / (2.0 * eps)
+    n = np.stack([-dx, -dy, np.ones_like(dx)], axis=-1)
+    return n / np.linalg.norm(n, axis=-1, keepdims=True)
+
+
+def grid_mesh(x0, y0, x1, y1, subdivisions):
+    """Displaced regular grid over [x0, x1] x [y0, y1].
+
+    Returns (positions, faces): positions is ((n+1)^2, 3) with x varying
+    fastest, faces is (n^2, 4) counter-clockwise quads seen from +Z.
+    """
+    n = subdivisions
+    xs = np.linspace(x0, x1, n + 1)
+    ys = np.linspace(y0, y1, n + 1)
+    gx, gy = np.meshgrid(xs, ys)
+    positions = np.stack([gx.ravel(), gy.ravel(), terrain_height(gx, gy).ravel()], axis=-1)
+
+    j, i = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    v00 = (j * (n + 1) + i).ravel()
+    faces = np.stack([v00, v00 + 1, v00 + n + 2, v00 + n + 1], axis=-1)
+    return positions, faces
+
+
+def grid_border(subdivisions):
+    """Vertex indices of a grid_mesh border, counter-clockwise seen from +Z."""
+    n = subdivisions
+    row = n + 1
+    south = np.arange(0, n)
+    east = n + np.arange(0, n) * row
+    north = n * row + np.arange(n, 0, -1)
+    west = np.arange(n, 0, -1) * row
+    return np.concatenate([south, east, north, west])
+
+
+def add_skirt(positions, faces, border, depth):
+    """Append a vertical skirt of the given depth hanging below the border loop.
+
+    Skirts hide the cracks between neighbouring tiles exported at different
+    LOD resolutions. Returns the extended (positions, faces).
+    """
+    base = len(positions)
+    low = positions[border].copy()
+    low[:, 2] -= depth
+    k = np.arange(len(border))
+    k_next = (k + 1) % len(border)
+    skirt_faces = np.stack([border[k], base + k, base + k_next, border[k_next]], axis=-1)
+    return np.concatenate([positions, low]), np.concatenate([faces, skirt_faces])
+
+
+def godot_height_grid(origin_x, origin_z, spacing_x, spacing_z, width, depth):
+    """Heights over a Godot-space grid, shape (depth, width).
+
+    Godot/glTF +Z is Blender -Y, so sample (x, z) reads terrain_height(x, -z).
+    """
+    xs = origin_x + spacing_x * np.arange(width)
+    zs = origin_z + spacing_z * np.arange(depth)
+    return height_grid(xs, -zs)
+
+
+def write_heightfield(path, heights, origin_x, origin_z, spacing_x, spacing_z):
+    """Write a (depth, width) Godot-space height grid as a binary sidecar."""
+    heights = np.ascontiguousarray(heights, dtype="<f4")
+    depth, width = heights.shape
+    with open(path, "wb") as f:
+        f.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, SIDECAR_VERSION, width, depth,
+                                    origin_x, origin_z, spacing_x, spacing_z))
+        f.write(heights.tobytes())
+
+
+def read_heightfield(path):
+    """Read a sidecar; returns (heights, origin_x, origin_z, spacing_x, spacing_z)."""
+    with open(path, "rb") as f:
+        magic, version, width, depth, ox, oz, sx, sz = SIDECAR_HEADER.unpack(f.read(SIDECAR_HEADER.size))
+        if magic != SIDECAR_MAGIC or version != SIDECAR_VERSION:
+            raise ValueError(f"{path}: not a version {SIDECAR_VERSION} heightfield sidecar")
+        heights = np.fromfile(f, dtype="<f4", count=width * depth).reshape(depth, width)
+    return heights, ox, oz, sx, sz
+
+
+def sample_heightfield(heights, origin_x, origin_z, spacing_x, spacing_z, x, z):
+    """Bilinearly interpolated height at Godot (x, z); clamps to the grid edge."""
+    depth, width = heights.shape
+    fx = np.clip((np.asarray(x, dtype=np.float64) - origin_x) / spacing_x, 0, width - 1)
+    fz = np.clip((np.asarray(z, dtype=np.float64) - origin_z) / spacing_z, 0, depth - 1)
+    x0 = np.minimum(fx.astype(np.int64), width - 2)
+    z0 = np.minimum(fz.astype(np.int64), depth - 2)
+    tx = fx - x0
+    tz = fz - z0
+    top = heights[z0, x0] * (1 - tx) + heights[z0, x0 + 1] * tx
+    bottom = heights[z0 + 1, x0] * (1 - tx) + heights[z0 + 1, x0 + 1] * tx
+    return top * (1 - tz) + bottom * tz
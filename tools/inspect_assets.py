@@ -0,0 +1,292 @@
+"""
+Structured inspection of glTF assets, one JSON line per file.
+
+Each report holds the node hierarchy, skins and bone counts, animations
+with per-channel key counts and time/value ranges, per-mesh vertex and
+triangle counts, the material count and every texture's size. Almost all of
+it comes from the glTF JSON (accessor counts and min/max); buffer bytes are
+only read for animation outputs without min/max and for image headers, so a
+whole directory is audited in seconds. Files are inspected in parallel.
+
+Pure Python + NumPy, no Blender needed:
+    python tools/inspect_assets.py                                  # everything under assets/models
+    python tools/inspect_assets.py assets/models/nature/*.glb --no-channels
+    python tools/inspect_assets.py "assets/**/*.glb" | jq '{path, triangles}'
+"""
+
+import argparse
+import glob
+import json
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from anim_optimize import dequantize
+from gltf_io import open_gltf, read_uri
+
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_PATHS = [os.path.join(PROJECT_ROOT, "assets", "models")]
+EXTENSIONS = (".glb", ".gltf")
+
+# Primitive modes (glTF 2.0, section 3.7.2.1)
+TRIANGLES, TRIANGLE_STRIP, TRIANGLE_FAN = 4, 5, 6
+
+
+# ========== FILES ==========
+def collect_paths(patterns):
+    """Expand files, directories (searched recursively) and glob patterns into a sorted list of glTF files."""
+    found = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if os.path.isdir(match):
+                for root, _, files in os.walk(match):
+                    found.update(os.path.join(root, f) for f in files if f.lower().endswith(EXTENSIONS))
+            elif match.lower().endswith(EXTENSIONS):
+                found.add(match)
+    return sorted(found)
+
+
+def image_size(data):
+    """(width, height) from PNG, JPEG or WebP header bytes, or None."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                i += 2
+                continue
+            length = struct.unpack(">H", data[i + 2:i + 4])[0]
+            # Start-of-frame markers, excluding DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[i + 5:i + 9])
+                return width, height
+            i += 2 + length
+        return None
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    return None
+
+
+# ========== REPORT ==========
+def node_kind(node, joints):
+    if "mesh" in node:
+        return "skinned_mesh" if "skin" in node else "mesh"
+    if "camera" in node:
+        return "camera"
+    if "KHR_lights_punctual" in node.get("extensions", {}):
+        return "light"
+    return "joint" if joints else "node"
+
+
+def hierarchy(gltf, joint_nodes):
+    """Scene roots as nested {"name", "kind", "children"} dicts."""
+    nodes = gltf.get("nodes", [])
+
+    def walk(index):
+        node = nodes[index]
+        entry = {"name": node.get("name", f"#{index}"),
+                 "kind": node_kind(node, index in joint_nodes)}
+        children = [walk(child) for child in node.get("children", [])]
+        if children:
+            entry["children"] = children
+        return entry
+
+    scenes = gltf.get("scenes", [])
+    if not scenes:
+        children = {child for node in nodes for child in node.get("children", [])}
+        return [walk(i) for i in range(len(nodes)) if i not in children]
+    return [walk(i) for i in scenes[gltf.get("scene", 0)].get("nodes", [])]
+
+
+def primitive_triangles(gltf, primitive):
+    mode = primitive.get("mode", TRIANGLES)
+    if "indices" in primitive:
+        count = gltf["accessors"][primitive["indices"]]["count"]
+    else:
+        count = gltf["accessors"][primitive["attributes"]["POSITION"]]["count"]
+    if mode == TRIANGLES:
+        return count // 3
+    if mode in (TRIANGLE_STRIP, TRIANGLE_FAN):
+        return max(0, count - 2)
+    return 0
+
+
+def mesh_reports(gltf):
+    meshes = []
+    for i, mesh in enumerate(gltf.get("meshes", [])):
+        primitives = mesh["primitives"]
+        meshes.append({
+            "name": mesh.get("name", f"#{i}"),
+            "primitives": len(primitives),
+            # Primitives often share one vertex buffer and differ only in indices
+            "vertices": sum(gltf["accessors"][a]["count"]
+                            for a in {p["attributes"]["POSITION"] for p in primitives if "POSITION" in p["attributes"]}),
+            "triangles": sum(primitive_triangles(gltf, p) for p in primitives),
+            "morph_targets": max((len(p.get("targets", [])) for p in primitives), default=0),
+            "materials": sorted({p["material"] for p in primitives if "material" in p}),
+        })
+    return meshes
+
+
+def value_range(asset, accessor_index, errors):
+    """(min, max) of an accessor: from its JSON bounds, else by reading its data."""
+    accessor = asset.gltf["accessors"][accessor_index]
+    if "min" in accessor and "max" in accessor and not accessor.get("normalized"):
+        return accessor["min"], accessor["max"]
+    try:
+        values = dequantize(asset.read_accessor(accessor_index), accessor.get("normalized", False))
+    except (OSError, ValueError) as e:
+        errors.append(str(e))
+        return None, None
+    values = values.reshape(accessor["count"], -1)
+    if not len(values):
+        return None, None
+    return [round(float(v), 6) for v in values.min(axis=0)], [round(float(v), 6) for v in values.max(axis=0)]
+
+
+def animation_reports(asset, channels=True, errors=None):
+    gltf = asset.gltf
+    nodes = gltf.get("nodes", [])
+    animations = []
+    for i, animation in enumerate(gltf.get("animations", [])):
+        inputs = [gltf["accessors"][s["input"]] for s in animation["samplers"]]
+        report = {
+            "name": animation.get("name", f"#{i}"),
+            "duration": round(max((a["max"][0] for a in inputs if "max" in a), default=0.0), 6),
+            "channels": len(animation["channels"]),
+            "keys": sum(a["count"] for a in inputs),
+        }
+        if "extras" in animation:
+            report["extras"] = animation["extras"]
+        if channels:
+            report["tracks"] = []
+            for channel in animation["channels"]:
+                sampler = animation["samplers"][channel["sampler"]]
+                times = gltf["accessors"][sampler["input"]]
+                node = channel["target"].get("node")
+                low, high = value_range(asset, sampler["output"], errors)
+                report["tracks"].append({
+                    "node": nodes[node].get("name", f"#{node}") if node is not None else None,
+                    "path": channel["target"]["path"],
+                    "interpolation": sampler.get("interpolation", "LINEAR"),
+                    "keys": times["count"],
+                    "start": times.get("min", [None])[0],
+                    "end": times.get("max", [None])[0],
+                    "min": low,
+                    "max": high,
+                })
+        animations.append(report)
+    return animations
+
+
+def texture_reports(asset, errors):
+    gltf = asset.gltf
+    images = []
+    for i, image in enumerate(gltf.get("images", [])):
+        report = {"name": image.get("name") or image.get("uri", f"#{i}")[:64], "mime": image.get("mimeType")}
+        try:
+            if "bufferView" in image:
+                data = asset.read_view(image["bufferView"])
+            else:
+                data = read_uri(asset.path, image["uri"])
+        except (OSError, ValueError) as e:
+            errors.append(str(e))
+            images.append(report)
+            continue
+        size = image_size(data)
+        report["bytes"] = len(data)
+        report["width"], report["height"] = size if size else (None, None)
+        images.append(report)
+    return images
+
+
+def inspect_asset(path, channels=True):
+    """Report dict for one .glb/.gltf; a file that cannot be parsed gives {"path", "error"}."""
+    try:
+        asset = open_gltf(path)
+    except (OSError, ValueError) as e:
+        return {"path": path, "error": str(e)}
+    errors = []
+    with asset:
+        gltf = asset.gltf
+        skins = gltf.get("skins", [])
+        joint_nodes = {joint for skin in skins for joint in skin["joints"]}
+        meshes = mesh_reports(gltf)
+        report = {
+            "path": path,
+            "bytes": os.path.getsize(path),
+            "generator": gltf.get("asset", {}).get("generator"),
+            "nodes": len(gltf.get("nodes", [])),
+            "hierarchy": hierarchy(gltf, joint_nodes),
+            "bones": len(joint_nodes),
+            "skins": [{"name": skin.get("name", f"#{i}"), "bones": len(skin["joints"])} for i, skin in enumerate(skins)],
+            "meshes": meshes,
+            "vertices": sum(m["vertices"] for m in meshes),
+            "triangles": sum(m["triangles"] for m in meshes),
+            "materials": len(gltf.get("materials", [])),
+            "textures": texture_reports(asset, errors),
+            "animations": animation_reports(asset, channels, errors),
+        }
+    if errors:
+        report["errors"] = sorted(set(errors))
+    return report
+
+
+def _inspect_job(job):
+    path, channels = job
+    return inspect_asset(path, channels)
+
+
+def inspect_assets(paths, channels=True, jobs=None):
+    """Reports for every path, in order, inspected across jobs processes."""
+    work = [(path, channels) for path in paths]
+    if jobs == 1 or len(work) < 2:
+        return [_inspect_job(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_inspect_job, work))
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Report the structure of glTF assets as JSON lines.")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS,
+                        help="files, directories or glob patterns (default: assets/models)")
+    parser.add_argument("--output", "-o", help="write the JSON lines here instead of stdout")
+    parser.add_argument("--no-channels", action="store_true", help="leave out the per-channel animation tracks")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    paths = collect_paths(args.paths)
+    if not paths:
+        print("ERROR: no .glb or .gltf files found", file=sys.stderr)
+        raise SystemExit(1)
+    reports = inspect_assets(paths, channels=not args.no_channels, jobs=args.jobs)
+    lines = "".join(json.dumps(report, separators=(",", ":")) + "\n" for report in reports)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(lines)
+    else:
+        sys.stdout.write(lines)
+    if any("error" in report for report in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+LOD chain helpers shared by the tree and rock exporters.
+
+A LOD chain is a set of sibling objects named <Name>_LOD0..LODn exported into
+one GLB. Each carries visibility_range_begin/end custom properties (exported
+as glTF node extras), which scripts/nature_spawner.gd applies to the imported
+GeometryInstance3D nodes. The last level is an 8-direction billboard
+impostor whose atlas is rendered headless with Cycles on the CPU.
+"""
+
+import math
+import os
+import tempfile
+
+try:
+    import bpy
+except ImportError:
+    # Importable from plain CPython; the functions themselves need Blender
+    bpy = None
+import numpy as np
+
+from bulk_mesh import object_from_arrays
+
+# Default distances (m) at which LOD1, LOD2 and the impostor take over
+DEFAULT_LOD_DISTANCES = (20.0, 45.0, 90.0)
+
+
+def set_visibility_range(obj, begin, end):
+    """Tag obj with the distance band (end 0 = unbounded) it should draw in."""
+    obj["visibility_range_begin"] = float(begin)
+    obj["visibility_range_end"] = float(end)
+
+
+def visibility_bands(count, distances):
+    """(begin, end) for count consecutive LODs split at distances.
+
+    The last level draws out to infinity (end 0); surplus distances are ignored.
+    """
+    bounds = [0.0] + [float(d) for d in distances][:count - 1] + [0.0]
+    return [(bounds[i], bounds[i + 1]) for i in range(count)]
+
+
+def assign_visibility_ranges(objects, distances):
+    """Give consecutive LOD objects adjoining bands split at distances."""
+    for obj, (begin, end) in zip(objects, visibility_bands(len(objects), distances)):
+        set_visibility_range(obj, begin, end)
+
+
+def add_decimated_copy(obj, name, ratio):
+    """Linked copy of obj with a collapse Decimate modifier (applied on export)."""
+    lod = obj.copy()
+    lod.name = name
+    mod = lod.modifiers.new("Decimate", 'DECIMATE')
+    mod.decimate_type = 'COLLAPSE'
+    mod.ratio = min(1.0, max(0.0, ratio))
+    bpy.context.collection.objects.link(lod)
+    return lod
+
+
+def triangle_count(obj):
+    """Triangles in obj's base mesh (before modifiers)."""
+    totals = np.empty(len(obj.data.polygons), dtype=np.int32)
+    obj.data.polygons.foreach_get("loop_total", totals)
+    return int((totals - 2).sum())
+
+
+def _world_bounds(obj):
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+    obj.data.vertices.foreach_get("co", co)
+    matrix = np.array(obj.matrix_world)
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    return co.min(axis=0), co.max(axis=0)
+
+
+def render_impostor_atlas(obj, directions=8, cell_size=256, samples=16):
+    """Render obj from `directions` horizontal angles into one RGBA atlas image.
+
+    View k looks at the object from angle 2*pi*k/directions around +Z,
+    starting from -Y (the glTF front). Cells fill a grid of up to four
+    columns, left to right and top to bottom. Returns (image, columns, rows,
+    extent), where extent is the square world size covered by one cell.
+    """
+    scene = bpy.context.scene
+    lo, hi = _world_bounds(obj)
+    center = (lo + hi) * 0.5
+    radius = float(np.linalg.norm((hi - lo)[:2])) * 0.5
+    extent = max(2.0 * radius, float(hi[2] - lo[2])) * 1.05
+    distance = extent * 2.0
+
+    cam_data = bpy.data.cameras.new("ImpostorCamera")
+    cam_data.type = 'ORTHO'
+    cam_data.ortho_scale = extent
+    cam = bpy.data.objects.new("ImpostorCamera", cam_data)
+    scene.collection.objects.link(cam)
+    sun_data = bpy.data.lights.new("ImpostorSun", 'SUN')
+    sun_data.energy = 3.0
+    sun = bpy.data.objects.new("ImpostorSun", sun_data)
+    sun.rotation_euler = (math.radians(45), 0.0, math.radians(30))
+    scene.collection.objects.link(sun)
+
+    # Only the source object shows up in the bake
+    hidden = [o for o in scene.objects if o not in (obj, cam, sun) and not o.hide_render]
+    for o in hidden:
+        o.hide_render = True
+
+    scene.camera = cam
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = samples
+    scene.render.film_transparent = True
+    scene.render.resolution_x = cell_size
+    scene.render.resolution_y = cell_size
+    scene.render.resolution_percentage = 100
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_mode = 'RGBA'
+
+    columns = min(directions, 4)
+    rows = math.ceil(directions / columns)
+    atlas = np.zeros((rows * cell_size, columns * cell_size, 4), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        for k in range(directions):
+            angle = 2.0 * math.pi * k / directions
+            cam.location = (center[0] + math.sin(angle) * distance,
+                            center[1] - math.cos(angle) * distance,
+                            center[2])
+            cam.rotation_euler = (math.pi / 2, 0.0, angle)
+            scene.render.filepath = os.path.join(tmp, f"view_{k}.png")
+            bpy.ops.render.render(write_still=True)
+
+            view = bpy.data.images.load(scene.render.filepath)
+            pixels = np.empty(cell_size * cell_size * 4, dtype=np.float32)
+            view.pixels.foreach_get(pixels)
+            bpy.data.images.remove(view)
+
+            # Blender image rows run bottom to top
+            col, row = k % columns, rows - 1 - k // columns
+            atlas[row * cell_size:(row + 1) * cell_size, col * cell_size:(col + 1) * cell_size] = \
+                pixels.reshape(cell_size, cell_size, 4)
+
+    for o in hidden:
+        o.hide_render = False
+    bpy.data.objects.remove(cam)
+    bpy.data.objects.remove(sun)
+    bpy.data.cameras.remove(cam_data)
+    bpy.data.lights.remove(sun_data)
+
+    image = bpy.data.images.new(f"{obj.name}_Impostor", columns * cell_size, rows * cell_size, alpha=True)
+    image.pixels.foreach_set(atlas.ravel())
+    image.pack()
+    return image, columns, rows, extent
+
+
+def _impostor_material(name, image):
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    bsdf = nodes.get("Principled BSDF")
+    bsdf.inputs["Roughness"].default_value = 1.0
+    tex = nodes.new("ShaderNodeTexImage")
+    tex.image = image
+    tex.interpolation = 'Closest'
+    # Math Round on alpha is exported as glTF alphaMode MASK with cutoff 0.5
+    clip = nodes.new("ShaderNodeMath")
+    clip.operation = 'ROUND'
+    links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
+    links.new(tex.outputs["Alpha"], clip.inputs[0])
+    links.new(clip.outputs["Value"], bsdf.inputs["Alpha"])
+    if hasattr(mat, "blend_method"):
+        mat.blend_method = 'CLIP'
+    return mat
+
+
+def create_impostor(obj, name, directions=8, cell_size=256, samples=16):
+    """Bake obj into an impostor atlas and return a billboard quad showing it.
+
+    The quad faces -Y, is centered on obj's bounds like the bake camera and
+    maps the first atlas cell; the atlas layout is stored in the object's
+    "impostor" extras. At runtime scripts/nature_spawner.gd draws it with
+    shaders/impostor.gdshader, which turns the quad to the camera and picks
+    the cell matching the view direction.
+    """
+    lo, hi = _world_bounds(obj)
+    image, columns, rows, extent = render_impostor_atlas(obj, directions, cell_size, samples)
+
+    cx, cy = (lo[:2] + hi[:2]) * 0.5
+    cz = (lo[2] + hi[2]) * 0.5
+    half = extent * 0.5
+    positions = [(cx - half, cy, cz - half), (cx + half, cy, cz - half),
+                 (cx + half, cy, cz + half), (cx - half, cy, cz + half)]
+    u1, v0 = 1.0 / columns, 1.0 - 1.0 / rows
+    uvs = [(0.0, v0), (u1, v0), (u1, 1.0), (0.0, 1.0)]
+    billboard = object_from_arrays(name, positions, [[0, 1, 2, 3]], uvs=uvs, smooth=False,
+                                   materials=[_impostor_material(name + "Material", image)])
+    billboard["impostor"] = {"directions": directions, "columns": columns, "rows": rows}
+    return billboard
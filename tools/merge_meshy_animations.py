@@ -1,16 +1,47 @@
 """
-Blender script to merge all Meshy animation GLBs into a single GLB file.
+Merge all Meshy animation GLBs into a single GLB file.
 Run from Blender: Scripting workspace -> Open this file -> Run Script
 Or from command line: blender --background --python tools/merge_meshy_animations.py
 
-Requires: Edit the ASSETS_DIR path below to match your project, or run from project root.
+Paths and clips can be overridden after Blender's "--":
+    blender --background --python tools/merge_meshy_animations.py -- \
+        --assets-dir assets/models/Meshy_AI_biped --output /tmp/all.glb \
+        --anim Meshy_AI_Animation_Walking_withSkin.glb=Walk
+
+--streaming skips the full import of every clip after the first: only the
+node hierarchy, skin and animation samplers are read from those files
+(tools/gltf_io.py), so the duplicate meshes and textures never load.
+
+Without Blender (or with --direct) the clips are merged straight into the
+first GLB's binary: channels are remapped to its nodes by name and the
+original keyframes are appended byte for byte, then checked:
+    python tools/merge_meshy_animations.py
+
+--root-motion moves the Walk/Run travel onto a RootMotion node and stores
+speed, stride and foot contacts as extras (tools/root_motion.py); --optimize
+then strips redundant keys from the result (tools/anim_optimize.py).
 """
 
-import bpy
+import argparse
 import os
+import shutil
 import sys
+import tempfile
+import time
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
 
-# Paths - adjust if needed
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import anim_optimize
+import gltf_io
+import root_motion
+from anim_tracks import push_nla_track
+from gltf_io import GLBFile, skeleton_animation_glb
+
+# Default paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets", "models", "Meshy_AI_biped")
@@ -42,19 +73,61 @@ def get_meshes_for_armature(armature):
     return meshes
 
 
-def main():
+def remove_objects(objects):
+    """Delete objects along with armature data nothing else uses."""
+    for obj in objects:
+        data = obj.data if obj.type == "ARMATURE" else None
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if data is not None and data.users == 0:
+            bpy.data.armatures.remove(data)
+
+
+def import_clip_skeleton(filepath, tmp_dir):
+    """Import only the skeleton and animations of a clip GLB; returns the objects created.
+
+    gltf_io reads the JSON and just the sampler and bind matrix bytes, so the
+    clip's mesh, skin weights and texture are never loaded into Blender.
+    """
+    stripped = os.path.join(tmp_dir, "clip_skeleton.glb")
+    with GLBFile(filepath) as glb:
+        skeleton_animation_glb(glb).write(stripped)
+    before = set(bpy.data.objects)
+    bpy.ops.import_scene.gltf(filepath=stripped)
+    return [obj for obj in bpy.data.objects if obj not in before]
+
+
+def merge_animations(assets_dir=ASSETS_DIR, anim_files=ANIM_FILES, output_path=OUTPUT_PATH, streaming=False):
+    """Import each (filename, anim_name) GLB from assets_dir and export one GLB with every clip as an NLA track.
+
+    The first file provides the mesh. With streaming, later clips are
+    imported as skeleton + animation only, so memory stays flat however many
+    clips are merged.
+    """
     # Clear scene
     bpy.ops.wm.read_factory_settings(use_empty=True)
 
     base_armature = None
     base_meshes = []
+    tmp_dir = tempfile.mkdtemp(prefix="merge_anims_")
 
-    for i, (filename, anim_name) in enumerate(ANIM_FILES):
-        filepath = os.path.join(ASSETS_DIR, filename)
+    for i, (filename, anim_name) in enumerate(anim_files):
+        filepath = os.path.join(assets_dir, filename)
         if not os.path.exists(filepath):
             print(f"ERROR: File not found: {filepath}")
             continue
 
+        if streaming and base_armature is not None:
+            # Retarget by bone name: the copied action's fcurves address bones by name
+            new_objects = import_clip_skeleton(filepath, tmp_dir)
+            clip_armatures = [obj for obj in new_objects if obj.type == "ARMATURE"]
+            if not clip_armatures:
+                print(f"ERROR: No armature in {filename}")
+            elif clip_armatures[0].animation_data and clip_armatures[0].animation_data.action:
+                push_nla_track(base_armature, clip_armatures[0].animation_data.action, anim_name)
+                print(f"Added animation: {anim_name}")
+            remove_objects(new_objects)
+            continue
+
         # Import GLB
         bpy.ops.import_scene.gltf(filepath=filepath)
 
@@ -71,47 +144,27 @@ def main():
             base_armature = current_armature
             base_meshes = get_meshes_for_armature(base_armature)
 
-            # Rename the first action and push to NLA (direct API - works in Blender 5 headless)
+            # Rename the first action and push to NLA
             if base_armature.animation_data and base_armature.animation_data.action:
-                action = base_armature.animation_data.action
-                action.name = anim_name
-                track = base_armature.animation_data.nla_tracks.new()
-                track.name = anim_name
-                track.strips.new(action.name, int(action.frame_range[0]), action)
-                base_armature.animation_data.action = None
+                push_nla_track(base_armature, base_armature.animation_data.action, anim_name)
             print(f"Imported base: {anim_name}")
         else:
             # Subsequent import - copy action to base, then delete duplicate
             if current_armature.animation_data and current_armature.animation_data.action:
-                src_action = current_armature.animation_data.action
                 # Copy action (fcurves use bone names, so it works on base armature)
-                new_action = src_action.copy()
-                new_action.name = anim_name
-
-                # Delete the duplicate armature and its mesh
-                dup_meshes = get_meshes_for_armature(current_armature)
-                for m in dup_meshes:
-                    bpy.data.objects.remove(m, do_unlink=True)
-                bpy.data.objects.remove(current_armature, do_unlink=True)
-
-                # Assign to base armature and push to NLA (direct API - works in Blender 5 headless)
-                base_armature.animation_data_create()
-                base_armature.animation_data.action = new_action
-                track = base_armature.animation_data.nla_tracks.new()
-                track.name = anim_name
-                track.strips.new(new_action.name, int(new_action.frame_range[0]), new_action)
-                base_armature.animation_data.action = None
+                new_action = current_armature.animation_data.action.copy()
+                push_nla_track(base_armature, new_action, anim_name)
                 print(f"Added animation: {anim_name}")
-            else:
-                # No action - just delete duplicate
-                dup_meshes = get_meshes_for_armature(current_armature)
-                for m in dup_meshes:
-                    bpy.data.objects.remove(m, do_unlink=True)
-                bpy.data.objects.remove(current_armature, do_unlink=True)
+            # Delete the duplicate armature and its mesh
+            dup_meshes = get_meshes_for_armature(current_armature)
+            for m in dup_meshes:
+                bpy.data.objects.remove(m, do_unlink=True)
+            bpy.data.objects.remove(current_armature, do_unlink=True)
 
+    shutil.rmtree(tmp_dir, ignore_errors=True)
     if base_armature is None:
         print("ERROR: No armature found. Check file paths.")
-        return
+        return None
 
     # Select base armature and its meshes for export
     bpy.ops.object.select_all(action="DESELECT")
@@ -120,14 +173,96 @@ def main():
         m.select_set(True)
 
     # Export as GLB
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
     bpy.ops.export_scene.gltf(
-        filepath=OUTPUT_PATH,
+        filepath=output_path,
         use_selection=True,
         export_animations=True,
         export_animation_mode="NLA_TRACKS",
         export_force_sampling=False,
     )
-    print(f"Exported: {OUTPUT_PATH}")
+    print(f"Exported: {output_path}")
+    return output_path
+
+
+def merge_animations_direct(assets_dir=ASSETS_DIR, anim_files=ANIM_FILES, output_path=OUTPUT_PATH):
+    """Blender-free merge: the first clip's GLB (mesh, skin, texture untouched) plus every clip's keys."""
+    start = time.perf_counter()
+    clips = []
+    for filename, anim_name in anim_files:
+        filepath = os.path.join(assets_dir, filename)
+        if not os.path.exists(filepath):
+            print(f"ERROR: File not found: {filepath}")
+            continue
+        clips.append((filepath, anim_name))
+    if not clips:
+        print("ERROR: No clips found. Check file paths.")
+        return None
+
+    try:
+        gltf, binary, sources = gltf_io.merge_animations(clips[0][0], clips)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp = output_path + ".tmp"
+    gltf_io.write_glb(tmp, gltf, binary)
+    problems = gltf_io.validate_merge(tmp, clips[0][0], sources)
+    if problems:
+        os.remove(tmp)
+        for problem in problems:
+            print(f"ERROR: {problem}")
+        return None
+    os.replace(tmp, output_path)
+    print(f"Merged {len(clips)} clips in {time.perf_counter() - start:.3f} s")
+    print(f"Exported: {output_path}")
+    return output_path
+
+
+def parse_anim(value):
+    """FILE=NAME -> (FILE, NAME)."""
+    filename, sep, anim_name = value.partition("=")
+    if not sep or not filename or not anim_name:
+        raise argparse.ArgumentTypeError(f"expected FILE=NAME, got {value!r}")
+    return filename, anim_name
+
+
+def main():
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = sys.argv[1:] if bpy is None else []
+    parser = argparse.ArgumentParser(description="Merge Meshy animation GLBs into one GLB with a track per clip.")
+    parser.add_argument("--assets-dir", default=ASSETS_DIR, help="directory holding the animation GLBs")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="GLB path to write")
+    parser.add_argument("--anim", type=parse_anim, action="append", metavar="FILE=NAME",
+                        help="clip to merge, repeatable; the first one provides the mesh (default: the four Meshy clips)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="read only skeleton and animation data from every clip after the first")
+    parser.add_argument("--direct", action="store_true",
+                        help="merge the GLB binaries without Blender (always the case under plain Python)")
+    parser.add_argument("--root-motion", action="store_true",
+                        help="extract Walk/Run root motion and locomotion metadata (tools/root_motion.py)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="run tools/anim_optimize.py keyframe reduction on the merged GLB")
+    parser.add_argument("--quantize", action="store_true", help="with --optimize, store rotations as int16")
+    args = parser.parse_args(argv)
+    if bpy is None or args.direct:
+        result = merge_animations_direct(args.assets_dir, args.anim or ANIM_FILES, args.output)
+    else:
+        result = merge_animations(args.assets_dir, args.anim or ANIM_FILES, args.output, args.streaming)
+    if result is None:
+        raise SystemExit(1)
+    if args.root_motion:
+        tmp = result + ".tmp"
+        results = root_motion.extract_root_motion(result, tmp)
+        os.replace(tmp, result)
+        root_motion.print_report(results)
+    if args.optimize:
+        tmp = result + ".tmp"
+        reports = anim_optimize.optimize_glb(result, tmp, quantize=args.quantize)
+        os.replace(tmp, result)
+        anim_optimize.print_report(reports)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,342 @@
+"""
+Mesh post-processing shared by every export: weld, clean, cache-order.
+
+The generators emit geometry part by part (primitives joined by
+create_enemy, four fresh vertices per leaf quad, a vertex ring per grass
+blade segment), so coincident vertices stay split and index order follows
+construction order. optimize_triangles runs one pass over a triangle list:
+
+  1. weld: vertices merge when their positions agree within tolerance,
+     their other per-vertex data (custom normals, skin weights, morph
+     shapes) agrees within attribute_tolerance and they are used by the
+     same set of materials, so seams between materials stay hard;
+  2. clean: triangles that collapsed to an edge or a point (in the base
+     shape and every morph shape) and repeated triangles (same corners,
+     same winding, same material) are dropped;
+  3. triangle order: per material, Tipsify (Sander, Nehab & Barczak 2007)
+     reorders triangles for the post-transform vertex cache, unless the
+     generator's own order already misses less (ring-by-ring branch
+     tubes often do);
+  4. vertex order: vertices are renumbered by first use, so vertex
+     fetches walk the buffer forward.
+
+Its report gives vertex and triangle counts and the ACMR (average cache
+miss ratio: transformed vertices per triangle with a FIFO cache of
+cache_size entries) before and after; both are measured per material, the
+way the primitives are drawn, so "before" is the input order stably
+grouped by material. glb_writer runs it on every mesh it
+writes; in Blender, optimize_objects rewrites the selected meshes in place
+right before the glTF exporter runs.
+
+Pure Python + NumPy (except optimize_objects):
+    mesh = optimize_triangles(positions, tris, materials, vertex_attributes={"normal": normals})
+    print(format_report("Rock", mesh.report))
+"""
+
+from collections import deque
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+from bulk_mesh import add_shape_keys, write_mesh_arrays
+
+WELD_TOLERANCE = 1e-5
+ATTRIBUTE_TOLERANCE = 1e-3
+CACHE_SIZE = 32
+
+
+# ========== METRICS ==========
+def acmr(tris, cache_size=CACHE_SIZE):
+    """Average cache miss ratio of a triangle list under a FIFO post-transform cache."""
+    if not len(tris):
+        return 0.0
+    cache = deque()
+    cached = set()
+    misses = 0
+    for v in np.asarray(tris).ravel().tolist():
+        if v not in cached:
+            misses += 1
+            cached.add(v)
+            cache.append(v)
+            if len(cache) > cache_size:
+                cached.discard(cache.popleft())
+    return misses / len(tris)
+
+
+def format_report(name, report):
+    return (f"  {name}: {report['vertices'][0]} -> {report['vertices'][1]} vertices, "
+            f"{report['triangles'][0]} -> {report['triangles'][1]} triangles "
+            f"({report['degenerate']} degenerate, {report['duplicate']} duplicate), "
+            f"ACMR {report['acmr'][0]:.3f} -> {report['acmr'][1]:.3f}")
+
+
+# ========== PASSES ==========
+def _quantize(values, tolerance):
+    values = np.asarray(values, dtype=np.float64).reshape(len(values), -1)
+    return np.round(values / tolerance).astype(np.int64)
+
+
+def weld(positions, tris, materials, vertex_attributes=(), shapes=(),
+         tolerance=WELD_TOLERANCE, attribute_tolerance=ATTRIBUTE_TOLERANCE):
+    """(tris on welded vertices, source vertex per welded vertex).
+
+    vertex_attributes and shapes are sequences of (N, k) arrays; shapes are
+    compared with the position tolerance. Unreferenced vertices are dropped.
+    """
+    used = np.unique(tris)
+    # Bit m set when a triangle of material m uses the vertex (materials past 62 share a bit)
+    signature = np.zeros(len(positions), dtype=np.int64)
+    bits = np.left_shift(np.int64(1), np.minimum(materials, 62).astype(np.int64))
+    for corner in range(3):
+        np.bitwise_or.at(signature, tris[:, corner], bits)
+    keys = [_quantize(positions, tolerance), signature[:, None]]
+    keys += [_quantize(shape, tolerance) for shape in shapes]
+    keys += [_quantize(values, attribute_tolerance) for values in vertex_attributes]
+    keys = np.concatenate(keys, axis=1)[used]
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    remap = np.full(len(positions), -1, dtype=np.int64)
+    remap[used] = inverse.ravel()
+    return remap[tris], used[first]
+
+
+def clean(positions, tris, materials, shapes=(), area_epsilon=None, tolerance=WELD_TOLERANCE):
+    """Mask of triangles to keep, and the (degenerate, duplicate) counts dropped."""
+    if area_epsilon is None:
+        area_epsilon = tolerance * tolerance
+    keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 2] != tris[:, 0])
+    # Zero area in the base shape is only degenerate if every morph shape agrees
+    flat = np.ones(len(tris), dtype=bool)
+    for shape in (positions, *shapes):
+        corners = np.asarray(shape, dtype=np.float64)[tris]
+        area = 0.5 * np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+        flat &= area <= area_epsilon
+    keep &= ~flat
+    degenerate = int((~keep).sum())
+
+    # Rotate each triangle to start at its smallest index: same corners and winding compare equal
+    start = np.argmin(tris, axis=1)
+    rotated = np.take_along_axis(tris, (start[:, None] + np.arange(3)) % 3, axis=1)
+    candidates = np.flatnonzero(keep)
+    rows = np.column_stack([materials[candidates], rotated[candidates]])
+    _, first = np.unique(rows, axis=0, return_index=True)
+    unique = np.zeros(len(tris), dtype=bool)
+    unique[candidates[first]] = True
+    duplicate = int(keep.sum() - unique.sum())
+    return unique, degenerate, duplicate
+
+
+def tipsify(tris, vertex_count, cache_size=CACHE_SIZE):
+    """Triangle order for a post-transform cache of cache_size (Tipsify, linear time)."""
+    tris = np.asarray(tris, dtype=np.int64)
+    if not len(tris):
+        return np.zeros(0, dtype=np.int64)
+    flat = tris.ravel()
+    adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+    counts = np.bincount(flat, minlength=vertex_count)
+    starts = np.concatenate([[0], np.cumsum(counts)]).tolist()
+    live = counts.tolist()
+    corners = tris.tolist()
+    cache_time = [0] * vertex_count
+    emitted = bytearray(len(tris))
+    dead_end = []
+    order = []
+    time = cache_size + 1
+    cursor = 0
+    fan = corners[0][0]
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[starts[fan]:starts[fan + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            order.append(t)
+            for v in corners[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - cache_time[v] > cache_size:
+                    cache_time[v] = time
+                    time += 1
+        # Next fan: the candidate that stays in cache longest and still has triangles
+        fan, best = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = time - cache_time[v] if time - cache_time[v] + 2 * live[v] <= cache_size else 0
+                if priority > best:
+                    fan, best = v, priority
+        if fan < 0:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fan = v
+                    break
+        while fan < 0 and cursor < vertex_count:
+            if live[cursor] > 0:
+                fan = cursor
+            cursor += 1
+    return np.asarray(order, dtype=np.int64)
+
+
+def first_use_order(tris, vertex_count):
+    """(old vertex index per new index, new index per old vertex) numbering vertices by first use."""
+    flat = np.asarray(tris, dtype=np.int64).ravel()
+    _, first = np.unique(flat, return_index=True)
+    order = flat[np.sort(first)]
+    remap = np.full(vertex_count, -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return order, remap
+
+
+# ========== PIPELINE ==========
+class OptimizedMesh:
+    """Result of optimize_triangles: arrays in the new vertex and triangle order, plus the report."""
+
+    def __init__(self, positions, tris, materials, vertex_attributes, shapes, triangle_attributes, report):
+        self.positions = positions
+        self.tris = tris
+        self.materials = materials
+        self.vertex_attributes = vertex_attributes
+        self.shapes = shapes
+        self.triangle_attributes = triangle_attributes
+        self.report = report
+
+
+def optimize_triangles(positions, tris, materials=None, vertex_attributes=None, shapes=None,
+                       triangle_attributes=None, tolerance=WELD_TOLERANCE,
+                       attribute_tolerance=ATTRIBUTE_TOLERANCE, cache_size=CACHE_SIZE):
+    """Weld, clean and reorder a triangle mesh; returns an OptimizedMesh.
+
+    vertex_attributes and shapes are {name: (N, ...)} dicts carried with the
+    vertices (shapes are morph target positions); triangle_attributes are
+    {name: (T, ...)} dicts carried with the triangles, e.g. per-corner UVs as
+    (T, 3, 2). Triangles come out grouped by material, ascending.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+    materials = (np.zeros(len(tris), dtype=np.int64) if materials is None
+                 else np.asarray(materials, dtype=np.int64))
+    vertex_attributes = {name: np.asarray(values) for name, values in (vertex_attributes or {}).items()}
+    shapes = {name: np.asarray(values, dtype=np.float64).reshape(-1, 3) for name, values in (shapes or {}).items()}
+    triangle_attributes = {name: np.asarray(values) for name, values in (triangle_attributes or {}).items()}
+    # Measure the input as drawn: one primitive per material, in input order within each
+    grouped = tris[np.argsort(materials, kind="stable")]
+    report = {"vertices": [len(positions)], "triangles": [len(tris)], "acmr": [acmr(grouped, cache_size)]}
+
+    tris, source = weld(positions, tris, materials, list(vertex_attributes.values()), list(shapes.values()),
+                        tolerance, attribute_tolerance)
+    positions = positions[source]
+    vertex_attributes = {name: values[source] for name, values in vertex_attributes.items()}
+    shapes = {name: values[source] for name, values in shapes.items()}
+
+    keep, report["degenerate"], report["duplicate"] = clean(positions, tris, materials, list(shapes.values()),
+                                                            tolerance=tolerance)
+    order = []
+    for material in np.unique(materials[keep]):
+        group = np.flatnonzero(keep & (materials == material))
+        reordered = group[tipsify(tris[group], len(positions), cache_size)]
+        if acmr(tris[reordered], cache_size) < acmr(tris[group], cache_size):
+            group = reordered
+        order.append(group)
+    order = np.concatenate(order) if order else np.zeros(0, dtype=np.int64)
+    tris, materials = tris[order], materials[order]
+    triangle_attributes = {name: values[order] for name, values in triangle_attributes.items()}
+
+    vertex_order, remap = first_use_order(tris, len(positions))
+    tris = remap[tris]
+    positions = positions[vertex_order]
+    vertex_attributes = {name: values[vertex_order] for name, values in vertex_attributes.items()}
+    shapes = {name: values[vertex_order] for name, values in shapes.items()}
+
+    report["vertices"].append(len(positions))
+    report["triangles"].append(len(tris))
+    report["acmr"].append(acmr(tris, cache_size))
+    return OptimizedMesh(positions, tris, materials, vertex_attributes, shapes, triangle_attributes, report)
+
+
+# ========== BLENDER ==========
+def _foreach_get(collection, prop, count, dtype, width=1):
+    values = np.empty(count * width, dtype=dtype)
+    collection.foreach_get(prop, values)
+    return values.reshape(count, width) if width > 1 else values
+
+
+def optimize_mesh_object(obj, **options):
+    """Run optimize_triangles on obj's mesh and rewrite it as triangles; returns the report.
+
+    UV layers and custom normals are per corner and travel with the
+    triangles; shape keys and vertex group weights take part in the weld.
+    """
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    vertex_count, tri_count = len(mesh.vertices), len(mesh.loop_triangles)
+    positions = _foreach_get(mesh.vertices, "co", vertex_count, np.float32, 3)
+    tris = _foreach_get(mesh.loop_triangles, "vertices", tri_count, np.int32, 3)
+    loops = _foreach_get(mesh.loop_triangles, "loops", tri_count, np.int32, 3)
+    polygons = _foreach_get(mesh.loop_triangles, "polygon_index", tri_count, np.int32)
+    materials = _foreach_get(mesh.polygons, "material_index", len(mesh.polygons), np.int32)[polygons]
+    smooth = _foreach_get(mesh.polygons, "use_smooth", len(mesh.polygons), bool)[polygons]
+
+    corner = {"smooth": smooth}
+    uv_names = [layer.name for layer in mesh.uv_layers]
+    for name in uv_names:
+        corner["uv:" + name] = _foreach_get(mesh.uv_layers[name].data, "uv", len(mesh.loops), np.float32, 2)[loops]
+    if mesh.has_custom_normals:
+        if hasattr(mesh, "corner_normals"):
+            normals = _foreach_get(mesh.corner_normals, "vector", len(mesh.loops), np.float32, 3)
+        else:
+            mesh.calc_normals_split()
+            normals = _foreach_get(mesh.loops, "normal", len(mesh.loops), np.float32, 3)
+        corner["normal"] = normals[loops]
+
+    shapes = {}
+    if mesh.shape_keys is not None:
+        for block in mesh.shape_keys.key_blocks[1:]:
+            shapes[block.name] = _foreach_get(block.data, "co", vertex_count, np.float32, 3)
+    vertex = {}
+    if len(obj.vertex_groups):
+        weights = np.zeros((vertex_count, len(obj.vertex_groups)), dtype=np.float32)
+        for v in mesh.vertices:
+            for element in v.groups:
+                weights[v.index, element.group] = element.weight
+        vertex["groups"] = weights
+
+    result = optimize_triangles(positions, tris, materials, vertex_attributes=vertex, shapes=shapes,
+                                triangle_attributes=corner, **options)
+    if shapes:
+        obj.shape_key_clear()
+    mesh.clear_geometry()
+    write_mesh_arrays(mesh, result.positions, result.tris, material_indices=result.materials,
+                      normals=None, smooth=False)
+    mesh.polygons.foreach_set("use_smooth", result.triangle_attributes["smooth"].astype(bool))
+    for name in uv_names:
+        layer = mesh.uv_layers.get(name) or mesh.uv_layers.new(name=name)
+        layer.data.foreach_set("uv", np.ascontiguousarray(result.triangle_attributes["uv:" + name],
+                                                          dtype=np.float32).ravel())
+    if "normal" in result.triangle_attributes:
+        if hasattr(mesh, "use_auto_smooth"):
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set(result.triangle_attributes["normal"].reshape(-1, 3).tolist())
+    if shapes:
+        add_shape_keys(obj, result.shapes)
+    if vertex:
+        weights = np.round(result.vertex_attributes["groups"], 4)
+        for group in obj.vertex_groups:
+            column = weights[:, group.index]
+            for value in np.unique(column[column > 0.0]):
+                group.add(np.flatnonzero(column == value).tolist(), float(value), 'REPLACE')
+    mesh.update()
+    return result.report
+
+
+def optimize_objects(objects, **options):
+    """Optimize each distinct mesh of objects once (instances share theirs) and print the reports."""
+    done = set()
+    for obj in objects:
+        if obj.type != 'MESH' or obj.data.name in done:
+            continue
+        done.add(obj.data.name)
+        print(format_report(obj.name, optimize_mesh_object(obj, **options)))
@@ -0,0 +1,148 @@
+"""
+Array-based mesh primitives matching Blender's primitive_*_add operators.
+
+uv_sphere, cone, cylinder and cube return (positions, faces, face_sizes)
+with the operators' parameters, centering and topology (triangle fans at
+the sphere poles, n-gon caps on cones and cylinders), wound so every face
+points outward. PartBuffers places many such parts with per-part location,
+XYZ euler rotation, scale and material index and concatenates them once, so
+a model made of dozens of primitives becomes a single bulk_mesh or
+glb_writer mesh with no operator calls.
+
+Pure Python + NumPy:
+    parts = PartBuffers()
+    parts.add(uv_sphere(24, 16, radius=0.55), material=0, location=(0, 0, 1), scale=(1, 0.85, 1.1))
+    positions, faces, face_sizes, material_indices = parts.arrays()
+"""
+
+import math
+
+import numpy as np
+
+from tree_mesh import euler_matrix
+
+
+def _ring(count, radius, z):
+    angles = np.arange(count) * (2.0 * math.pi / count)
+    return np.stack([radius * np.cos(angles), radius * np.sin(angles), np.full(count, z)], axis=-1)
+
+
+def _side_quads(lower, upper, count):
+    """Quads joining two rings of count vertices starting at indices lower and upper."""
+    j = np.arange(count)
+    k = (j + 1) % count
+    return np.stack([lower + j, lower + k, upper + k, upper + j], axis=-1)
+
+
+def _pack(positions, groups):
+    """Concatenate face groups ((F, k) arrays of any k) into flat indices plus face_sizes."""
+    groups = [np.asarray(g, dtype=np.int64) for g in groups if len(g)]
+    faces = np.concatenate([g.ravel() for g in groups])
+    face_sizes = np.concatenate([np.full(len(g), g.shape[1], dtype=np.int64) for g in groups])
+    return np.asarray(positions, dtype=np.float64), faces, face_sizes
+
+
+def uv_sphere(segments=32, ring_count=16, radius=1.0):
+    """primitive_uv_sphere_add: poles on Z, ring_count - 1 rings of segments vertices."""
+    rings = [_ring(segments, radius * math.sin(math.pi * i / ring_count), radius * math.cos(math.pi * i / ring_count))
+             for i in range(1, ring_count)]
+    positions = np.concatenate([[[0.0, 0.0, radius]], *rings, [[0.0, 0.0, -radius]]])
+    bottom = len(positions) - 1
+    j = np.arange(segments)
+    k = (j + 1) % segments
+    top_fan = np.stack([np.zeros(segments, dtype=np.int64), 1 + j, 1 + k], axis=-1)
+    last = 1 + (ring_count - 2) * segments
+    bottom_fan = np.stack([np.full(segments, bottom), last + k, last + j], axis=-1)
+    # Each band runs from ring r (upper) down to ring r + 1
+    bands = [_side_quads(1 + (r + 1) * segments, 1 + r * segments, segments)[:, [3, 0, 1, 2]]
+             for r in range(ring_count - 2)]
+    return _pack(positions, [top_fan, *bands, bottom_fan])
+
+
+def cone(vertices=32, radius1=1.0, radius2=0.0, depth=2.0):
+    """primitive_cone_add: base of radius1 at -depth/2, top of radius2 (a single tip when 0) at +depth/2."""
+    half = depth / 2.0
+    base = _ring(vertices, radius1, -half)
+    base_cap = np.arange(vertices)[::-1][None]
+    if radius2 <= 0.0:
+        positions = np.concatenate([base, [[0.0, 0.0, half]]])
+        j = np.arange(vertices)
+        sides = np.stack([j, (j + 1) % vertices, np.full(vertices, vertices)], axis=-1)
+        return _pack(positions, [sides, base_cap])
+    positions = np.concatenate([base, _ring(vertices, radius2, half)])
+    top_cap = (vertices + np.arange(vertices))[None]
+    return _pack(positions, [_side_quads(0, vertices, vertices), base_cap, top_cap])
+
+
+def cylinder(vertices=32, radius=1.0, depth=2.0):
+    """primitive_cylinder_add: a cone with equal radii."""
+    return cone(vertices, radius, radius, depth)
+
+
+def cube(size=2.0):
+    """primitive_cube_add: an axis-aligned cube of edge size centered on the origin."""
+    h = size / 2.0
+    positions = np.array([[x, y, z] for x in (-h, h) for y in (-h, h) for z in (-h, h)])
+    quads = np.array([
+        [0, 1, 3, 2],  # -X
+        [4, 6, 7, 5],  # +X
+        [0, 4, 5, 1],  # -Y
+        [2, 3, 7, 6],  # +Y
+        [0, 2, 6, 4],  # -Z
+        [1, 5, 7, 3],  # +Z
+    ])
+    return _pack(positions, [quads])
+
+
+def transform(positions, location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0)):
+    """Apply an object transform (scale, then XYZ euler rotation, then location), as transform_apply does."""
+    scaled = np.asarray(positions, dtype=np.float64) * np.asarray(scale, dtype=np.float64)
+    return scaled @ euler_matrix(*rotation).T + np.asarray(location, dtype=np.float64)
+
+
+class PartBuffers:
+    """Primitive parts accumulated as chunks of arrays and concatenated once.
+
+    Faces are kept as flat indices plus face_sizes (fans, quads and n-gon
+    caps mix), the layout mesh_from_arrays and GLBWriter.add_mesh accept.
+    Every part also records its name's index, so generators can find a
+    part's vertices afterwards, and landmarks holds named points (joints,
+    tips) a generator wants to keep for rigging.
+    """
+
+    def __init__(self):
+        self._positions = []
+        self._faces = []
+        self._face_sizes = []
+        self._materials = []
+        self._part_ids = []
+        self.part_names = []
+        self.landmarks = {}
+        self.vertex_count = 0
+
+    def add(self, primitive, material=0, location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0),
+            scale=(1.0, 1.0, 1.0), name=None):
+        """Append a (positions, faces, face_sizes) primitive in object space; returns the part index."""
+        positions, faces, face_sizes = primitive
+        self._positions.append(transform(positions, location, rotation, scale))
+        self._faces.append(np.asarray(faces, dtype=np.int64) + self.vertex_count)
+        self._face_sizes.append(np.asarray(face_sizes, dtype=np.int64))
+        self._materials.append(np.full(len(face_sizes), material, dtype=np.int64))
+        self._part_ids.append(np.full(len(positions), len(self.part_names), dtype=np.int64))
+        self.part_names.append(name or f"Part_{len(self.part_names)}")
+        self.vertex_count += len(positions)
+        return len(self.part_names) - 1
+
+    def vertex_parts(self):
+        """Part index of every vertex (N,)."""
+        if not self._part_ids:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(self._part_ids)
+
+    def arrays(self):
+        """Return (positions (N, 3), flat face indices, face_sizes (F,), material indices (F,))."""
+        if not self._positions:
+            return (np.zeros((0, 3)), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                    np.zeros(0, dtype=np.int64))
+        return (np.concatenate(self._positions), np.concatenate(self._faces),
+                np.concatenate(self._face_sizes), np.concatenate(self._materials))
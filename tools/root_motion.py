@@ -0,0 +1,357 @@
+"""
+Root-motion extraction and locomotion metadata for skeletal clips in a GLB.
+
+For each locomotion clip (Walk and Run by default) the skeleton is evaluated
+at a fixed rate and:
+  - the horizontal travel of the Hips is moved out of the Hips translation
+    into a "RootMotion" node's translation track (the skeleton walks in
+    place; the node carries the displacement, ready for an AnimationTree
+    root_motion_track)
+  - LeftFoot/RightFoot heights give the foot-contact frame ranges
+  - average speed, distance and stride length are derived from those
+
+The results are stored as glTF extras, on the animation and (as one dict per
+clip) on the RootMotion node, which Godot imports as node metadata:
+
+    "extras": {"locomotion": {"fps": 30, "duration": 1.0, "distance": 1.42,
+        "average_speed": 1.42, "stride_length": 1.42, "in_place": false,
+        "root_motion": [0.0, 0.0, 1.42],
+        "foot_contacts": {"LeftFoot": [[0, 9]], "RightFoot": [[15, 24]]}}}
+
+Distances are in glTF scene units (meters), along the horizontal X/Z plane.
+For clips authored in place, average_speed is the planted feet's ground
+speed instead.
+
+Pure Python + NumPy, no Blender needed:
+    python tools/root_motion.py Meshy_AI_Character_AllAnimations.glb --anim Walk --anim Run
+"""
+
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from anim_optimize import dequantize
+from gltf_io import GLBFile, append_accessor, compact_buffers, write_glb
+
+DEFAULT_ANIMS = ["Walk", "Run"]
+DEFAULT_FPS = 30
+ROOT_BONE = "Hips"
+FEET = ("LeftFoot", "RightFoot")
+ROOT_NODE = "RootMotion"
+CONTACT_HEIGHT = 0.03   # meters above the foot's lowest point that still count as planted
+IN_PLACE_DISTANCE = 0.05
+
+
+# ========== SAMPLING ==========
+def _slerp_rows(a, b, u):
+    """Row-wise shortest-path slerp between xyzw quaternion arrays a and b."""
+    dot = np.sum(a * b, axis=1)
+    b = np.where(dot[:, None] < 0.0, -b, b)
+    dot = np.abs(dot)
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.sin(theta)
+    linear = sin_theta < 1e-6
+    safe = np.where(linear, 1.0, sin_theta)
+    wa = np.where(linear, 1.0 - u, np.sin((1.0 - u) * theta) / safe)
+    wb = np.where(linear, u, np.sin(u * theta) / safe)
+    q = wa[:, None] * a + wb[:, None] * b
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def sample_sampler(times, values, interpolation, path, t):
+    """Evaluate one animation sampler at times t.
+
+    CUBICSPLINE curves are evaluated linearly between their key values,
+    which is exact at the keys and close enough for contact detection.
+    """
+    if interpolation == "CUBICSPLINE":
+        values = values.reshape(len(times), 3, -1)[:, 1]
+    if len(times) == 1:
+        return np.repeat(values[:1], len(t), axis=0)
+    if interpolation == "STEP":
+        return values[np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 1)]
+    i = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 2)
+    u = np.clip((t - times[i]) / (times[i + 1] - times[i]), 0.0, 1.0)
+    if path == "rotation":
+        return _slerp_rows(values[i], values[i + 1], u)
+    return values[i] + (values[i + 1] - values[i]) * u[:, None]
+
+
+def quaternion_matrices(q):
+    """(N, 4) xyzw quaternions -> (N, 3, 3) rotation matrices."""
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    x, y, z, w = q.T
+    return np.stack([
+        1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w),
+        2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w),
+        2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y),
+    ], axis=-1).reshape(-1, 3, 3)
+
+
+def trs_matrices(translation, rotation, scale):
+    """Per-sample 4x4 matrices from (N, 3) translation, (N, 4) rotation and (N, 3) scale."""
+    m = np.zeros((len(translation), 4, 4))
+    m[:, :3, :3] = quaternion_matrices(rotation) * scale[:, None, :]
+    m[:, :3, 3] = translation
+    m[:, 3, 3] = 1.0
+    return m
+
+
+class Pose:
+    """A clip's node transforms evaluated at sample times t, with world matrices computed on demand."""
+
+    def __init__(self, glb, animation, t):
+        gltf = glb.gltf
+        self.t = t
+        self.nodes = gltf.get("nodes", [])
+        self.parents = {child: i for i, node in enumerate(self.nodes) for child in node.get("children", [])}
+        self.animated = {}
+        for channel in animation["channels"]:
+            target = channel["target"]
+            if "node" not in target or target["path"] not in ("translation", "rotation", "scale"):
+                continue
+            sampler = animation["samplers"][channel["sampler"]]
+            accessor = gltf["accessors"][sampler["output"]]
+            times = glb.read_accessor(sampler["input"]).astype(np.float64)
+            values = dequantize(glb.read_accessor(sampler["output"]), accessor.get("normalized", False))
+            values = values.reshape(-1, {"rotation": 4}.get(target["path"], 3))
+            self.animated[(target["node"], target["path"])] = sample_sampler(
+                times, values, sampler.get("interpolation", "LINEAR"), target["path"], t)
+        self._world = {}
+
+    def local(self, node, path):
+        """(N, k) values of one TRS property of node: animated, or its rest value repeated."""
+        if (node, path) in self.animated:
+            return self.animated[(node, path)]
+        rest = {"translation": [0.0, 0.0, 0.0], "rotation": [0.0, 0.0, 0.0, 1.0], "scale": [1.0, 1.0, 1.0]}[path]
+        value = np.asarray(self.nodes[node].get(path, rest), dtype=np.float64)
+        return np.repeat(value[None], len(self.t), axis=0)
+
+    def local_matrices(self, node):
+        if "matrix" in self.nodes[node]:
+            matrix = np.asarray(self.nodes[node]["matrix"], dtype=np.float64).reshape(4, 4).T
+            return np.repeat(matrix[None], len(self.t), axis=0)
+        return trs_matrices(self.local(node, "translation"), self.local(node, "rotation"), self.local(node, "scale"))
+
+    def world(self, node):
+        """(N, 4, 4) world matrices of node."""
+        if node not in self._world:
+            local = self.local_matrices(node)
+            parent = self.parents.get(node)
+            self._world[node] = local if parent is None else self.world(parent) @ local
+        return self._world[node]
+
+    def parent_world(self, node):
+        parent = self.parents.get(node)
+        if parent is None:
+            return np.repeat(np.eye(4)[None], len(self.t), axis=0)
+        return self.world(parent)
+
+
+def animation_duration(glb, animation):
+    return max(float(glb.gltf["accessors"][s["input"]]["max"][0]) for s in animation["samplers"])
+
+
+def sample_times(duration, fps):
+    """Frame times 0, 1/fps, ... with the clip's last time always included."""
+    count = max(1, int(math.floor(duration * fps + 1e-6)))
+    t = np.arange(count + 1, dtype=np.float64) / fps
+    if t[-1] < duration - 1e-6:
+        return np.append(t, duration)
+    t[-1] = duration
+    return t
+
+
+# ========== LOCOMOTION ==========
+def foot_contacts(heights, contact_height=CONTACT_HEIGHT, loop=True):
+    """[[first, last], ...] frame ranges where the foot is within contact_height of its lowest point.
+
+    With loop, a contact running through the clip's end into its start is
+    one range with first > last.
+    """
+    planted = heights <= heights.min() + contact_height
+    ranges, start = [], None
+    for frame, down in enumerate(planted):
+        if down and start is None:
+            start = frame
+        elif not down and start is not None:
+            ranges.append([start, frame - 1])
+            start = None
+    if start is not None:
+        ranges.append([start, len(planted) - 1])
+    if loop and len(ranges) > 1 and ranges[0][0] == 0 and ranges[-1][1] == len(planted) - 1:
+        ranges[0][0] = ranges.pop()[0]
+    return ranges
+
+
+def contact_ground_speed(positions, contacts, fps):
+    """Mean horizontal speed of the feet while planted (how fast an in-place clip pushes the ground)."""
+    speeds = []
+    for foot, ranges in contacts.items():
+        for first, last in ranges:
+            if last > first:  # wrapped contacts are skipped
+                step = positions[foot][first:last + 1, [0, 2]]
+                speeds.append(np.linalg.norm(np.diff(step, axis=0), axis=1).mean() * fps)
+    return float(np.mean(speeds)) if speeds else 0.0
+
+
+def extract_locomotion(glb, animation, node_ids, fps=DEFAULT_FPS, contact_height=CONTACT_HEIGHT):
+    """Analyse one clip; returns (metadata, sample times, new Hips local translations, root track).
+
+    node_ids maps ROOT_BONE and FEET (and ROOT_NODE, if the GLB has one) to
+    node indices. The Hips lose their horizontal travel relative to frame 0;
+    the root track is that travel in world space, plus any root motion the
+    clip already carries, so running the extraction twice changes nothing.
+    """
+    hips = node_ids[ROOT_BONE]
+    duration = animation_duration(glb, animation)
+    t = sample_times(duration, fps)
+    pose = Pose(glb, animation, t)
+
+    hips_world = pose.world(hips)[:, :3, 3]
+    travel = hips_world - hips_world[0]
+    travel[:, 1] = 0.0
+    if (node_ids.get(ROOT_NODE), "translation") in pose.animated:
+        travel += pose.animated[(node_ids[ROOT_NODE], "translation")]
+    # Put the Hips back in parent space without the horizontal travel
+    parent = pose.parent_world(hips)
+    in_place = np.concatenate([hips_world - (hips_world - hips_world[0]) * [1, 0, 1], np.ones((len(t), 1))], axis=1)
+    hips_local = np.einsum("nij,nj->ni", np.linalg.inv(parent), in_place)[:, :3]
+
+    positions = {foot: pose.world(node_ids[foot])[:, :3, 3] for foot in FEET if foot in node_ids}
+    contacts = {foot: foot_contacts(p[:, 1], contact_height) for foot, p in positions.items()}
+    distance = float(np.linalg.norm(travel[-1, [0, 2]]))
+    is_in_place = distance < IN_PLACE_DISTANCE
+    if is_in_place:
+        speed = contact_ground_speed(positions, contacts, fps)
+    else:
+        speed = distance / duration if duration > 0 else 0.0
+    # One gait cycle per touchdown of the same foot; a stride is the ground covered in one cycle
+    cycles = np.mean([len(ranges) for ranges in contacts.values()]) if contacts else 0
+    stride = speed * duration / cycles if cycles else 0.0
+
+    metadata = {
+        "fps": fps,
+        "frames": len(t) - 1,
+        "duration": round(duration, 4),
+        "distance": round(distance, 4),
+        "average_speed": round(speed, 4),
+        "stride_length": round(float(stride), 4),
+        "in_place": bool(is_in_place),
+        "root_motion": [round(float(v), 4) for v in travel[-1]],
+        "foot_contacts": contacts,
+    }
+    return metadata, t, hips_local, travel
+
+
+def _find_nodes(gltf, names):
+    """Node index per name (first match)."""
+    found = {}
+    for i, node in enumerate(gltf.get("nodes", [])):
+        if node.get("name") in names and node["name"] not in found:
+            found[node["name"]] = i
+    return found
+
+
+def extract_root_motion(input_path, output_path, anims=None, fps=DEFAULT_FPS, contact_height=CONTACT_HEIGHT,
+                        strip=True):
+    """Add locomotion extras (and, with strip, a root-motion track) for each named clip; returns {clip: metadata}."""
+    anims = DEFAULT_ANIMS if anims is None else anims
+    with GLBFile(input_path) as glb:
+        gltf = glb.gltf
+        binary = bytearray(glb.read_range(0, glb.bin_length)) if glb.bin_offset is not None else bytearray()
+        node_ids = _find_nodes(gltf, (ROOT_BONE, ROOT_NODE) + FEET)
+        if ROOT_BONE not in node_ids:
+            raise ValueError(f"{input_path}: no '{ROOT_BONE}' node")
+        missing_feet = [foot for foot in FEET if foot not in node_ids]
+        if missing_feet:
+            print(f"WARNING: {input_path} has no {', '.join(missing_feet)}: no contacts for it")
+
+        by_name = {animation.get("name"): animation for animation in gltf.get("animations", [])}
+        results = {}
+        root_node = node_ids.get(ROOT_NODE)
+        for name in anims:
+            animation = by_name.get(name)
+            if animation is None:
+                print(f"WARNING: no animation named {name!r} in {input_path}")
+                continue
+            metadata, t, hips_local, travel = extract_locomotion(glb, animation, node_ids, fps, contact_height)
+            results[name] = metadata
+            animation.setdefault("extras", {})["locomotion"] = metadata
+            if not strip or metadata["in_place"]:
+                continue
+
+            if root_node is None:
+                gltf["nodes"].append({"name": ROOT_NODE})
+                root_node = node_ids[ROOT_NODE] = len(gltf["nodes"]) - 1
+                gltf["scenes"][gltf.get("scene", 0)]["nodes"].append(root_node)
+            times = append_accessor(gltf, binary, t.astype(np.float32))
+            hips_sampler = {"input": times, "interpolation": "LINEAR",
+                            "output": append_accessor(gltf, binary, hips_local.astype(np.float32))}
+            channels = [c for c in animation["channels"] if c["target"]["path"] != "translation"
+                        or c["target"].get("node") not in (node_ids[ROOT_BONE], root_node)]
+            animation["samplers"].append(hips_sampler)
+            channels.append({"sampler": len(animation["samplers"]) - 1,
+                             "target": {"node": node_ids[ROOT_BONE], "path": "translation"}})
+            animation["samplers"].append({"input": times, "interpolation": "LINEAR",
+                                          "output": append_accessor(gltf, binary, travel.astype(np.float32))})
+            channels.append({"sampler": len(animation["samplers"]) - 1,
+                             "target": {"node": root_node, "path": "translation"}})
+            animation["channels"] = channels
+            # Samplers no channel uses any more would still be exported; drop them
+            used = sorted({c["sampler"] for c in channels})
+            remap = {old: new for new, old in enumerate(used)}
+            animation["samplers"] = [animation["samplers"][i] for i in used]
+            for channel in channels:
+                channel["sampler"] = remap[channel["sampler"]]
+
+    if results:
+        if root_node is not None:
+            gltf["nodes"][root_node].setdefault("extras", {}).setdefault("locomotion", {}).update(results)
+        binary = compact_buffers(gltf, binary)
+    write_glb(output_path, gltf, binary)
+    return results
+
+
+def print_report(results):
+    print(f"{'Clip':<16} {'Duration':>9} {'Distance':>9} {'Speed':>7} {'Stride':>7}  Contacts")
+    for name, m in results.items():
+        contacts = "  ".join(f"{foot}: {ranges}" for foot, ranges in m["foot_contacts"].items())
+        place = " (in place)" if m["in_place"] else ""
+        print(f"{name[:16]:<16} {m['duration']:>8.3f}s {m['distance']:>8.3f}m {m['average_speed']:>6.3f} "
+              f"{m['stride_length']:>7.3f}  {contacts}{place}")
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Extract root motion and locomotion metadata into GLB extras.")
+    parser.add_argument("input", help="GLB with the locomotion clips")
+    parser.add_argument("--output", "-o", help="GLB to write (default: overwrite the input)")
+    parser.add_argument("--anim", action="append", help="clip to process, repeatable (default: Walk and Run)")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS, help="rate the skeleton is evaluated at")
+    parser.add_argument("--contact-height", type=float, default=CONTACT_HEIGHT,
+                        help="height above a foot's lowest point still counted as contact")
+    parser.add_argument("--metadata-only", action="store_true",
+                        help="write the extras but leave the Hips translation untouched")
+    args = parser.parse_args(argv)
+
+    output = args.output or args.input
+    tmp = output + ".tmp"
+    try:
+        results = extract_root_motion(args.input, tmp, args.anim, args.fps, args.contact_height,
+                                      strip=not args.metadata_only)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        raise SystemExit(1)
+    os.replace(tmp, output)
+    print_report(results)
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+"""
+Array-based tree geometry for create_trees.py.
+
+Tree generation runs in two stages:
+  1. A pure-Python skeleton pass (grow_skeleton) that makes every random
+     decision and records branch rings (position, direction, radius, depth)
+     and leaf quads in flat lists.
+  2. A vectorized skinning pass (skin_branches / skin_leaves) that turns the
+     skeleton into NumPy vertex, quad and material-index arrays in one go.
+
+All randomness comes from an explicit random.Random passed in as rng, so each
+tree variant is reproducible from its own seed. Nothing here imports bpy, so
+trees can be built (and later written) outside Blender; create_trees.py loads
+the arrays with bulk_mesh.
+"""
+
+import math
+
+import numpy as np
+
+BRANCH_SEGMENTS = 5
+
+
+def _normalized(v):
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def _rotation_x(angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return np.array([[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]])
+
+
+def _rotation_y(angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return np.array([[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]])
+
+
+def _rotation_z(angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def euler_matrix(rx, ry, rz):
+    """Rotation matrix of an XYZ euler, as mathutils.Euler.to_matrix()."""
+    return _rotation_z(rz) @ _rotation_y(ry) @ _rotation_x(rx)
+
+
+class MeshBuffers:
+    """Quad mesh accumulated as chunks of arrays and concatenated once.
+
+    Every face also records the branch depth it belongs to and whether it is
+    foliage, which is what lod_arrays uses to thin the tree out. Foliage
+    faces carry a cluster id (the leaves of one cluster, the needles of one
+    pine branch), which foliage_cards replaces with a few textured cards.
+    Vertices may carry UVs; those that were added without have (0, 0).
+    """
+
+    def __init__(self):
+        self._positions = []
+        self._faces = []
+        self._materials = []
+        self._depths = []
+        self._foliage = []
+        self._clusters = []
+        self._uvs = []
+        self.vertex_count = 0
+        self.cluster_count = 0
+        self.has_uvs = False
+
+    def add(self, positions, faces, material_indices, depth=0, foliage=False, cluster=-1, uvs=None):
+        """Append positions (N, 3) and quads (F, 4) indexing into them.
+
+        cluster is a per-face (or single) foliage cluster id, from
+        next_cluster or an offset of cluster_count; uvs are per vertex (N, 2).
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        faces = np.asarray(faces, dtype=np.int64).reshape(-1, 4)
+        clusters = np.broadcast_to(np.asarray(cluster, dtype=np.int64), (len(faces),))
+        self._positions.append(positions)
+        self._faces.append(faces + self.vertex_count)
+        self._materials.append(np.broadcast_to(np.asarray(material_indices, dtype=np.int64), (len(faces),)))
+        self._depths.append(np.broadcast_to(np.asarray(depth, dtype=np.int64), (len(faces),)))
+        self._foliage.append(np.full(len(faces), foliage))
+        self._clusters.append(clusters)
+        self._uvs.append(np.zeros((len(positions), 2)) if uvs is None
+                         else np.asarray(uvs, dtype=np.float64).reshape(-1, 2))
+        self.has_uvs |= uvs is not None
+        self.vertex_count += len(positions)
+        if len(clusters):
+            self.cluster_count = max(self.cluster_count, int(clusters.max()) + 1)
+
+    def next_cluster(self):
+        """A fresh foliage cluster id."""
+        self.cluster_count += 1
+        return self.cluster_count - 1
+
+    def face_clusters(self):
+        """Foliage cluster id per face (F,), -1 for faces outside any cluster."""
+        if not self._clusters:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(self._clusters)
+
+    def uvs(self):
+        """Per-vertex UVs (N, 2)."""
+        if not self._uvs:
+            return np.zeros((0, 2))
+        return np.concatenate(self._uvs)
+
+    def face_tags(self):
+        """Return (branch depth (F,), foliage flag (F,)) per face."""
+        if not self._faces:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+        return np.concatenate(self._depths), np.concatenate(self._foliage)
+
+    def arrays(self):
+        """Return (positions (N, 3), quads (F, 4), material indices (F,))."""
+        if not self._positions:
+            return np.zeros((0, 3)), np.zeros((0, 4), dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return (np.concatenate(self._positions), np.concatenate(self._faces),
+                np.concatenate(self._materials))
+
+
+class BranchSkeleton:
+    """Flat records of every branch ring and leaf quad of one tree."""
+
+    def __init__(self):
+        # Per ring
+        self.positions = []
+        self.directions = []
+        self.radii = []
+        self.depths = []
+        self.ring_branch = []
+        # Per branch
+        self.branch_sides = []
+        self.branch_materials = []
+        # Per leaf cluster: center (3), size, material
+        self.clusters = []
+        # Per leaf quad: cluster index, position (3), half width, height, euler (3)
+        self.leaves = []
+
+    def begin_branch(self, sides, material):
+        self.branch_sides.append(sides)
+        self.branch_materials.append(material)
+        return len(self.branch_sides) - 1
+
+    def add_ring(self, branch, position, direction, radius, depth):
+        self.positions.append(tuple(position))
+        self.directions.append(tuple(direction))
+        self.radii.append(radius)
+        self.depths.append(depth)
+        self.ring_branch.append(branch)
+
+
+def add_leaf_cluster(skel, rng, center, size, mat_idx):
+    """Record a cluster of flat leaf quads."""
+    cluster = len(skel.clusters)
+    skel.clusters.append((center[0], center[1], center[2], size, mat_idx))
+    num_leaves = rng.randint(4, 8)
+    for _ in range(num_leaves):
+        offset = (
+            rng.uniform(-size, size),
+            rng.uniform(-size, size),
+            rng.uniform(-size * 0.5, size * 0.5)
+        )
+        leaf_w = rng.uniform(0.08, 0.15) * size * 3
+        leaf_h = rng.uniform(0.1, 0.2) * size * 3
+
+        # Random orientation
+        rx = rng.uniform(-0.5, 0.5)
+        ry = rng.uniform(-0.5, 0.5)
+        rz = rng.uniform(0, math.pi * 2)
+        skel.leaves.append((cluster, center[0] + offset[0], center[1] + offset[1], center[2] + offset[2],
+                            leaf_w, leaf_h, rx, ry, rz))
+
+
+def grow_skeleton(skel, rng, origin, direction, length, radius, depth, max_depth, mat_bark_idx, mat_leaf_idx):
+    """Recursively grow branches with natural tapering and splitting."""
+    if depth > max_depth or length < 0.05:
+        return
+
+    branch = skel.begin_branch(max(4, 8 - depth), mat_bark_idx)
+    current_pos = np.array(origin, dtype=np.float64)
+    current_dir = _normalized(np.array(direction, dtype=np.float64))
+
+    for i in range(BRANCH_SEGMENTS + 1):
+        t = i / BRANCH_SEGMENTS
+        r = radius * (1.0 - t * 0.7)
+
+        # Curve direction with gravity and randomness
+        gravity_influence = 0.02 * depth
+        current_dir[2] -= gravity_influence
+        current_dir[0] += rng.uniform(-0.1, 0.1) * depth
+        current_dir[1] += rng.uniform(-0.1, 0.1) * depth
+        current_dir = _normalized(current_dir)
+
+        skel.add_ring(branch, current_pos, current_dir, r, depth)
+        current_pos = current_pos + current_dir * (length / BRANCH_SEGMENTS)
+
+    tip = current_pos
+
+    # Add leaf clusters at branch tips
+    if depth >= max_depth - 1:
+        for _ in range(rng.randint(2, 4)):
+            leaf_offset = np.array((
+                rng.uniform(-0.3, 0.3),
+                rng.uniform(-0.3, 0.3),
+                rng.uniform(-0.1, 0.3)
+            ))
+            leaf_size = rng.uniform(0.3, 0.8) * (1.0 / (depth * 0.5 + 1))
+            add_leaf_cluster(skel, rng, tip + leaf_offset, leaf_size, mat_leaf_idx)
+
+    # Spawn child branches
+    if depth < max_depth:
+        num_children = rng.randint(1, 3) if depth < 2 else rng.randint(1, 2)
+        for _ in range(num_children):
+            child_angle = rng.uniform(20, 60)
+            child_twist = rng.uniform(0, 360)
+            child_dir = _rotation_z(math.radians(child_twist)) @ _rotation_x(math.radians(child_angle)) @ current_dir
+
+            child_length = length * rng.uniform(0.5, 0.75)
+            child_radius = radius * rng.uniform(0.4, 0.65)
+
+            grow_skeleton(skel, rng, tip, child_dir, child_length, child_radius,
+                          depth + 1, max_depth, mat_bark_idx, mat_leaf_idx)
+
+
+def skin_branches(skel, buffers):
+    """Emit the tube geometry of every recorded branch into buffers."""
+    if not skel.positions:
+        return
+    positions = np.array(skel.positions)
+    directions = np.array(skel.directions)
+    radii = np.array(skel.radii)
+    ring_branch = np.array(skel.ring_branch)
+    ring_sides = np.array(skel.branch_sides)[ring_branch]
+    ring_mats = np.array(skel.branch_materials)[ring_branch]
+    ring_depths = np.array(skel.depths)
+
+    # One frame per ring (not per side): perpendiculars to the ring direction
+    up = np.where((np.abs(directions[:, 2]) < 0.9)[:, None], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0])
+    perp1 = _normalized(np.cross(directions, up))
+    perp2 = _normalized(np.cross(directions, perp1))
+
+    # Rings with the same side count skin together
+    for sides in np.unique(ring_sides):
+        rings = np.flatnonzero(ring_sides == sides)
+        angle = np.arange(sides) * 2 * math.pi / sides
+        offsets = (perp1[rings, None, :] * np.cos(angle)[None, :, None] +
+                   perp2[rings, None, :] * np.sin(angle)[None, :, None]) * radii[rings, None, None]
+        verts = positions[rings, None, :] + offsets
+
+        # Quads between each ring and the next ring of the same branch
+        lower = np.flatnonzero(ring_branch[rings[:-1]] == ring_branch[rings[1:]])
+        j = np.arange(sides)
+        j_next = (j + 1) % sides
+        a = lower[:, None] * sides
+        b = (lower[:, None] + 1) * sides
+        faces = np.stack([a + j, a + j_next, b + j_next, b + j], axis=-1).reshape(-1, 4)
+        buffers.add(verts.reshape(-1, 3), faces, np.repeat(ring_mats[rings[lower]], sides),
+                    depth=np.repeat(ring_depths[rings[lower]], sides))
+
+
+def skin_leaves(skel, buffers):
+    """Emit one quad per recorded leaf into buffers."""
+    if not skel.leaves:
+        return
+    leaves = np.array(skel.leaves)
+    cluster = leaves[:, 0].astype(np.int64)
+    pos = leaves[:, 1:4]
+    w = leaves[:, 4]
+    h = leaves[:, 5]
+    rot = np.stack([euler_matrix(*e) for e in leaves[:, 6:9]])
+
+    zeros = np.zeros_like(w)
+    corners = np.stack([
+        np.stack([-w, zeros, zeros], axis=-1),
+        np.stack([w, zeros, zeros], axis=-1),
+        np.stack([w, zeros, h], axis=-1),
+        np.stack([-w, zeros, h], axis=-1),
+    ], axis=1)
+    verts = pos[:, None, :] + np.einsum("lij,lcj->lci", rot, corners)
+    faces = np.arange(len(leaves) * 4).reshape(-1, 4)
+    mats = np.array(skel.clusters)[cluster, 4].astype(np.int64)
+    buffers.add(verts.reshape(-1, 3), faces, mats, foliage=True, cluster=buffers.cluster_count + cluster)
+
+
+def skin_skeleton(skel, buffers=None):
+    """Skin branches and leaves; returns the MeshBuffers."""
+    buffers = buffers if buffers is not None else MeshBuffers()
+    skin_branches(skel, buffers)
+    skin_leaves(skel, buffers)
+    return buffers
+
+
+def _ring_quads(ring_count, sides):
+    """Quads joining consecutive rings of `sides` vertices each."""
+    i = np.arange(ring_count - 1)[:, None]
+    j = np.arange(sides)
+    j_next = (j + 1) % sides
+    return np.stack([i * sides + j, i * sides + j_next, (i + 1) * sides + j_next, (i + 1) * sides + j],
+                    axis=-1).reshape(-1, 4)
+
+
+def _leaf_quad(pos, leaf_w, leaf_h, rot):
+    corners = np.array([(-leaf_w, 0, 0), (leaf_w, 0, 0), (leaf_w, 0, leaf_h), (-leaf_w, 0, leaf_h)])
+    return np.asarray(pos) + corners @ rot.T
+
+
+# ========== SPECIES ==========
+def build_oak(rng):
+    """Oak skeleton: bark 0, leaves 1, light leaves 2."""
+    skel = BranchSkeleton()
+
+    # Main trunk
+    grow_skeleton(skel, rng, (0, 0, 0), (0, 0, 1),
+                  length=3.5, radius=0.25, depth=0, max_depth=4,
+                  mat_bark_idx=0, mat_leaf_idx=1)
+
+    # Extra branches from lower trunk
+    for i in range(3):
+        angle = i * 2.1 + rng.uniform(-0.3, 0.3)
+        branch_start = (0, 0, 1.5 + rng.uniform(0, 1.0))
+        branch_dir = (math.cos(angle) * 0.6, math.sin(angle) * 0.6, 0.8)
+        grow_skeleton(skel, rng, branch_start, branch_dir,
+                      length=2.0, radius=0.1, depth=1, max_depth=4,
+                      mat_bark_idx=0, mat_leaf_idx=2)
+
+    return skin_skeleton(skel)
+
+
+def build_pine(rng):
+    """Pine geometry: bark 0, needles 1, needle tips 2."""
+    buffers = MeshBuffers()
+
+    # Tall straight trunk
+    trunk_height = 7.0
+    trunk_segments = 12
+    t = np.arange(trunk_segments + 1) / trunk_segments
+    r = 0.15 * (1.0 - t * 0.6)
+    angle = np.arange(8) * 2 * math.pi / 8
+    jitter = np.array([[(rng.uniform(-0.01, 0.01), rng.uniform(-0.01, 0.01)) for _ in range(8)]
+                       for _ in range(trunk_segments + 1)])
+    trunk = np.stack([
+        np.cos(angle)[None, :] * r[:, None] + jitter[..., 0],
+        np.sin(angle)[None, :] * r[:, None] + jitter[..., 1],
+        np.broadcast_to((t * trunk_height)[:, None], (trunk_segments + 1, 8)),
+    ], axis=-1)
+    buffers.add(trunk.reshape(-1, 3), _ring_quads(trunk_segments + 1, 8), 0)
+
+    # Layered conical foliage with drooping branch tips
+    layers = 7
+    segments = 4
+    st = np.arange(segments) / segments
+    st_next = np.arange(1, segments + 1) / segments
+    for li in range(layers):
+        t = li / (layers - 1)
+        base_z = 2.0 + t * 5.0
+        base_radius = 2.0 * (1.0 - t * 0.8) + 0.2
+
+        branches_in_layer = rng.randint(6, 10)
+        for bi in range(branches_in_layer):
+            angle = bi * 2 * math.pi / branches_in_layer + rng.uniform(-0.2, 0.2)
+
+            # Branch extends outward and slightly down, one needle quad per segment
+            branch_len = base_radius * rng.uniform(0.7, 1.1)
+            r1, r2 = branch_len * st, branch_len * st_next
+            z1, z2 = base_z - st * st * 0.3, base_z - st_next * st_next * 0.3
+            w = 0.15 * (1.0 - st * 0.5)
+            perp_x, perp_y = -math.sin(angle) * w, math.cos(angle) * w
+            x1, y1 = math.cos(angle) * r1, math.sin(angle) * r1
+            x2, y2 = math.cos(angle) * r2, math.sin(angle) * r2
+            quads = np.stack([
+                np.stack([x1 + perp_x, y1 + perp_y, z1], axis=-1),
+                np.stack([x1 - perp_x, y1 - perp_y, z1], axis=-1),
+                np.stack([x2 - perp_x, y2 - perp_y, z2], axis=-1),
+                np.stack([x2 + perp_x, y2 + perp_y, z2], axis=-1),
+            ], axis=1)
+            buffers.add(quads.reshape(-1, 3), np.arange(segments * 4).reshape(-1, 4), 2 if t > 0.7 else 1,
+                        foliage=True, cluster=buffers.next_cluster())
+
+    return buffers
+
+
+def build_birch(rng):
+    """Birch geometry: bark 0, dark bark 1, leaves 2."""
+    buffers = MeshBuffers()
+    skel = BranchSkeleton()
+
+    # Slender trunk with slight curve
+    trunk_height = 6.0
+    segments = 16
+    t = np.arange(segments + 1) / segments
+    r = 0.08 * (1.0 - t * 0.5)
+    curve = np.cumsum([rng.uniform(-0.02, 0.02) for _ in range(segments + 1)])
+    curve_x = float(curve[-1])
+    angle = np.arange(6) * 2 * math.pi / 6
+    trunk = np.stack([
+        np.cos(angle)[None, :] * r[:, None] + curve[:, None],
+        np.sin(angle)[None, :] * r[:, None],
+        np.broadcast_to((t * trunk_height)[:, None], (segments + 1, 6)),
+    ], axis=-1)
+    faces = _ring_quads(segments + 1, 6)
+    bark = [0 if rng.random() > 0.3 else 1 for _ in range(len(faces))]
+    buffers.add(trunk.reshape(-1, 3), faces, bark)
+
+    # Delicate hanging leaf clusters
+    for i in range(12):
+        angle = i * math.pi / 6 + rng.uniform(-0.3, 0.3)
+        dist = rng.uniform(0.5, 1.5)
+        z = rng.uniform(3.5, 6.5)
+        x = math.cos(angle) * dist + curve_x
+        y = math.sin(angle) * dist
+
+        # Hanging leaf strand
+        strand_length = rng.uniform(0.5, 1.2)
+        strand_segments = rng.randint(3, 5)
+        strand = buffers.next_cluster()
+        for si in range(strand_segments):
+            st = si / strand_segments
+            sz = z - st * strand_length
+            leaf_w = rng.uniform(0.05, 0.12)
+            leaf_h = rng.uniform(0.08, 0.15)
+
+            lx = x + rng.uniform(-0.15, 0.15)
+            ly = y + rng.uniform(-0.15, 0.15)
+
+            rx = rng.uniform(-0.3, 0.3)
+            ry = rng.uniform(-0.3, 0.3)
+            rz = rng.uniform(0, math.pi * 2)
+            buffers.add(_leaf_quad((lx, ly, sz), leaf_w, leaf_h, euler_matrix(rx, ry, rz)),
+                        [[0, 1, 2, 3]], 2, foliage=True, cluster=strand)
+
+    # Top canopy
+    for _ in range(6):
+        cx = curve_x + rng.uniform(-0.4, 0.4)
+        cy = rng.uniform(-0.4, 0.4)
+        cz = rng.uniform(5.0, 6.5)
+        add_leaf_cluster(skel, rng, (cx, cy, cz), rng.uniform(0.4, 0.7), 2)
+    skin_leaves(skel, buffers)
+
+    return buffers
+
+
+# ========== LOD ==========
+def lod_arrays(buffers, max_depth, foliage_density, uvs=False):
+    """Thinned copy of a tree: (positions, quads, material indices), plus per-vertex UVs with uvs.
+
+    Drops branch faces deeper than max_depth and keeps every k-th foliage
+    quad (k = round(1 / foliage_density)), growing each kept quad by sqrt(k)
+    about its centroid so the canopy keeps roughly the same coverage and
+    silhouette. Foliage quads never share vertices, so they scale in place.
+    """
+    positions, faces, mats = buffers.arrays()
+    depth, foliage = buffers.face_tags()
+    stride = max(1, round(1.0 / foliage_density))
+
+    keep = ~foliage & (depth <= max_depth)
+    foliage_faces = np.flatnonzero(foliage)
+    kept_foliage = foliage_faces[::stride]
+    keep[kept_foliage] = True
+
+    positions = positions.copy()
+    if stride > 1 and len(kept_foliage):
+        quads = faces[kept_foliage]
+        centroid = positions[quads].mean(axis=1, keepdims=True)
+        positions[quads] = centroid + (positions[quads] - centroid) * math.sqrt(stride)
+
+    faces, mats = faces[keep], mats[keep]
+    used, remap = np.unique(faces, return_inverse=True)
+    if uvs:
+        return positions[used], remap.reshape(faces.shape), mats, buffers.uvs()[used]
+    return positions[used], remap.reshape(faces.shape), mats
+
+
+def select_lod(buffers, triangle_budget, max_depth=None):
+    """Most detailed (depth, foliage density) whose triangle count fits the budget.
+
+    Returns (max_depth, foliage_density, triangle_count); falls back to the
+    coarsest setting when nothing fits. max_depth defaults to the deepest
+    branch in the tree.
+    """
+    depth, foliage = buffers.face_tags()
+    if max_depth is None:
+        max_depth = int(depth.max()) if len(depth) else 0
+    best = None
+    for d in range(max_depth, -1, -1):
+        branch_quads = int(np.count_nonzero(~foliage & (depth <= d)))
+        for density in (1.0, 0.5, 0.25, 0.125, 0.0625):
+            stride = max(1, round(1.0 / density))
+            triangles = 2 * (branch_quads + len(np.flatnonzero(foliage)[::stride]))
+            candidate = (d, density, triangles)
+            if triangles <= triangle_budget and (best is None or triangles > best[2]):
+                best = candidate
+    return best if best is not None else candidate
+
+
+def select_lods(buffers, budgets, distances, max_ratio=0.8):
+    """(depth, foliage density) of each reduced LOD, and the distances the chain switches at.
+
+    budgets are fractions of the full tree's triangle count, one per level
+    after LOD0, and distances has one entry per level after LOD0 plus any
+    that follow (e.g. the impostor's). A level that keeps more than max_ratio
+    of the previous level's triangles is not worth another draw, so it is
+    dropped along with its distance and the level before it covers its band.
+    """
+    full = select_lod(buffers, float("inf"))[2]
+    levels, kept = [], []
+    previous = full
+    for budget, distance in zip(budgets, distances):
+        depth, density, triangles = select_lod(buffers, budget * full)
+        if triangles > previous * max_ratio:
+            continue
+        levels.append((depth, density))
+        kept.append(distance)
+        previous = triangles
+    return levels, kept + list(distances[len(budgets):])
+
+
+def ground(positions):
+    """Shift geometry so its lowest point sits at z = 0.
+
+    Equivalent to the old origin_set(BOUNDS) + min_z + transform_apply
+    sequence, which left x/y untouched.
+    """
+    positions = positions.copy()
+    positions[:, 2] -= positions[:, 2].min()
+    return positions